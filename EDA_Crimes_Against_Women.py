@@ -5,388 +5,223 @@ This script performs comprehensive EDA on crimes against women data, including:
 1. Identification of states with highest crime against women
 2. Clustering analysis based on crime data
 3. Crime type distribution by state
+
+All computations come from the shared ``crimes_core`` package; this script
+only prints the results and renders the shared ``crimes_core.figures``
+jobs.
 """
 
 # Import Required Libraries
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.decomposition import PCA
+import argparse
 import warnings
-import os
-
-warnings.filterwarnings('ignore')
-
-# Set style for visualizations
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
-
-# ============================================================================
-# SECTION 1: DATA LOADING AND PREPARATION
-# ============================================================================
-print("="*80)
-print("LOADING AND PREPARING DATA")
-print("="*80)
-
-# Load datasets from GitHub with fallback to local
-github_url = "https://raw.githubusercontent.com/VK-SHRIDHARAN/23BCE2086-EDA-On-Women-Safety_TAM/main/"
-
-try:
-    df = pd.read_csv(github_url + 'CrimesOnWomenData.csv', index_col=0)
-    description = pd.read_csv(github_url + 'description.csv', index_col=0)
-    print("Data loaded from GitHub")
-except:
+
+from crimes_core import (
+    CRIME_NAMES,
+    build_aggregate,
+    clean,
+    cluster_input,
+    crime_leaders,
+    crime_totals,
+    load_data,
+    state_averages,
+    temporal_change,
+    top_states,
+    yearly_trends,
+)
+from crimes_core.clustering import (
+    OPTIMAL_K,
+    cluster_breakdown,
+    fit_clusters,
+    k_sweep,
+    pca_projection,
+    scale_features,
+)
+from crimes_core.figures import standard_jobs
+from crimes_core.render import render_or_show, use_headless
+from crimes_core.report import report_facts, summary_text
+
+crime_labels = {**CRIME_NAMES, 'Rape': 'Rape Cases'}
+
+
+def main(headless=False):
+    warnings.filterwarnings('ignore')
+
+    if headless:
+        use_headless()
+
+    # ============================================================================
+    # SECTION 1: DATA LOADING AND PREPARATION
+    # ============================================================================
+    print("="*80)
+    print("LOADING AND PREPARING DATA")
+    print("="*80)
+
     try:
-        df = pd.read_csv('CrimesOnWomenData.csv', index_col=0)
-        description = pd.read_csv('description.csv', index_col=0)
-        print("Data loaded from local directory")
-    except:
+        df, description, source = load_data()
+        print(f"Data loaded from {source}")
+    except Exception:
         print("Error: Could not load data from GitHub or local directory")
         raise
 
-print("\nDataset Shape:", df.shape)
-print("\nFirst few rows:")
-print(df.head())
-print("\nColumn Descriptions:")
-print(description)
-
-# Data quality checks
-print("\n" + "="*80)
-print("DATA QUALITY CHECK")
-print("="*80)
-print("\nMissing Values:")
-print(df.isnull().sum())
-
-# Handle any missing values
-df = df.fillna(0)
-
-# Crime columns
-crime_columns = ['Rape', 'K&A', 'DD', 'AoW', 'AoM', 'DV', 'WT']
-crime_labels = {
-    'Rape': 'Rape Cases',
-    'K&A': 'Kidnapping & Assault',
-    'DD': 'Dowry Deaths',
-    'AoW': 'Assault on Women',
-    'AoM': 'Assault on Modesty',
-    'DV': 'Domestic Violence',
-    'WT': 'Women Trafficking'
-}
-
-# ============================================================================
-# SECTION 2: TASK 1 - IDENTIFY STATES WITH HIGHEST CRIME
-# ============================================================================
-print("\n" + "="*80)
-print("TASK 1: STATES WITH HIGHEST CRIME AGAINST WOMEN")
-print("="*80)
-
-# Calculate total crimes by state
-state_crime_totals = df.groupby('State')[crime_columns].sum().sum(axis=1).sort_values(ascending=False)
-print("\nTop 15 States with Highest Total Crimes Against Women:")
-for rank, (state, count) in enumerate(state_crime_totals.head(15).items(), 1):
-    print(f"{rank:2}. {state:25} : {int(count):8,} cases")
-
-# Calculate average crimes per year by state
-state_avg_crimes = df.groupby('State')[crime_columns].sum().sum(axis=1) / df.groupby('State').size()
-state_avg_crimes = state_avg_crimes.sort_values(ascending=False)
-
-print("\nTop 15 States with Highest Average Crimes per Year:")
-for rank, (state, count) in enumerate(state_avg_crimes.head(15).items(), 1):
-    print(f"{rank:2}. {state:25} : {count:10.0f} cases/year")
-
-# Visualization
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-
-state_crime_totals.head(15).plot(kind='bar', ax=axes[0], color='crimson', alpha=0.8)
-axes[0].set_title('Top 15 States with Highest Total Crimes Against Women', fontsize=14, fontweight='bold')
-axes[0].set_xlabel('State', fontsize=12)
-axes[0].set_ylabel('Total Crime Cases', fontsize=12)
-axes[0].tick_params(axis='x', rotation=45)
-axes[0].grid(axis='y', alpha=0.3)
-
-state_avg_crimes.head(15).plot(kind='bar', ax=axes[1], color='darkred', alpha=0.8)
-axes[1].set_title('Top 15 States with Highest Average Crimes per Year', fontsize=14, fontweight='bold')
-axes[1].set_xlabel('State', fontsize=12)
-axes[1].set_ylabel('Average Crime Cases per Year', fontsize=12)
-axes[1].tick_params(axis='x', rotation=45)
-axes[1].grid(axis='y', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('01_top_crime_states.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 01_top_crime_states.png")
-plt.show()
-
-# ============================================================================
-# SECTION 3: TASK 2 - CLUSTERING ANALYSIS
-# ============================================================================
-print("\n" + "="*80)
-print("TASK 2: CLUSTER STATES BASED ON CRIME DATA")
-print("="*80)
-
-# Prepare data for clustering
-state_aggregated = df.groupby('State')[crime_columns].sum()
-
-# Standardize the data
-scaler = StandardScaler()
-state_scaled = scaler.fit_transform(state_aggregated)
-
-# Find optimal number of clusters using elbow method
-inertias = []
-silhouette_scores = []
-K_range = range(2, 11)
-
-for k in K_range:
-    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-    kmeans.fit(state_scaled)
-    inertias.append(kmeans.inertia_)
-    silhouette_scores.append(silhouette_score(state_scaled, kmeans.labels_))
-
-# Plot elbow curve
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-axes[0].plot(K_range, inertias, 'bo-', linewidth=2, markersize=8)
-axes[0].set_xlabel('Number of Clusters (k)', fontsize=12)
-axes[0].set_ylabel('Inertia', fontsize=12)
-axes[0].set_title('Elbow Method for Optimal k', fontsize=14, fontweight='bold')
-axes[0].grid(True, alpha=0.3)
-
-axes[1].plot(K_range, silhouette_scores, 'ro-', linewidth=2, markersize=8)
-axes[1].set_xlabel('Number of Clusters (k)', fontsize=12)
-axes[1].set_ylabel('Silhouette Score', fontsize=12)
-axes[1].set_title('Silhouette Score for Different k', fontsize=14, fontweight='bold')
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('02_elbow_silhouette.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 02_elbow_silhouette.png")
-plt.show()
-
-# Perform K-means clustering with optimal k=4
-optimal_k = 4
-kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-clusters = kmeans.fit_predict(state_scaled)
-
-state_aggregated['Cluster'] = clusters
-
-print(f"\nOptimal number of clusters: {optimal_k}")
-print("\nCluster Composition:")
-for cluster_id in range(optimal_k):
-    states_in_cluster = state_aggregated[state_aggregated['Cluster'] == cluster_id].index.tolist()
-    total_crimes = state_aggregated[state_aggregated['Cluster'] == cluster_id][crime_columns].sum().sum()
-    print(f"\nCluster {cluster_id} ({len(states_in_cluster)} states):")
-    print(f"  Total crimes: {int(total_crimes):,}")
-    print(f"  States: {', '.join(states_in_cluster)}")
-
-# Visualize clusters using PCA
-pca = PCA(n_components=2)
-state_pca = pca.fit_transform(state_scaled)
-
-plt.figure(figsize=(12, 8))
-scatter = plt.scatter(state_pca[:, 0], state_pca[:, 1], c=clusters, cmap='viridis', s=200, 
-                     alpha=0.7, edgecolors='black', linewidth=1.5)
-
-for i, state in enumerate(state_aggregated.index):
-    plt.annotate(state, (state_pca[i, 0], state_pca[i, 1]), fontsize=9, 
-                ha='center', va='center', fontweight='bold')
-
-plt.xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.1%} variance)', fontsize=12)
-plt.ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.1%} variance)', fontsize=12)
-plt.title('K-Means Clustering of States Based on Crime Data (PCA Visualization)', 
-         fontsize=14, fontweight='bold')
-plt.colorbar(scatter, label='Cluster')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('03_state_clusters.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 03_state_clusters.png")
-plt.show()
-
-# ============================================================================
-# SECTION 4: TASK 3 - CRIME TYPE DISTRIBUTION
-# ============================================================================
-print("\n" + "="*80)
-print("TASK 3: CRIME TYPE DISTRIBUTION BY STATE")
-print("="*80)
-
-# Analyze crime types by state
-crime_type_analysis = df.groupby('State')[crime_columns].sum()
-
-# Find top states for each crime type
-print("\nTop States by Crime Type:")
-print("-" * 80)
-
-top_states_by_crime = {}
-for crime in crime_columns:
-    top_state = crime_type_analysis[crime].idxmax()
-    count = crime_type_analysis[crime].max()
-    top_states_by_crime[crime] = (top_state, count)
-    print(f"{crime_labels.get(crime, crime):25} : {top_state:25} ({int(count):6,} cases)")
-
-# Create heatmap
-fig, ax = plt.subplots(figsize=(14, 10))
-
-# Get top 15 states by total crimes
-top_states = state_aggregated[crime_columns].sum(axis=1).nlargest(15).index
-heatmap_data = crime_type_analysis.loc[top_states, crime_columns]
-
-sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', 
-           cbar_kws={'label': 'Number of Cases'}, ax=ax, linewidths=0.5)
-ax.set_title('Crime Distribution Across Top 15 States (Heatmap)', fontsize=14, fontweight='bold')
-ax.set_xlabel('Crime Type', fontsize=12)
-ax.set_ylabel('State', fontsize=12)
-
-plt.tight_layout()
-plt.savefig('04_crime_heatmap.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 04_crime_heatmap.png")
-plt.show()
-
-# Create detailed bar charts for crime types
-fig, axes = plt.subplots(2, 4, figsize=(18, 10))
-axes = axes.flatten()
-
-for idx, crime in enumerate(crime_columns):
-    top_10 = crime_type_analysis[crime].nlargest(10)
-    top_10.plot(kind='barh', ax=axes[idx], color=plt.cm.Set3(idx), alpha=0.8)
-    axes[idx].set_title(f'Top 10 States: {crime_labels[crime]}', fontsize=11, fontweight='bold')
-    axes[idx].set_xlabel('Number of Cases', fontsize=10)
-    axes[idx].grid(axis='x', alpha=0.3)
-
-# Remove extra subplot
-axes[-1].remove()
-
-plt.tight_layout()
-plt.savefig('05_crime_types_detail.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 05_crime_types_detail.png")
-plt.show()
-
-# ============================================================================
-# SECTION 5: TEMPORAL TRENDS
-# ============================================================================
-print("\n" + "="*80)
-print("TEMPORAL TRENDS")
-print("="*80)
-
-# Analyze trends over years
-yearly_crimes = df.groupby('Year')[crime_columns].sum()
-
-fig, axes = plt.subplots(2, 1, figsize=(14, 10))
-
-# Plot 1: Total crimes over time
-total_by_year = yearly_crimes.sum(axis=1)
-axes[0].plot(yearly_crimes.index, total_by_year, marker='o', linewidth=2.5, 
-            markersize=8, color='darkred')
-axes[0].fill_between(yearly_crimes.index, total_by_year, alpha=0.3, color='red')
-axes[0].set_title('Total Crimes Against Women Over Years', fontsize=14, fontweight='bold')
-axes[0].set_xlabel('Year', fontsize=12)
-axes[0].set_ylabel('Total Cases', fontsize=12)
-axes[0].grid(True, alpha=0.3)
-
-# Plot 2: Individual crime types over time
-for crime in crime_columns:
-    axes[1].plot(yearly_crimes.index, yearly_crimes[crime], marker='o', 
-                label=crime_labels.get(crime, crime), linewidth=2)
-
-axes[1].set_title('Crime Types Trends Over Years', fontsize=14, fontweight='bold')
-axes[1].set_xlabel('Year', fontsize=12)
-axes[1].set_ylabel('Number of Cases', fontsize=12)
-axes[1].legend(loc='best', fontsize=10)
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('06_crime_trends.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 06_crime_trends.png")
-plt.show()
-
-# ============================================================================
-# SECTION 6: COMPREHENSIVE SUMMARY
-# ============================================================================
-print("\n" + "="*80)
-print("COMPREHENSIVE EDA SUMMARY")
-print("="*80)
-
-print("\n1. HIGHEST CRIME STATES:")
-print("-" * 80)
-print(f"   • Uttar Pradesh: {state_crime_totals['UTTAR PRADESH']:,} total cases (Highest)")
-print(f"   • Madhya Pradesh: {state_crime_totals['MADHYA PRADESH']:,} total cases")
-print(f"   • Maharashtra: {state_crime_totals['MAHARASHTRA']:,} total cases")
-print(f"   • Rajasthan: {state_crime_totals['RAJASTHAN']:,} total cases")
-print(f"   • Gujarat: {state_crime_totals['GUJARAT']:,} total cases")
-
-print("\n2. CRIME TYPE DISTRIBUTION:")
-print("-" * 80)
-total_by_crime = df[crime_columns].sum().sort_values(ascending=False)
-for crime, count in total_by_crime.items():
-    percentage = (count / total_by_crime.sum()) * 100
-    print(f"   {crime_labels.get(crime, crime):25} : {int(count):8,} cases ({percentage:5.1f}%)")
-
-print("\n3. TEMPORAL TRENDS:")
-print("-" * 80)
-first_year = df['Year'].min()
-last_year = df['Year'].max()
-crimes_first_year = df[df['Year'] == first_year][crime_columns].sum().sum()
-crimes_last_year = df[df['Year'] == last_year][crime_columns].sum().sum()
-growth = ((crimes_last_year - crimes_first_year) / crimes_first_year) * 100
-
-print(f"   • Year {first_year}: {int(crimes_first_year):,} total cases")
-print(f"   • Year {last_year}: {int(crimes_last_year):,} total cases")
-print(f"   • Growth: {growth:+.1f}% over {last_year - first_year} years")
-
-# ============================================================================
-# DETAILED INSIGHTS
-# ============================================================================
-print("\n" + "="*80)
-print("KEY INSIGHTS (250-300 words)")
-print("="*80)
-
-insights = """
-This exploratory data analysis reveals critical patterns in crimes against women 
-across Indian states from 2001-2012. 
-
-GEOGRAPHIC DISPARITIES:
-Uttar Pradesh emerges as the state with the highest absolute number of crimes, 
-followed by Madhya Pradesh, Maharashtra, Rajasthan, and Gujarat. These five states 
-account for approximately 40% of all crimes against women recorded during the study 
-period. Regional clustering identifies four distinct state groups based on crime 
-patterns: High-crime states with comprehensive crime data across all categories, 
-medium-crime states, low-crime states, and states with sporadic crime reporting.
-
-CRIME TYPE DISTRIBUTION:
-Domestic Violence (DV) is the most prevalent form of violence against women (36.2% 
-of all cases), followed by Assault on Women (AoW) at 28.1%. Rape cases constitute 
-14.3% of reported crimes, while Dowry Deaths account for 11.2%. Women Trafficking 
-(0.8%) and Kidnapping & Assault (8.1%) represent smaller but significant portions. 
-However, these aggregate figures mask substantial state-level variations: rape 
-incidents are disproportionately high in certain states, dowry deaths cluster in 
-specific regions, and domestic violence patterns vary significantly across states.
-
-STATE-LEVEL PATTERNS:
-Geographic disparities are pronounced, with large variation in crime types by 
-region. Domestic violence dominates in Western and Northern states, while assault 
-cases are notably high in Central and Eastern regions. This suggests varying social, 
-economic, and law enforcement factors across states.
-
-TEMPORAL ANALYSIS:
-An overall increasing trend in reported crimes is observed, particularly after 
-2006. This may reflect improved reporting mechanisms rather than actual crime 
-increase. Year-on-year fluctuations suggest seasonal or policy-driven variations 
-in crime reporting and investigation.
-
-RECOMMENDATIONS:
-These findings underscore the need for targeted, region-specific interventions 
-addressing predominant crime types, enhanced awareness programs in high-crime 
-states, and improved data collection systems for consistent crime monitoring.
-"""
-
-print(insights)
-print("="*80)
-
-print("\nAnalysis Complete! Check the generated visualization files:")
-print("  1. 01_top_crime_states.png")
-print("  2. 02_elbow_silhouette.png")
-print("  3. 03_state_clusters.png")
-print("  4. 04_crime_heatmap.png")
-print("  5. 05_crime_types_detail.png")
-print("  6. 06_crime_trends.png")
+    print("\nDataset Shape:", df.shape)
+    print("\nFirst few rows:")
+    print(df.head())
+    print("\nColumn Descriptions:")
+    print(description)
+
+    # Data quality checks
+    print("\n" + "="*80)
+    print("DATA QUALITY CHECK")
+    print("="*80)
+    print("\nMissing Values:")
+    print(df.isnull().sum())
+
+    # Handle any missing values
+    df = clean(df)
+
+    # Aggregate once; every section below reads from it
+    agg = build_aggregate(df)
+
+    # ============================================================================
+    # SECTION 2: TASK 1 - IDENTIFY STATES WITH HIGHEST CRIME
+    # ============================================================================
+    print("\n" + "="*80)
+    print("TASK 1: STATES WITH HIGHEST CRIME AGAINST WOMEN")
+    print("="*80)
+
+    # Calculate total crimes by state
+    state_crime_totals = top_states(agg)
+    print("\nTop 15 States with Highest Total Crimes Against Women:")
+    for rank, (state, count) in enumerate(state_crime_totals.head(15).items(), 1):
+        print(f"{rank:2}. {state:25} : {int(count):8,} cases")
+
+    # Calculate average crimes per year by state
+    state_avg_crimes = state_averages(agg)
+
+    print("\nTop 15 States with Highest Average Crimes per Year:")
+    for rank, (state, count) in enumerate(state_avg_crimes.head(15).items(), 1):
+        print(f"{rank:2}. {state:25} : {count:10.0f} cases/year")
+
+    # ============================================================================
+    # SECTION 3: TASK 2 - CLUSTERING ANALYSIS
+    # ============================================================================
+    print("\n" + "="*80)
+    print("TASK 2: CLUSTER STATES BASED ON CRIME DATA")
+    print("="*80)
+
+    # Prepare data for clustering
+    state_aggregated = cluster_input(agg)
+
+    # Standardize the data
+    state_scaled, _ = scale_features(state_aggregated)
+
+    # Find optimal number of clusters using elbow method
+    K_range = range(2, 11)
+    inertias, silhouette_scores = k_sweep(state_scaled, K_range)
+
+    # Perform K-means clustering with optimal k=4
+    optimal_k = OPTIMAL_K
+    clusters = fit_clusters(state_scaled, optimal_k)
+
+    print(f"\nOptimal number of clusters: {optimal_k}")
+    print("\nCluster Composition:")
+    for cluster_id, states_in_cluster, total_crimes in cluster_breakdown(state_aggregated, clusters):
+        print(f"\nCluster {cluster_id} ({len(states_in_cluster)} states):")
+        print(f"  Total crimes: {total_crimes:,}")
+        print(f"  States: {', '.join(states_in_cluster)}")
+
+    # Project onto the first two principal components for the cluster plot
+    state_pca, explained = pca_projection(state_scaled)
+
+    # ============================================================================
+    # SECTION 4: TASK 3 - CRIME TYPE DISTRIBUTION
+    # ============================================================================
+    print("\n" + "="*80)
+    print("TASK 3: CRIME TYPE DISTRIBUTION BY STATE")
+    print("="*80)
+
+    # Find top states for each crime type
+    print("\nTop States by Crime Type:")
+    print("-" * 80)
+
+    for crime, (top_state, count) in crime_leaders(agg).iterrows():
+        print(f"{crime_labels.get(crime, crime):25} : {top_state:25} ({int(count):6,} cases)")
+
+    # ============================================================================
+    # SECTION 5: TEMPORAL TRENDS
+    # ============================================================================
+    print("\n" + "="*80)
+    print("TEMPORAL TRENDS")
+    print("="*80)
+
+    # Analyze trends over years
+    yearly_crimes = yearly_trends(agg)
+    print(yearly_crimes.sum(axis=1).to_string())
+
+    # ============================================================================
+    # VISUALIZATIONS
+    # ============================================================================
+    print("\n" + "="*80)
+    print("VISUALIZATIONS")
+    print("="*80)
+
+    jobs = standard_jobs(agg, {
+        'k_values': K_range,
+        'inertias': inertias,
+        'silhouettes': silhouette_scores,
+        'labels': clusters,
+        'pca_data': state_pca,
+        'explained': explained,
+        'states': state_aggregated.index,
+    })
+    for path, rendered in render_or_show(jobs, headless):
+        print(f"[SAVED] {path}" if rendered else f"[UP TO DATE] {path}")
+
+    # ============================================================================
+    # SECTION 6: COMPREHENSIVE SUMMARY
+    # ============================================================================
+    print("\n" + "="*80)
+    print("COMPREHENSIVE EDA SUMMARY")
+    print("="*80)
+
+    print("\n1. HIGHEST CRIME STATES:")
+    print("-" * 80)
+    for rank, (state, count) in enumerate(state_crime_totals.head(5).items(), 1):
+        print(f"   • {state}: {int(count):,} total cases{' (Highest)' if rank == 1 else ''}")
+
+    print("\n2. CRIME TYPE DISTRIBUTION:")
+    print("-" * 80)
+    total_by_crime = crime_totals(agg).sort_values(ascending=False)
+    for crime, count in total_by_crime.items():
+        percentage = (count / total_by_crime.sum()) * 100
+        print(f"   {crime_labels.get(crime, crime):25} : {int(count):8,} cases ({percentage:5.1f}%)")
+
+    print("\n3. TEMPORAL TRENDS:")
+    print("-" * 80)
+    change = temporal_change(agg)
+    first_year, last_year = change['first_year'], change['last_year']
+
+    print(f"   • Year {first_year}: {int(change['first']):,} total cases")
+    print(f"   • Year {last_year}: {int(change['last']):,} total cases")
+    print(f"   • Growth: {change['growth']:+.1f}% over {last_year - first_year} years")
+
+    # ============================================================================
+    # DETAILED INSIGHTS
+    # ============================================================================
+    print("\n" + "="*80)
+    print("KEY INSIGHTS")
+    print("="*80)
+
+    print(summary_text(report_facts(agg, n_clusters=optimal_k)))
+    print("="*80)
+
+    print("\nAnalysis Complete! Check the generated visualization files:")
+    for rank, job in enumerate(jobs, 1):
+        print(f"  {rank}. {job.filename}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true',
+                        help="use a non-interactive backend and skip plt.show()")
+    main(headless=parser.parse_args().headless)
@@ -1,328 +1,208 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.decomposition import PCA
+import argparse
 import warnings
-import os
 
-warnings.filterwarnings('ignore')
+from crimes_core import (
+    CRIME_NAMES as crime_names,
+    build_aggregate,
+    clean,
+    cluster_input,
+    crime_leaders,
+    crime_totals,
+    load_data,
+    memory_report,
+    state_averages,
+    temporal_change,
+    top_states,
+)
+from crimes_core.clustering import (
+    OPTIMAL_K,
+    cluster_breakdown,
+    fit_clusters,
+    k_sweep,
+    pca_projection,
+    scale_features,
+)
+from crimes_core.figures import standard_jobs
+from crimes_core.forecast import fit_trend, forecast_cube
+from crimes_core.profiling import Profiler
+from crimes_core.render import render_or_show, use_headless
+from crimes_core.report import report_facts, summary_text
+
+
+def main(headless=False, n_jobs=None, force=False, profile_path=None):
+    warnings.filterwarnings('ignore')
+    profiler = Profiler(enabled=profile_path is not None)
+
+    if headless:
+        use_headless()
+
+    print("="*80)
+    print("CRIMES AGAINST WOMEN - EXPLORATORY DATA ANALYSIS")
+    print("="*80)
 
-# Setup plot styling
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
-
-print("="*80)
-print("CRIMES AGAINST WOMEN - EXPLORATORY DATA ANALYSIS")
-print("="*80)
-
-# load the data from GitHub
-github_url = "https://raw.githubusercontent.com/VK-SHRIDHARAN/23BCE2086-EDA-On-Women-Safety_TAM/main/"
-
-try:
-    # try loading from GitHub first
-    df = pd.read_csv(github_url + 'CrimesOnWomenData.csv', index_col=0)
-    desc = pd.read_csv(github_url + 'description.csv', index_col=0)
-    print("Data loaded from GitHub")
-except:
-    # fallback to local files if available
     try:
-        df = pd.read_csv('CrimesOnWomenData.csv', index_col=0)
-        desc = pd.read_csv('description.csv', index_col=0)
-        print("Data loaded from local directory")
-    except:
+        with profiler.stage('load'):
+            df, desc, source = load_data()
+        print(f"Data loaded from {source}")
+    except Exception:
         print("Error: Could not load data. Make sure files are available locally or on GitHub.")
         raise
 
-print(f"\nDataset: {df.shape[0]} records, {df.shape[1]} columns")
-print("\nFirst few entries:")
-print(df.head(3))
-print("\nColumns:")
-print(desc)
-
-# Check data quality
-print("\n" + "="*80)
-print("DATA VALIDATION")
-print("="*80)
-print(f"Missing values: {df.isnull().sum().sum()}")
-print(f"Date range: {df['Year'].min()} to {df['Year'].max()}")
-print(f"States: {df['State'].nunique()}")
-
-df = df.fillna(0)
-
-# Define crime types
-crimes = ['Rape', 'K&A', 'DD', 'AoW', 'AoM', 'DV', 'WT']
-crime_names = {
-    'Rape': 'Rape',
-    'K&A': 'Kidnapping & Assault',
-    'DD': 'Dowry Deaths',
-    'AoW': 'Assault on Women',
-    'AoM': 'Assault on Modesty',
-    'DV': 'Domestic Violence',
-    'WT': 'Women Trafficking'
-}
-
-print("\n" + "="*80)
-print("TASK 1: HIGH-CRIME STATES")
-print("="*80)
-
-# Get total crimes per state
-state_totals = df.groupby('State')[crimes].sum().sum(axis=1).sort_values(ascending=False)
-print("\nTop 15 States (Total Cases):")
-for i, (state, count) in enumerate(state_totals.head(15).items(), 1):
-    print(f"{i:2}. {state:25} {count:>10,} cases")
-
-# Average per year
-state_avg = df.groupby('State')[crimes].sum().sum(axis=1) / df.groupby('State').size()
-state_avg = state_avg.sort_values(ascending=False)
-
-print("\nTop 15 States (Average per Year):")
-for i, (state, count) in enumerate(state_avg.head(15).items(), 1):
-    print(f"{i:2}. {state:25} {count:>10,.0f} cases/year")
-
-# Visualize
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-
-state_totals.head(15).plot(kind='bar', ax=axes[0], color='darkred', alpha=0.8)
-axes[0].set_title('States with Most Crimes Against Women', fontsize=13, fontweight='bold')
-axes[0].set_ylabel('Total Cases')
-axes[0].tick_params(axis='x', rotation=45)
-axes[0].grid(axis='y', alpha=0.3)
-
-state_avg.head(15).plot(kind='bar', ax=axes[1], color='crimson', alpha=0.8)
-axes[1].set_title('States by Average Crimes per Year', fontsize=13, fontweight='bold')
-axes[1].set_ylabel('Average Cases per Year')
-axes[1].tick_params(axis='x', rotation=45)
-axes[1].grid(axis='y', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('01_top_crime_states.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 01_top_crime_states.png")
-plt.show()
-
-print("\n" + "="*80)
-print("TASK 2: CLUSTERING ANALYSIS")
-print("="*80)
-
-# Prepare for clustering
-state_data = df.groupby('State')[crimes].sum()
-scaler = StandardScaler()
-scaled_data = scaler.fit_transform(state_data)
-
-# Find optimal clusters
-inertias = []
-silhouettes = []
-k_values = range(2, 11)
-
-for k in k_values:
-    km = KMeans(n_clusters=k, random_state=42, n_init=10)
-    km.fit(scaled_data)
-    inertias.append(km.inertia_)
-    silhouettes.append(silhouette_score(scaled_data, km.labels_))
-
-# Show optimization
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-axes[0].plot(k_values, inertias, 'bo-', linewidth=2, markersize=8)
-axes[0].set_xlabel('Number of Clusters')
-axes[0].set_ylabel('Inertia')
-axes[0].set_title('Elbow Method', fontsize=12, fontweight='bold')
-axes[0].grid(True, alpha=0.3)
-
-axes[1].plot(k_values, silhouettes, 'go-', linewidth=2, markersize=8)
-axes[1].set_xlabel('Number of Clusters')
-axes[1].set_ylabel('Silhouette Score')
-axes[1].set_title('Silhouette Analysis', fontsize=12, fontweight='bold')
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('02_elbow_silhouette.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 02_elbow_silhouette.png")
-plt.show()
-
-# Apply clustering with k=4
-optimal_k = 4
-km = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-clusters = km.fit_predict(scaled_data)
-state_data['Cluster'] = clusters
-
-print(f"\nOptimal clusters: {optimal_k}")
-print("\nCluster breakdown:")
-for i in range(optimal_k):
-    cluster_states = state_data[state_data['Cluster'] == i].index.tolist()
-    total = state_data[state_data['Cluster'] == i][crimes].sum().sum()
-    print(f"\nCluster {i}: {len(cluster_states)} states, {int(total):,} total crimes")
-    print(f"  States: {', '.join(cluster_states[:5])}{'...' if len(cluster_states) > 5 else ''}")
-
-# Visualize clusters
-pca = PCA(n_components=2)
-pca_data = pca.fit_transform(scaled_data)
-
-plt.figure(figsize=(12, 8))
-scatter = plt.scatter(pca_data[:, 0], pca_data[:, 1], c=clusters, cmap='viridis', 
-                     s=200, alpha=0.7, edgecolors='black', linewidth=1.5)
-
-for idx, state in enumerate(state_data.index):
-    plt.annotate(state, (pca_data[idx, 0], pca_data[idx, 1]), 
-                fontsize=8, ha='center', va='center', fontweight='bold')
-
-plt.xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.1%})')
-plt.ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.1%})')
-plt.title('State Clusters - Principal Component Analysis', fontsize=13, fontweight='bold')
-plt.colorbar(scatter, label='Cluster')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('03_state_clusters.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 03_state_clusters.png")
-plt.show()
-
-print("\n" + "="*80)
-print("TASK 3: CRIME TYPE ANALYSIS")
-print("="*80)
-
-# Analyze by crime type
-crime_by_state = df.groupby('State')[crimes].sum()
-
-print("\nHighest crime state by type:")
-for crime in crimes:
-    top_state = crime_by_state[crime].idxmax()
-    count = crime_by_state[crime].max()
-    print(f"  {crime_names.get(crime, crime):25} - {top_state:25} ({int(count):,})")
-
-# Heatmap
-fig, ax = plt.subplots(figsize=(14, 10))
-
-top_15_states = state_data[crimes].sum(axis=1).nlargest(15).index
-hmap_data = crime_by_state.loc[top_15_states, crimes]
-
-sns.heatmap(hmap_data, annot=True, fmt='d', cmap='YlOrRd', 
-           cbar_kws={'label': 'Cases'}, ax=ax, linewidths=0.5)
-ax.set_title('Crime Distribution - Top 15 States', fontsize=13, fontweight='bold')
-ax.set_xlabel('Crime Type')
-ax.set_ylabel('State')
-plt.tight_layout()
-plt.savefig('04_crime_heatmap.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 04_crime_heatmap.png")
-plt.show()
-
-# Individual crime type charts
-fig, axes = plt.subplots(2, 4, figsize=(18, 10))
-axes = axes.flatten()
-
-for idx, crime in enumerate(crimes):
-    top_10 = crime_by_state[crime].nlargest(10)
-    top_10.plot(kind='barh', ax=axes[idx], color=plt.cm.Set3(idx), alpha=0.8)
-    axes[idx].set_title(f'Top 10: {crime_names[crime]}', fontsize=11, fontweight='bold')
-    axes[idx].set_xlabel('Cases')
-    axes[idx].grid(axis='x', alpha=0.3)
-
-axes[-1].remove()
-plt.tight_layout()
-plt.savefig('05_crime_types_detail.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 05_crime_types_detail.png")
-plt.show()
-
-print("\n" + "="*80)
-print("TRENDS OVER TIME")
-print("="*80)
-
-# Year-by-year analysis
-by_year = df.groupby('Year')[crimes].sum()
-
-fig, axes = plt.subplots(2, 1, figsize=(14, 10))
-
-total_by_year = by_year.sum(axis=1)
-axes[0].plot(by_year.index, total_by_year, marker='o', linewidth=2.5, 
-            markersize=8, color='darkred')
-axes[0].fill_between(by_year.index, total_by_year, alpha=0.3, color='red')
-axes[0].set_title('Total Crimes Over Time', fontsize=13, fontweight='bold')
-axes[0].set_ylabel('Cases')
-axes[0].grid(True, alpha=0.3)
-
-for crime in crimes:
-    axes[1].plot(by_year.index, by_year[crime], marker='o', 
-                label=crime_names.get(crime, crime), linewidth=2)
-
-axes[1].set_title('Crime Type Trends', fontsize=13, fontweight='bold')
-axes[1].set_xlabel('Year')
-axes[1].set_ylabel('Cases')
-axes[1].legend(loc='best', fontsize=10)
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('06_crime_trends.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 06_crime_trends.png")
-plt.show()
-
-print("\n" + "="*80)
-print("KEY FINDINGS")
-print("="*80)
-
-total_crimes = df[crimes].sum().sum()
-print(f"\nTotal crimes analyzed: {int(total_crimes):,}")
-
-print("\nCrime distribution:")
-crime_totals = df[crimes].sum().sort_values(ascending=False)
-for crime, count in crime_totals.items():
-    pct = (count / total_crimes) * 100
-    print(f"  {crime_names.get(crime, crime):25} {pct:5.1f}% ({int(count):,})")
-
-print("\nTop 5 states:")
-for rank, (state, count) in enumerate(state_totals.head(5).items(), 1):
-    pct = (count / total_crimes) * 100
-    print(f"  {rank}. {state:25} {pct:5.1f}% ({int(count):,})")
-
-first_year = df['Year'].min()
-last_year = df['Year'].max()
-crimes_first = df[df['Year'] == first_year][crimes].sum().sum()
-crimes_last = df[df['Year'] == last_year][crimes].sum().sum()
-growth = ((crimes_last - crimes_first) / crimes_first) * 100
-
-print(f"\nTemporal changes ({first_year}-{last_year}):")
-print(f"  {first_year}: {int(crimes_first):,} cases")
-print(f"  {last_year}: {int(crimes_last):,} cases")
-print(f"  Change: {growth:+.1f}%")
-
-print("\n" + "="*80)
-print("SUMMARY")
-print("="*80)
-
-summary = """
-This analysis examined crime data across Indian states from 2001-2021. 
-
-Key observations:
-- Uttar Pradesh consistently has the highest number of crimes against women
-- Domestic violence is the most prevalent crime type, accounting for 39% of cases
-- Four distinct state clusters were identified based on crime patterns
-- Crime reporting has increased significantly over the 20-year period
-
-The data shows major regional variations in crime types, suggesting different social 
-and enforcement factors across states. High-crime states require targeted intervention 
-programs focused on prevention and support services.
-
-Regional patterns indicate that domestic violence is particularly prevalent in 
-certain regions, while assault cases peak in other areas. This geographic variation 
-highlights the need for region-specific policy responses rather than one-size-fits-all 
-solutions.
-
-Recommendations:
-1. Develop state-specific intervention programs based on predominant crime types
-2. Launch awareness campaigns in high-crime states
-3. Strengthen data collection and reporting infrastructure
-4. Allocate resources proportionally using clustering insights
-5. Support victim services with focus on high-incident crime types
-"""
-
-print(summary)
-print("="*80)
-print("\nAnalysis complete. Visualizations saved:")
-print("  01_top_crime_states.png")
-print("  02_elbow_silhouette.png")
-print("  03_state_clusters.png")
-print("  04_crime_heatmap.png")
-print("  05_crime_types_detail.png")
-print("  06_crime_trends.png")
+    print(f"\nDataset: {df.shape[0]} records, {df.shape[1]} columns")
+    print("\nFirst few entries:")
+    print(df.head(3))
+    print("\nColumns:")
+    print(desc)
+
+    # Check data quality
+    print("\n" + "="*80)
+    print("DATA VALIDATION")
+    print("="*80)
+    print(f"Missing values: {df.isnull().sum().sum()}")
+    print(f"Date range: {df['Year'].min()} to {df['Year'].max()}")
+    print(f"States: {df['State'].nunique()}")
+    print(f"Memory: {memory_report(df)}")
+
+    with profiler.stage('clean'):
+        df = clean(df)
+
+    # every table below is derived from this single aggregate
+    with profiler.stage('aggregate'):
+        agg = build_aggregate(df)
+        state_totals = top_states(agg)
+        state_avg = state_averages(agg)
+
+    print("\n" + "="*80)
+    print("TASK 1: HIGH-CRIME STATES")
+    print("="*80)
+
+    # Get total crimes per state
+    print("\nTop 15 States (Total Cases):")
+    for i, (state, count) in enumerate(state_totals.head(15).items(), 1):
+        print(f"{i:2}. {state:25} {count:>10,} cases")
+
+    # Average per year
+    print("\nTop 15 States (Average per Year):")
+    for i, (state, count) in enumerate(state_avg.head(15).items(), 1):
+        print(f"{i:2}. {state:25} {count:>10,.0f} cases/year")
+
+    print("\n" + "="*80)
+    print("TASK 2: CLUSTERING ANALYSIS")
+    print("="*80)
+
+    # Prepare for clustering
+    state_data = cluster_input(agg)
+    scaled_data, _ = scale_features(state_data)
+
+    # Find optimal clusters
+    k_values = range(2, 11)
+    with profiler.stage('k_sweep'):
+        inertias, silhouettes = k_sweep(scaled_data, k_values, n_jobs=n_jobs)
+
+    # Apply clustering with k=4
+    optimal_k = OPTIMAL_K
+    with profiler.stage('kmeans'):
+        clusters = fit_clusters(scaled_data, optimal_k)
+
+    print(f"\nOptimal clusters: {optimal_k}")
+    print("\nCluster breakdown:")
+    for i, cluster_states, total in cluster_breakdown(state_data, clusters):
+        print(f"\nCluster {i}: {len(cluster_states)} states, {total:,} total crimes")
+        print(f"  States: {', '.join(cluster_states[:5])}{'...' if len(cluster_states) > 5 else ''}")
+
+    with profiler.stage('pca'):
+        pca_data, explained = pca_projection(scaled_data)
+
+    print("\n" + "="*80)
+    print("TASK 3: CRIME TYPE ANALYSIS")
+    print("="*80)
+
+    print("\nHighest crime state by type:")
+    for crime, (top_state, count) in crime_leaders(agg).iterrows():
+        print(f"  {crime_names.get(crime, crime):25} - {top_state:25} ({int(count):,})")
+
+    print("\n" + "="*80)
+    print("KEY FINDINGS")
+    print("="*80)
+
+    with profiler.stage('summary'):
+        by_crime = crime_totals(agg).sort_values(ascending=False)
+        total_crimes = by_crime.sum()
+        change = temporal_change(agg)
+    print(f"\nTotal crimes analyzed: {int(total_crimes):,}")
+
+    print("\nCrime distribution:")
+    for crime, count in by_crime.items():
+        pct = (count / total_crimes) * 100
+        print(f"  {crime_names.get(crime, crime):25} {pct:5.1f}% ({int(count):,})")
+
+    print("\nTop 5 states:")
+    for rank, (state, count) in enumerate(state_totals.head(5).items(), 1):
+        pct = (count / total_crimes) * 100
+        print(f"  {rank}. {state:25} {pct:5.1f}% ({int(count):,})")
+
+    first_year, last_year = change['first_year'], change['last_year']
+
+    print(f"\nTemporal changes ({first_year}-{last_year}):")
+    print(f"  {first_year}: {int(change['first']):,} cases")
+    print(f"  {last_year}: {int(change['last']):,} cases")
+    print(f"  Change: {change['growth']:+.1f}%")
+
+    with profiler.stage('growth'):
+        cagr = agg.cube.growth_tables.cagr_frame()['total'].dropna().sort_values(ascending=False)
+
+    print("\nFastest-growing states (CAGR of total cases, first non-zero to last reported year):")
+    for state, rate in cagr.head(5).items():
+        print(f"  {state:25} {rate:+6.1f}% per year")
+
+    # every state x crime series is fitted in one batched pass
+    with profiler.stage('forecast'):
+        series_forecast = forecast_cube(agg.cube)
+        national = fit_trend(agg.cube.years, agg.cube.year_totals.sum(axis=1))
+
+    print(f"\nForecast (linear trend, 95% interval, {series_forecast.point[0].size} state x crime series fitted):")
+    for year, point, lower, upper in zip(*national):
+        print(f"  {year}: {point:>10,.0f} cases ({lower:,.0f} - {upper:,.0f})")
+
+    print("\n" + "="*80)
+    print("VISUALIZATIONS")
+    print("="*80)
+
+    # each figure only needs the aggregates computed above
+    jobs = standard_jobs(agg, {
+        'k_values': k_values,
+        'inertias': inertias,
+        'silhouettes': silhouettes,
+        'labels': clusters,
+        'pca_data': pca_data,
+        'explained': explained,
+        'states': state_data.index,
+    })
+    for path, rendered in render_or_show(jobs, headless, n_jobs=n_jobs, force=force, profiler=profiler):
+        print(f"[SAVED] {path}" if rendered else f"[UP TO DATE] {path}")
+
+    print("\n" + "="*80)
+    print("SUMMARY")
+    print("="*80)
+
+    print(summary_text(report_facts(agg, n_clusters=optimal_k)))
+    print("="*80)
+    print("\nAnalysis complete. Visualizations saved:")
+    for job in jobs:
+        print(f"  {job.filename}")
+
+    if profile_path:
+        print(f"\n[PROFILE] {profiler.write(profile_path)}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Crimes against women EDA")
+    parser.add_argument('--headless', action='store_true',
+                        help="render figures with a non-interactive backend in parallel, without plt.show()")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render headless figures even when their inputs are unchanged")
+    parser.add_argument('--profile', nargs='?', const='profile.json', default=None, metavar='PATH',
+                        help="write per-stage timing and memory as JSON (or CSV for a .csv path)")
+    args = parser.parse_args()
+    main(headless=args.headless, n_jobs=args.jobs, force=args.force, profile_path=args.profile)
@@ -1,421 +1,200 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.decomposition import PCA
+import argparse
 import warnings
 
-warnings.filterwarnings('ignore')
+from crimes_core import (
+    CRIME_NAMES as crime_names,
+    build_aggregate,
+    clean,
+    cluster_input,
+    crime_leaders,
+    crime_totals,
+    load_data,
+    memory_report,
+    state_averages,
+    temporal_change,
+    top_states,
+    yearly_trends,
+)
+from crimes_core.clustering import (
+    OPTIMAL_K,
+    cluster_breakdown,
+    fit_clusters,
+    k_sweep,
+    pca_projection,
+    scale_features,
+)
+from crimes_core.anomaly import detect
+from crimes_core.figures import overview_jobs
+from crimes_core.render import render_or_show, use_headless
+from crimes_core.report import report_facts, summary_text
+
+
+def main(headless=False):
+    warnings.filterwarnings('ignore')
+
+    if headless:
+        use_headless()
+
+    print("="*80)
+    print("CRIMES AGAINST WOMEN - EXPLORATORY DATA ANALYSIS")
+    print("="*80)
 
-# make plots look nice
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
-
-print("="*80)
-print("CRIMES AGAINST WOMEN - EXPLORATORY DATA ANALYSIS")
-print("="*80)
-
-# load the data from GitHub
-github_url = "https://raw.githubusercontent.com/VK-SHRIDHARAN/23BCE2086-EDA-On-Women-Safety_TAM/main/"
-
-try:
-    # try loading from GitHub first
-    df = pd.read_csv(github_url + 'CrimesOnWomenData.csv', index_col=0)
-    desc = pd.read_csv(github_url + 'description.csv', index_col=0)
-    print("Data loaded from GitHub")
-except:
-    # fallback to local files if available
     try:
-        df = pd.read_csv('CrimesOnWomenData.csv', index_col=0)
-        desc = pd.read_csv('description.csv', index_col=0)
-        print("Data loaded from local directory")
-    except:
+        df, desc, source = load_data()
+        print(f"Data loaded from {source}")
+    except Exception:
         print("Error: Could not load data. Make sure files are available locally or on GitHub.")
         raise
 
-print(f"\nDataset: {df.shape[0]} records, {df.shape[1]} columns")
-print("\nFirst few entries:")
-print(df.head(3))
-print("\nColumns:")
-print(desc)
-
-# check data quality
-print("\n" + "="*80)
-print("DATA VALIDATION")
-print("="*80)
-print(f"Missing values: {df.isnull().sum().sum()}")
-print(f"Date range: {df['Year'].min()} to {df['Year'].max()}")
-print(f"States: {df['State'].nunique()}")
-
-df = df.fillna(0)
-
-# define crime types
-crimes = ['Rape', 'K&A', 'DD', 'AoW', 'AoM', 'DV', 'WT']
-crime_names = {
-    'Rape': 'Rape',
-    'K&A': 'Kidnapping & Assault',
-    'DD': 'Dowry Deaths',
-    'AoW': 'Assault on Women',
-    'AoM': 'Assault on Modesty',
-    'DV': 'Domestic Violence',
-    'WT': 'Women Trafficking'
-}
-
-print("\n" + "="*80)
-print("TASK 1: HIGH-CRIME STATES")
-print("="*80)
-
-# get total crimes per state
-state_totals = df.groupby('State')[crimes].sum().sum(axis=1).sort_values(ascending=False)
-print("\nTop 15 States (Total Cases):")
-for i, (state, count) in enumerate(state_totals.head(15).items(), 1):
-    print(f"{i:2}. {state:25} {count:>10,} cases")
-
-# average per year
-state_avg = df.groupby('State')[crimes].sum().sum(axis=1) / df.groupby('State').size()
-state_avg = state_avg.sort_values(ascending=False)
-
-print("\nTop 15 States (Average per Year):")
-for i, (state, count) in enumerate(state_avg.head(15).items(), 1):
-    print(f"{i:2}. {state:25} {count:>10,.0f} cases/year")
-
-# visualize top states
-fig, axes = plt.subplots(2, 2, figsize=(18, 12))
-
-# total cases bar chart
-state_totals.head(15).plot(kind='bar', ax=axes[0, 0], color='darkred', alpha=0.8)
-axes[0, 0].set_title('Top 15 States - Total Cases', fontsize=13, fontweight='bold')
-axes[0, 0].set_ylabel('Total Cases')
-axes[0, 0].tick_params(axis='x', rotation=45)
-axes[0, 0].grid(axis='y', alpha=0.3)
-
-# average per year
-state_avg.head(15).plot(kind='bar', ax=axes[0, 1], color='crimson', alpha=0.8)
-axes[0, 1].set_title('Top 15 States - Average per Year', fontsize=13, fontweight='bold')
-axes[0, 1].set_ylabel('Average Cases per Year')
-axes[0, 1].tick_params(axis='x', rotation=45)
-axes[0, 1].grid(axis='y', alpha=0.3)
-
-# top 10 states pie chart
-top_10_states = state_totals.head(10)
-others = state_totals.iloc[10:].sum()
-pie_data = pd.concat([top_10_states, pd.Series({'Others': others})])
-
-colors = plt.cm.Set3(np.linspace(0, 1, len(pie_data)))
-axes[1, 0].pie(pie_data, labels=pie_data.index, autopct='%1.1f%%', startangle=90, colors=colors)
-axes[1, 0].set_title('Crime Distribution - Top 10 States', fontsize=13, fontweight='bold')
-
-# top 5 states donut chart
-top_5 = state_totals.head(5)
-rest = state_totals.iloc[5:].sum()
-donut_data = pd.concat([top_5, pd.Series({'Other States': rest})])
-
-wedges, texts, autotexts = axes[1, 1].pie(donut_data, labels=donut_data.index, autopct='%1.1f%%', 
-                                           startangle=90, colors=plt.cm.Pastel1(np.linspace(0, 1, len(donut_data))))
-centre_circle = plt.Circle((0, 0), 0.70, fc='white')
-axes[1, 1].add_artist(centre_circle)
-axes[1, 1].set_title('Crime Share - Top 5 States', fontsize=13, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('01_top_crime_states.png', dpi=300, bbox_inches='tight')
-print("\n[SAVED] 01_top_crime_states.png")
-plt.show()
-
-print("\n" + "="*80)
-print("TASK 2: CLUSTERING ANALYSIS")
-print("="*80)
-
-# prepare for clustering
-state_data = df.groupby('State')[crimes].sum()
-scaler = StandardScaler()
-scaled_data = scaler.fit_transform(state_data)
-
-# find optimal clusters
-inertias = []
-silhouettes = []
-k_values = range(2, 11)
-
-for k in k_values:
-    km = KMeans(n_clusters=k, random_state=42, n_init=10)
-    km.fit(scaled_data)
-    inertias.append(km.inertia_)
-    silhouettes.append(silhouette_score(scaled_data, km.labels_))
-
-# show optimization
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-# elbow curve
-axes[0, 0].plot(k_values, inertias, 'bo-', linewidth=2.5, markersize=8)
-axes[0, 0].set_xlabel('Number of Clusters')
-axes[0, 0].set_ylabel('Inertia')
-axes[0, 0].set_title('Elbow Method', fontsize=12, fontweight='bold')
-axes[0, 0].grid(True, alpha=0.3)
-
-# silhouette scores
-axes[0, 1].plot(k_values, silhouettes, 'go-', linewidth=2.5, markersize=8)
-axes[0, 1].set_xlabel('Number of Clusters')
-axes[0, 1].set_ylabel('Silhouette Score')
-axes[0, 1].set_title('Silhouette Analysis', fontsize=12, fontweight='bold')
-axes[0, 1].grid(True, alpha=0.3)
-
-# silhouette as bar chart
-axes[1, 0].bar(k_values, silhouettes, color='green', alpha=0.7, edgecolor='black')
-axes[1, 0].set_xlabel('Number of Clusters')
-axes[1, 0].set_ylabel('Silhouette Score')
-axes[1, 0].set_title('Cluster Quality by K', fontsize=12, fontweight='bold')
-axes[1, 0].grid(axis='y', alpha=0.3)
-
-# inertia as bar chart
-axes[1, 1].bar(k_values, inertias, color='blue', alpha=0.7, edgecolor='black')
-axes[1, 1].set_xlabel('Number of Clusters')
-axes[1, 1].set_ylabel('Inertia')
-axes[1, 1].set_title('Inertia by K', fontsize=12, fontweight='bold')
-axes[1, 1].grid(axis='y', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('02_elbow_silhouette.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 02_elbow_silhouette.png")
-plt.show()
-
-# apply clustering with k=4
-optimal_k = 4
-km = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-clusters = km.fit_predict(scaled_data)
-state_data['Cluster'] = clusters
-
-print(f"\nOptimal clusters: {optimal_k}")
-print("\nCluster breakdown:")
-for i in range(optimal_k):
-    cluster_states = state_data[state_data['Cluster'] == i].index.tolist()
-    total = state_data[state_data['Cluster'] == i][crimes].sum().sum()
-    print(f"\nCluster {i}: {len(cluster_states)} states, {int(total):,} total crimes")
-    print(f"  States: {', '.join(cluster_states[:5])}{'...' if len(cluster_states) > 5 else ''}")
-
-# visualize clusters
-pca = PCA(n_components=2)
-pca_data = pca.fit_transform(scaled_data)
-
-fig, axes = plt.subplots(1, 2, figsize=(18, 8))
-
-# PCA scatter plot
-scatter = axes[0].scatter(pca_data[:, 0], pca_data[:, 1], c=clusters, cmap='viridis', 
-                         s=200, alpha=0.7, edgecolors='black', linewidth=1.5)
-
-for idx, state in enumerate(state_data.index):
-    axes[0].annotate(state, (pca_data[idx, 0], pca_data[idx, 1]), 
-                    fontsize=8, ha='center', va='center', fontweight='bold')
-
-axes[0].set_xlabel(f'PC1 ({pca.explained_variance_ratio_[0]:.1%})')
-axes[0].set_ylabel(f'PC2 ({pca.explained_variance_ratio_[1]:.1%})')
-axes[0].set_title('State Clusters - PCA Visualization', fontsize=13, fontweight='bold')
-plt.colorbar(scatter, ax=axes[0], label='Cluster')
-axes[0].grid(True, alpha=0.3)
-
-# cluster size pie chart
-cluster_sizes = [sum(clusters == i) for i in range(optimal_k)]
-cluster_labels = [f'Cluster {i}\n({cluster_sizes[i]} states)' for i in range(optimal_k)]
-colors_clusters = plt.cm.viridis(np.linspace(0, 1, optimal_k))
-
-axes[1].pie(cluster_sizes, labels=cluster_labels, autopct='%1.1f%%', startangle=90, colors=colors_clusters)
-axes[1].set_title('Distribution of States Across Clusters', fontsize=13, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('03_state_clusters.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 03_state_clusters.png")
-plt.show()
-
-print("\n" + "="*80)
-print("TASK 3: CRIME TYPE ANALYSIS")
-print("="*80)
-
-# analyze by crime type
-crime_by_state = df.groupby('State')[crimes].sum()
-
-print("\nHighest crime state by type:")
-for crime in crimes:
-    top_state = crime_by_state[crime].idxmax()
-    count = crime_by_state[crime].max()
-    print(f"  {crime_names.get(crime, crime):25} - {top_state:25} ({int(count):,})")
-
-# overall crime distribution
-fig, axes = plt.subplots(2, 2, figsize=(18, 12))
-
-# heatmap
-top_15_states = state_data[crimes].sum(axis=1).nlargest(15).index
-hmap_data = crime_by_state.loc[top_15_states, crimes]
-
-sns.heatmap(hmap_data, annot=True, fmt='d', cmap='YlOrRd', 
-           cbar_kws={'label': 'Cases'}, ax=axes[0, 0], linewidths=0.5)
-axes[0, 0].set_title('Crime Distribution - Top 15 States', fontsize=13, fontweight='bold')
-axes[0, 0].set_xlabel('Crime Type')
-axes[0, 0].set_ylabel('State')
-
-# crime type distribution pie chart
-crime_totals = df[crimes].sum()
-colors_crime = plt.cm.Set3(np.linspace(0, 1, len(crimes)))
-axes[0, 1].pie(crime_totals, labels=[crime_names[c] for c in crimes], autopct='%1.1f%%', 
-              startangle=90, colors=colors_crime)
-axes[0, 1].set_title('Overall Crime Type Distribution', fontsize=13, fontweight='bold')
-
-# crime type bar chart
-crime_totals.sort_values(ascending=True).plot(kind='barh', ax=axes[1, 0], 
-                                              color=plt.cm.RdYlGn_r(np.linspace(0, 1, len(crimes))))
-axes[1, 0].set_title('Total Cases by Crime Type', fontsize=13, fontweight='bold')
-axes[1, 0].set_xlabel('Total Cases')
-axes[1, 0].grid(axis='x', alpha=0.3)
-
-# crime type percentages
-crime_pct = (crime_totals / crime_totals.sum() * 100).sort_values(ascending=True)
-axes[1, 1].barh(range(len(crime_pct)), crime_pct.values, color=plt.cm.Spectral(np.linspace(0, 1, len(crimes))))
-axes[1, 1].set_yticks(range(len(crime_pct)))
-axes[1, 1].set_yticklabels([crime_names[c] for c in crime_pct.index])
-axes[1, 1].set_title('Crime Type Percentage Distribution', fontsize=13, fontweight='bold')
-axes[1, 1].set_xlabel('Percentage (%)')
-axes[1, 1].grid(axis='x', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('04_crime_analysis.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 04_crime_analysis.png")
-plt.show()
-
-# individual crime type charts
-fig, axes = plt.subplots(2, 4, figsize=(20, 10))
-axes = axes.flatten()
-
-for idx, crime in enumerate(crimes):
-    top_10 = crime_by_state[crime].nlargest(10)
-    top_10.plot(kind='barh', ax=axes[idx], color=plt.cm.Set3(idx), alpha=0.8, edgecolor='black')
-    axes[idx].set_title(f'Top 10: {crime_names[crime]}', fontsize=11, fontweight='bold')
-    axes[idx].set_xlabel('Cases')
-    axes[idx].grid(axis='x', alpha=0.3)
-
-axes[-1].remove()
-plt.tight_layout()
-plt.savefig('05_crime_types_detail.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 05_crime_types_detail.png")
-plt.show()
-
-print("\n" + "="*80)
-print("TRENDS OVER TIME")
-print("="*80)
-
-# year-by-year analysis
-by_year = df.groupby('Year')[crimes].sum()
-
-fig, axes = plt.subplots(2, 2, figsize=(18, 12))
-
-# total crimes line
-total_by_year = by_year.sum(axis=1)
-axes[0, 0].plot(by_year.index, total_by_year, marker='o', linewidth=2.5, 
-               markersize=8, color='darkred')
-axes[0, 0].fill_between(by_year.index, total_by_year, alpha=0.3, color='red')
-axes[0, 0].set_title('Total Crimes Over Time', fontsize=13, fontweight='bold')
-axes[0, 0].set_ylabel('Cases')
-axes[0, 0].grid(True, alpha=0.3)
-
-# crime type trends
-for crime in crimes:
-    axes[0, 1].plot(by_year.index, by_year[crime], marker='o', 
-                   label=crime_names.get(crime, crime), linewidth=2)
-
-axes[0, 1].set_title('Crime Type Trends', fontsize=13, fontweight='bold')
-axes[0, 1].set_xlabel('Year')
-axes[0, 1].set_ylabel('Cases')
-axes[0, 1].legend(loc='best', fontsize=9)
-axes[0, 1].grid(True, alpha=0.3)
-
-# year-over-year growth
-growth_rate = total_by_year.pct_change() * 100
-axes[1, 0].bar(growth_rate.index[1:], growth_rate.values[1:], color='steelblue', alpha=0.8, edgecolor='black')
-axes[1, 0].set_title('Year-over-Year Growth Rate', fontsize=13, fontweight='bold')
-axes[1, 0].set_ylabel('Growth Rate (%)')
-axes[1, 0].axhline(y=0, color='black', linestyle='-', linewidth=0.8)
-axes[1, 0].grid(axis='y', alpha=0.3)
-
-# stacked area chart
-ax_stack = axes[1, 1]
-ax_stack.stackplot(by_year.index, [by_year[crime] for crime in crimes], 
-                   labels=[crime_names[crime] for crime in crimes], alpha=0.8)
-ax_stack.set_title('Stacked Crime Types Over Time', fontsize=13, fontweight='bold')
-ax_stack.set_xlabel('Year')
-ax_stack.set_ylabel('Cases')
-ax_stack.legend(loc='upper left', fontsize=9)
-ax_stack.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('06_crime_trends.png', dpi=300, bbox_inches='tight')
-print("[SAVED] 06_crime_trends.png")
-plt.show()
-
-print("\n" + "="*80)
-print("KEY FINDINGS")
-print("="*80)
-
-total_crimes = df[crimes].sum().sum()
-print(f"\nTotal crimes analyzed: {int(total_crimes):,}")
-
-print("\nCrime distribution:")
-crime_totals = df[crimes].sum().sort_values(ascending=False)
-for crime, count in crime_totals.items():
-    pct = (count / total_crimes) * 100
-    print(f"  {crime_names.get(crime, crime):25} {pct:5.1f}% ({int(count):,})")
-
-print("\nTop 5 states:")
-for rank, (state, count) in enumerate(state_totals.head(5).items(), 1):
-    pct = (count / total_crimes) * 100
-    print(f"  {rank}. {state:25} {pct:5.1f}% ({int(count):,})")
-
-first_year = df['Year'].min()
-last_year = df['Year'].max()
-crimes_first = df[df['Year'] == first_year][crimes].sum().sum()
-crimes_last = df[df['Year'] == last_year][crimes].sum().sum()
-growth = ((crimes_last - crimes_first) / crimes_first) * 100
-
-print(f"\nTemporal changes ({first_year}-{last_year}):")
-print(f"  {first_year}: {int(crimes_first):,} cases")
-print(f"  {last_year}: {int(crimes_last):,} cases")
-print(f"  Change: {growth:+.1f}%")
-
-print("\n" + "="*80)
-print("SUMMARY")
-print("="*80)
-
-summary = """
-This analysis examined crime data across Indian states from 2001-2021. 
-
-Key observations:
-- Uttar Pradesh consistently has the highest number of crimes against women
-- Domestic violence is the most prevalent crime type, accounting for 39% of cases
-- Four distinct state clusters were identified based on crime patterns
-- Crime reporting has increased significantly over the 20-year period
-
-The data shows major regional variations in crime types, suggesting different social 
-and enforcement factors across states. High-crime states require targeted intervention 
-programs focused on prevention and support services.
-
-Regional patterns indicate that domestic violence is particularly prevalent in 
-certain regions, while assault cases peak in other areas. This geographic variation 
-highlights the need for region-specific policy responses rather than one-size-fits-all 
-solutions.
-
-Recommendations:
-1. Develop state-specific intervention programs based on predominant crime types
-2. Launch awareness campaigns in high-crime states
-3. Strengthen data collection and reporting infrastructure
-4. Allocate resources proportionally using clustering insights
-5. Support victim services with focus on high-incident crime types
-"""
-
-print(summary)
-print("="*80)
-print("\nAnalysis complete. Visualizations saved:")
-print("  01_top_crime_states.png")
-print("  02_elbow_silhouette.png")
-print("  03_state_clusters.png")
-print("  04_crime_analysis.png")
-print("  05_crime_types_detail.png")
-print("  06_crime_trends.png")
+    print(f"\nDataset: {df.shape[0]} records, {df.shape[1]} columns")
+    print("\nFirst few entries:")
+    print(df.head(3))
+    print("\nColumns:")
+    print(desc)
+
+    # check data quality
+    print("\n" + "="*80)
+    print("DATA VALIDATION")
+    print("="*80)
+    print(f"Missing values: {df.isnull().sum().sum()}")
+    print(f"Date range: {df['Year'].min()} to {df['Year'].max()}")
+    print(f"States: {df['State'].nunique()}")
+    print(f"Memory: {memory_report(df)}")
+
+    df = clean(df)
+
+    # every table below is derived from this single aggregate
+    agg = build_aggregate(df)
+
+    print("\n" + "="*80)
+    print("TASK 1: HIGH-CRIME STATES")
+    print("="*80)
+
+    # get total crimes per state
+    state_totals = top_states(agg)
+    print("\nTop 15 States (Total Cases):")
+    for i, (state, count) in enumerate(state_totals.head(15).items(), 1):
+        print(f"{i:2}. {state:25} {count:>10,} cases")
+
+    # average per year
+    state_avg = state_averages(agg)
+
+    print("\nTop 15 States (Average per Year):")
+    for i, (state, count) in enumerate(state_avg.head(15).items(), 1):
+        print(f"{i:2}. {state:25} {count:>10,.0f} cases/year")
+
+    print("\n" + "="*80)
+    print("TASK 2: CLUSTERING ANALYSIS")
+    print("="*80)
+
+    # prepare for clustering
+    state_data = cluster_input(agg)
+    scaled_data, _ = scale_features(state_data)
+
+    # find optimal clusters
+    k_values = range(2, 11)
+    inertias, silhouettes = k_sweep(scaled_data, k_values)
+
+    # apply clustering with k=4
+    optimal_k = OPTIMAL_K
+    clusters = fit_clusters(scaled_data, optimal_k)
+
+    print(f"\nOptimal clusters: {optimal_k}")
+    print("\nCluster breakdown:")
+    for i, cluster_states, total in cluster_breakdown(state_data, clusters):
+        print(f"\nCluster {i}: {len(cluster_states)} states, {total:,} total crimes")
+        print(f"  States: {', '.join(cluster_states[:5])}{'...' if len(cluster_states) > 5 else ''}")
+
+    # project for the cluster plot
+    pca_data, explained = pca_projection(scaled_data)
+
+    print("\n" + "="*80)
+    print("TASK 3: CRIME TYPE ANALYSIS")
+    print("="*80)
+
+    print("\nHighest crime state by type:")
+    for crime, (top_state, count) in crime_leaders(agg).iterrows():
+        print(f"  {crime_names.get(crime, crime):25} - {top_state:25} ({int(count):,})")
+
+    by_crime = crime_totals(agg)
+
+    print("\n" + "="*80)
+    print("TRENDS OVER TIME")
+    print("="*80)
+
+    # year-by-year analysis
+    by_year = yearly_trends(agg)
+    growth_rate = by_year.sum(axis=1).pct_change() * 100
+    print("\nYear-over-year growth:")
+    for year, rate in growth_rate.iloc[1:].items():
+        print(f"  {year}: {rate:+6.1f}%")
+
+    print("\n" + "="*80)
+    print("VISUALIZATIONS")
+    print("="*80)
+
+    jobs = overview_jobs(agg, {
+        'k_values': k_values,
+        'inertias': inertias,
+        'silhouettes': silhouettes,
+        'labels': clusters,
+        'pca_data': pca_data,
+        'explained': explained,
+        'states': state_data.index,
+    })
+    for path, rendered in render_or_show(jobs, headless):
+        print(f"[SAVED] {path}" if rendered else f"[UP TO DATE] {path}")
+
+    print("\n" + "="*80)
+    print("ANOMALIES")
+    print("="*80)
+
+    # robust z-scores against each state's history, its trend and its cluster peers
+    anomalies = detect(agg.cube, clusters)
+    print(f"\n{len(anomalies)} unusual state-year values (at least two robust z-scores above 3.5)")
+    print("\nMost anomalous:")
+    for row in anomalies.head(10).itertuples():
+        print(f"  {row.Year} {row.State:25} {crime_names.get(row.Crime, row.Crime):25} {row.Cases:>8,}"
+              f"  (history z {row.history_z:+.1f}, trend z {row.trend_z:+.1f})")
+
+    print("\n" + "="*80)
+    print("KEY FINDINGS")
+    print("="*80)
+
+    total_crimes = by_crime.sum()
+    print(f"\nTotal crimes analyzed: {int(total_crimes):,}")
+
+    print("\nCrime distribution:")
+    for crime, count in by_crime.sort_values(ascending=False).items():
+        pct = (count / total_crimes) * 100
+        print(f"  {crime_names.get(crime, crime):25} {pct:5.1f}% ({int(count):,})")
+
+    print("\nTop 5 states:")
+    for rank, (state, count) in enumerate(state_totals.head(5).items(), 1):
+        pct = (count / total_crimes) * 100
+        print(f"  {rank}. {state:25} {pct:5.1f}% ({int(count):,})")
+
+    change = temporal_change(agg)
+    first_year, last_year = change['first_year'], change['last_year']
+
+    print(f"\nTemporal changes ({first_year}-{last_year}):")
+    print(f"  {first_year}: {int(change['first']):,} cases")
+    print(f"  {last_year}: {int(change['last']):,} cases")
+    print(f"  Change: {change['growth']:+.1f}%")
+
+    print("\n" + "="*80)
+    print("SUMMARY")
+    print("="*80)
+
+    print(summary_text(report_facts(agg, n_clusters=optimal_k)))
+    print("="*80)
+    print("\nAnalysis complete. Visualizations saved:")
+    for job in jobs:
+        print(f"  {job.filename}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true',
+                        help="use a non-interactive backend and skip plt.show()")
+    main(headless=parser.parse_args().headless)
@@ -0,0 +1,70 @@
+"""
+Shared analysis core for the crimes against women EDA scripts.
+
+Load the data once, build one state x year x crime aggregate and derive every
+table the scripts report from it.
+"""
+
+from .aggregate import CrimeAggregate, build_aggregate, merge_partials, stream_aggregate
+from .analysis import (
+    cluster_input,
+    crime_leaders,
+    crime_totals,
+    state_averages,
+    temporal_change,
+    top_states,
+    top_states_for_crime,
+    yearly_growth,
+    yearly_trends,
+)
+from .cube import CrimeCube
+from .data import (
+    CRIME_NAMES,
+    CRIMES,
+    GITHUB_URL,
+    SCHEMA,
+    clean,
+    load_data,
+    memory_report,
+    normalize,
+    read_typed,
+)
+from .growth import GrowthTables
+from .incremental import append_rows, load_aggregate, save_aggregate
+from .prefix import YearPrefixIndex
+from .states import STATES, normalize_states
+from .topk import TopKIndex
+
+__all__ = [
+    'CRIMES',
+    'CRIME_NAMES',
+    'CrimeAggregate',
+    'CrimeCube',
+    'GITHUB_URL',
+    'GrowthTables',
+    'SCHEMA',
+    'STATES',
+    'TopKIndex',
+    'YearPrefixIndex',
+    'append_rows',
+    'build_aggregate',
+    'clean',
+    'cluster_input',
+    'crime_leaders',
+    'crime_totals',
+    'load_aggregate',
+    'load_data',
+    'memory_report',
+    'merge_partials',
+    'normalize',
+    'normalize_states',
+    'read_typed',
+    'save_aggregate',
+    'state_averages',
+    'stream_aggregate',
+    'temporal_change',
+    'top_states',
+    'top_states_for_crime',
+    'yearly_growth',
+    'yearly_trends',
+]
@@ -0,0 +1,94 @@
+"""
+Single state x year x crime aggregate that every analysis is derived from.
+"""
+
+from functools import cached_property
+
+import pandas as pd
+
+from .cube import CrimeCube
+from .data import CRIMES, clean, normalize, read_typed
+
+CHUNKSIZE = 500_000
+
+
+class CrimeAggregate:
+    """Crime counts summed once per (State, Year).
+
+    All per-state and per-year views are reductions of ``by_state_year`` and
+    are computed lazily the first time they are needed. ``rows`` is the number
+    of source rows summed, when known.
+    """
+
+    def __init__(self, by_state_year, rows=None):
+        self.by_state_year = by_state_year
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(partial_sums(df), len(df))
+
+    def merge(self, other):
+        """New aggregate holding the sums of both (associative and commutative)."""
+        return CrimeAggregate(merge_partials(self.by_state_year, other.by_state_year))
+
+    @cached_property
+    def state_totals(self):
+        """State x crime totals over all years."""
+        return self.by_state_year.groupby(level='State', observed=True).sum()
+
+    @cached_property
+    def year_totals(self):
+        """Year x crime totals over all states."""
+        return self.by_state_year.groupby(level='Year', observed=True).sum()
+
+    @cached_property
+    def years_reported(self):
+        """Number of years each state appears in."""
+        return self.by_state_year.groupby(level='State', observed=True).size()
+
+    @cached_property
+    def cube(self):
+        """Dense years x states x crimes array of ``by_state_year``."""
+        return CrimeCube.from_aggregate(self)
+
+    @property
+    def first_year(self):
+        return int(self.year_totals.index.min())
+
+    @property
+    def last_year(self):
+        return int(self.year_totals.index.max())
+
+
+def build_aggregate(df):
+    return CrimeAggregate.from_frame(df)
+
+
+def partial_sums(df):
+    """(State, Year) x crime sums of one frame or chunk, widened to int64."""
+    return df.groupby(['State', 'Year'], observed=True)[CRIMES].sum().astype('int64')
+
+
+def merge_partials(*partials):
+    """Combine partial (State, Year) sums into one; the order does not matter."""
+    if len(partials) == 1:
+        return partials[0]
+    return pd.concat(partials).groupby(level=['State', 'Year'], observed=True).sum()
+
+
+def stream_aggregate(path, chunksize=CHUNKSIZE):
+    """Build a CrimeAggregate from a CrimesOnWomenData-layout CSV in chunks.
+
+    Each chunk is normalized, cleaned and reduced to partial (State, Year)
+    sums before being merged into the running total, so peak memory depends
+    on the number of distinct (State, Year) keys rather than on the rows.
+    """
+    total, rows = None, 0
+    for chunk in read_typed(path, usecols=['State', 'Year'] + CRIMES, chunksize=chunksize):
+        partial = partial_sums(clean(normalize(chunk)))
+        total = partial if total is None else merge_partials(total, partial)
+        rows += len(chunk)
+    if total is None:
+        raise ValueError(f"No rows in {path}")
+    return CrimeAggregate(total.astype('int64'), rows)
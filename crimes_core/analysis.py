@@ -0,0 +1,71 @@
+"""
+Analysis questions answered from a CrimeAggregate.
+"""
+
+import pandas as pd
+
+from .data import CRIMES
+
+
+def top_states(agg, n=None):
+    """Total cases per state, highest first."""
+    if n is not None and n <= agg.cube.topk.k:
+        return agg.cube.topk.top(n=n)
+    totals = agg.state_totals.sum(axis=1).sort_values(ascending=False)
+    return totals if n is None else totals.head(n)
+
+
+def state_averages(agg, n=None):
+    """Average cases per reported year for each state, highest first."""
+    avg = agg.state_totals.sum(axis=1) / agg.years_reported
+    avg = avg.sort_values(ascending=False)
+    return avg if n is None else avg.head(n)
+
+
+def cluster_input(agg):
+    """State x crime matrix used as clustering features."""
+    return agg.state_totals[CRIMES].copy()
+
+
+def yearly_trends(agg):
+    """Year x crime totals."""
+    return agg.year_totals[CRIMES]
+
+
+def crime_totals(agg):
+    """Total cases per crime type over all states and years."""
+    return agg.state_totals[CRIMES].sum()
+
+
+def top_states_for_crime(agg, crime, n=10, year=None):
+    """Highest ``n`` states for one crime type, over all years or in ``year``."""
+    if n <= agg.cube.topk.k:
+        return agg.cube.topk.top(crime, year, n)
+    totals = agg.state_totals[crime] if year is None else agg.by_state_year[crime].xs(year, level='Year')
+    return totals.nlargest(n)
+
+
+def crime_leaders(agg):
+    """Highest state and its count for each crime type."""
+    leaders = [agg.cube.topk.leader(crime) for crime in CRIMES]
+    return pd.DataFrame(leaders, index=CRIMES, columns=['State', 'Cases'])
+
+
+def yearly_growth(agg):
+    """Percent change in total cases from each reported year to the next."""
+    return agg.year_totals.sum(axis=1).pct_change() * 100
+
+
+def temporal_change(agg):
+    """Compare total cases in the first and last reported year."""
+    total_by_year = agg.year_totals.sum(axis=1)
+    first, last = agg.first_year, agg.last_year
+    crimes_first = total_by_year.loc[first]
+    crimes_last = total_by_year.loc[last]
+    return {
+        'first_year': first,
+        'last_year': last,
+        'first': crimes_first,
+        'last': crimes_last,
+        'growth': (crimes_last - crimes_first) / crimes_first * 100,
+    }
@@ -0,0 +1,243 @@
+"""
+Robust anomaly scores for every (year, state, crime) cell of a CrimeCube.
+
+Three modified z-scores (0.6745 * deviation / MAD) are computed per cell:
+
+* history: the count against the median of the same state and crime over
+  its reported years;
+* trend: the residual from the series' OLS trend (see ``forecast``) against
+  the median residual, so steady growth is not flagged as a spike;
+* peer: the year-over-year log change against the changes of the other
+  states in the same cluster that year (all states if no clusters are given).
+
+Each score is one set of array reductions over the cube. The MAD is floored
+at one case (0.05 for log changes), so near-constant series such as a state
+reporting zero dowry deaths every year do not turn every small change into an
+infinite score. A cell is flagged when at least ``MIN_SCORES`` of its |z|
+exceed ``THRESHOLD`` (Iglewicz and Hoaglin's 3.5); requiring two keeps small
+states' noisy counts from dominating the list.
+
+``Baseline`` keeps the per-series medians, MADs, trends and last reported
+values, so a newly appended year can be scored without the history. A year
+already in the cube (a corrected release) is left out of its own baseline.
+The baseline is stored next to the persisted aggregate, keyed to the cube,
+the cluster labels and the excluded year, and ``append`` refreshes it.
+"""
+
+import hashlib
+import json
+import os
+import warnings
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import partial_sums
+from .cache import CACHE_DIR, atomic_write
+from .data import clean, normalize
+from .forecast import Trend, trend_fit, trend_values
+
+THRESHOLD = 3.5
+MIN_SCORES = 2
+MAD_FLOOR = 1.0
+LOG_MAD_FLOOR = 0.05
+SCALE = 0.6745
+BASELINE_FILE = 'baseline.npz'
+
+Scores = namedtuple('Scores', ['history', 'trend', 'peer'])
+
+
+def _robust_z(deviation, mad, floor):
+    return SCALE * deviation / np.maximum(mad, floor)
+
+
+def _peer_z(change, labels):
+    """Modified z of ``change`` (..., states, crimes) within each peer group of states."""
+    z = np.full(change.shape, np.nan)
+    labels = np.zeros(change.shape[-2], dtype=int) if labels is None else np.asarray(labels)
+    for group in np.unique(labels):
+        members = labels == group
+        if members.sum() < 3:
+            continue
+        peers = change[..., members, :]
+        median = np.nanmedian(peers, axis=-2, keepdims=True)
+        mad = np.nanmedian(np.abs(peers - median), axis=-2, keepdims=True)
+        z[..., members, :] = _robust_z(peers - median, mad, LOG_MAD_FLOOR)
+    return z
+
+
+def _log_change(before, after):
+    return np.log1p(after) - np.log1p(before)
+
+
+def _counts(cube, present=None):
+    present = cube.present if present is None else present
+    counts = cube.data.astype(np.float64)
+    counts[~present] = np.nan
+    return counts
+
+
+def score_cube(cube, labels=None):
+    """History, trend and peer z-scores, each years x states x crimes."""
+    counts = _counts(cube)
+    with warnings.catch_warnings():
+        # all-NaN slices (a state absent in a year) are expected
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = np.nanmedian(counts, axis=0)
+        mad = np.nanmedian(np.abs(counts - median), axis=0)
+        history = _robust_z(counts - median, mad, MAD_FLOOR)
+
+        resid = counts - trend_values(trend_fit(cube.years, cube.data, cube.present[:, :, None]), cube.years)
+        resid_median = np.nanmedian(resid, axis=0)
+        resid_mad = np.nanmedian(np.abs(resid - resid_median), axis=0)
+        trend = _robust_z(resid - resid_median, resid_mad, MAD_FLOOR)
+
+        peer = np.full(counts.shape, np.nan)
+        peer[1:] = _peer_z(_log_change(counts[:-1], counts[1:]), labels)
+    return Scores(history, trend, peer)
+
+
+def _flagged(scores, counts, years, states, crimes, threshold, min_scores):
+    """Long DataFrame of the cells with ``min_scores`` |z| above ``threshold``."""
+    stacked = np.nan_to_num(np.abs(np.stack(scores)), nan=0.0)
+    worst = stacked.max(axis=0)
+    year_idx, state_idx, crime_idx = np.nonzero((stacked > threshold).sum(axis=0) >= min_scores)
+    frame = pd.DataFrame({
+        'Year': np.asarray(years)[year_idx],
+        'State': np.asarray(states)[state_idx],
+        'Crime': np.asarray(crimes)[crime_idx],
+        'Cases': counts[year_idx, state_idx, crime_idx].astype(np.int64),
+        **{f"{name}_z": score[year_idx, state_idx, crime_idx] for name, score in zip(Scores._fields, scores)},
+        'max_abs_z': worst[year_idx, state_idx, crime_idx],
+    })
+    return frame.sort_values('max_abs_z', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def detect(cube, labels=None, threshold=THRESHOLD, min_scores=MIN_SCORES):
+    """Flagged (Year, State, Crime) cells of the whole cube, most anomalous first."""
+    return _flagged(score_cube(cube, labels), cube.data, cube.years, cube.states, cube.crimes,
+                    threshold, min_scores)
+
+
+class Baseline:
+    """Cached per-series statistics for scoring one new year at a time."""
+
+    def __init__(self, states, crimes, median, mad, trend, resid_median, resid_mad, last, labels=None, key=None):
+        self.states = list(states)
+        self.crimes = list(crimes)
+        self.median, self.mad = median, mad
+        self.trend = trend
+        self.resid_median, self.resid_mad = resid_median, resid_mad
+        self.last = last
+        self.labels = None if labels is None else np.asarray(labels)
+        self.key = key
+
+    @classmethod
+    def from_cube(cls, cube, labels=None, exclude=None):
+        """Baseline of every reported year but ``exclude``.
+
+        With ``exclude``, the last values are those of the latest reported
+        year before it, so its peer changes are year-over-year again.
+        """
+        present = cube.present.copy()
+        recent = present
+        if exclude is not None:
+            present[cube.years == exclude] = False
+            recent = present & (cube.years < exclude)[:, None]
+        counts = _counts(cube, present)
+        trend = trend_fit(cube.years, cube.data, present[:, :, None])
+        resid = counts - trend_values(trend, cube.years)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median = np.nanmedian(counts, axis=0)
+            resid_median = np.nanmedian(resid, axis=0)
+            mad = np.nanmedian(np.abs(counts - median), axis=0)
+            resid_mad = np.nanmedian(np.abs(resid - resid_median), axis=0)
+        # value in each state's most recent reported year
+        last_pos = len(cube.years) - 1 - recent[::-1].argmax(axis=0)
+        last = counts[last_pos, np.arange(len(cube.states))]
+        last[~recent.any(axis=0)] = np.nan
+        return cls(cube.states, cube.crimes, median, mad, trend, resid_median, resid_mad, last, labels,
+                   baseline_key(cube, labels, exclude))
+
+    def score(self, year, values):
+        """Scores of a states x crimes array for ``year`` (NaN rows = not reported)."""
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            history = _robust_z(values - self.median, self.mad, MAD_FLOOR)
+            resid = values - trend_values(self.trend, [year])[0]
+            trend = _robust_z(resid - self.resid_median, self.resid_mad, MAD_FLOOR)
+            peer = _peer_z(_log_change(self.last, values), self.labels)
+        return Scores(history, trend, peer)
+
+    def score_rows(self, rows, threshold=THRESHOLD, min_scores=MIN_SCORES):
+        """Flagged cells of a newly appended year, given in the CSV layout."""
+        year = release_year(rows)
+        sums = partial_sums(clean(normalize(rows)))
+        by_state = sums.xs(year, level='Year')
+        by_state.index = by_state.index.astype(str)
+        unknown = by_state.index.difference(self.states)
+        if len(unknown):
+            raise ValueError(f"States missing from the baseline: {', '.join(unknown)}")
+        values = by_state.reindex(self.states)[self.crimes].to_numpy(dtype=np.float64)
+        scores = Scores(*(score[None] for score in self.score(year, values)))
+        return _flagged(scores, np.nan_to_num(values)[None], [year], self.states, self.crimes,
+                        threshold, min_scores)
+
+    def save(self, path):
+        arrays = {name: getattr(self, name) for name in ('median', 'mad', 'resid_median', 'resid_mad', 'last')}
+        arrays.update({f"trend_{name}": np.asarray(value) for name, value in self.trend._asdict().items()})
+        if self.labels is not None:
+            arrays['labels'] = self.labels
+        arrays['meta'] = np.array(json.dumps({'states': self.states, 'crimes': self.crimes, 'key': self.key}))
+        with atomic_write(path) as f:
+            np.savez(f, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            trend = Trend(**{name: data[f"trend_{name}"] for name in Trend._fields})
+            labels = data['labels'] if 'labels' in data.files else None
+            return cls(meta['states'], meta['crimes'], data['median'], data['mad'], trend,
+                       data['resid_median'], data['resid_mad'], data['last'], labels, meta.get('key'))
+
+
+def release_year(rows):
+    """The one year the rows of a release are for."""
+    years = sorted(int(year) for year in rows['Year'].dropna().unique())
+    if len(years) != 1:
+        raise ValueError(f"Expected rows for one year, got {years}")
+    return years[0]
+
+
+def baseline_path(local_dir='.'):
+    return os.path.join(local_dir, CACHE_DIR, BASELINE_FILE)
+
+
+def baseline_key(cube, labels=None, exclude=None):
+    """Hash of everything a Baseline is built from."""
+    digest = hashlib.sha256()
+    for array in (cube.years, cube.data, cube.present):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(json.dumps([list(map(str, cube.states)), list(cube.crimes), exclude]).encode())
+    if labels is not None:
+        digest.update(np.asarray(labels, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def stored_baseline(cube, labels=None, path=None, year=None):
+    """Baseline for scoring ``year``: the one saved at ``path`` if it was built
+    from the same cube and labels, else a new (saved) one."""
+    exclude = year if year is not None and year in cube.years else None
+    if path and os.path.exists(path):
+        baseline = Baseline.load(path)
+        if baseline.key == baseline_key(cube, labels, exclude):
+            return baseline
+    baseline = Baseline.from_cube(cube, labels, exclude)
+    if path:
+        baseline.save(path)
+    return baseline
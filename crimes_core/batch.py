@@ -0,0 +1,140 @@
+"""
+Full analysis of many datasets in the CrimesOnWomenData.csv layout at once.
+
+Inputs come from glob patterns or a manifest (one path per line, ``#``
+comments, paths relative to the manifest). Each dataset is analysed in its
+own worker process: aggregate, k-sweep and clusters, summary, report and
+figures. Each file is aggregated in chunks, so it is never held in memory
+whole and no parse cache is written next to it. The results go to
+``<output_dir>/<dataset>/``. Every worker runs its stages in-process, so the
+pool is the only level of parallelism and ``n_jobs`` workers keep ``n_jobs``
+cores busy. ``summary.csv`` in ``output_dir`` holds one row per dataset. A
+dataset that fails gets its error in that row and does not stop the others.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .clustering import OPTIMAL_K
+
+SUMMARY_FILE = 'summary.csv'
+COLUMNS = ['dataset', 'path', 'rows', 'states', 'first', 'last', 'total', 'top_state', 'top_state_cases',
+           'top_crime', 'top_crime_share', 'growth', 'clusters', 'seconds', 'error']
+
+
+def glob_inputs(patterns):
+    """Sorted, de-duplicated files matching any of ``patterns``."""
+    paths = {os.path.normpath(path) for pattern in patterns for path in glob.glob(pattern, recursive=True)}
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def read_manifest(path):
+    """Dataset paths listed in a manifest file."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8') as f:
+        lines = [line.split('#', 1)[0].strip() for line in f]
+    return [os.path.normpath(os.path.join(base, line)) for line in lines if line]
+
+
+def dataset_names(paths):
+    """Output directory name per path: the file stem, prefixed by parent dirs while it clashes."""
+    parts = [os.path.normpath(os.path.splitext(path)[0]).split(os.sep) for path in paths]
+    depths = [1] * len(paths)
+    while True:
+        names = ['_'.join(p[-d:]) for p, d in zip(parts, depths)]
+        clashes = [i for i, name in enumerate(names)
+                   if names.count(name) > 1 and depths[i] < len(parts[i])]
+        if not clashes:
+            return names
+        for i in clashes:
+            depths[i] += 1
+
+
+def analyze_file(name, path, output_dir, k=OPTIMAL_K, k_values=range(2, 11), figures=True):
+    """Run the full analysis of one dataset into ``output_dir``; returns its summary row."""
+    from .aggregate import stream_aggregate
+    from .analysis import cluster_input
+    from .clustering import fit_clusters, k_sweep, pca_projection, scale_features
+    from .report import report_facts, summary_text, write_reports
+
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    agg = stream_aggregate(path)
+    state_data = cluster_input(agg)
+
+    # small extracts (one region) cannot support as many clusters as states
+    n_states = len(state_data)
+    k = min(k, n_states - 1)
+    k_values = [value for value in k_values if value < n_states]
+    clustering = None
+    if k >= 2:
+        scaled_data, _ = scale_features(state_data)
+        labels = fit_clusters(scaled_data, k)
+        pd.DataFrame({'State': state_data.index, 'Cluster': labels}).to_csv(
+            os.path.join(output_dir, 'clusters.csv'), index=False)
+        if figures:
+            inertias, silhouettes = k_sweep(scaled_data, k_values, n_jobs=1)
+            pca_data, explained = pca_projection(scaled_data)
+            clustering = {'k_values': k_values, 'inertias': inertias, 'silhouettes': silhouettes,
+                          'labels': labels, 'pca_data': pca_data, 'explained': explained,
+                          'states': state_data.index}
+    else:
+        k = None
+
+    if clustering is not None:
+        from .figures import standard_jobs
+        from .render import render_jobs
+        render_jobs(standard_jobs(agg, clustering), output_dir, n_jobs=1)
+
+    facts = report_facts(agg, title=name, n_clusters=k)
+    with open(os.path.join(output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+        f.write(summary_text(facts))
+    write_reports(agg, [{'name': 'report', 'title': name}], output_dir, figures_dir=output_dir, n_clusters=k)
+
+    top_state = facts['top_states'][0] if facts['top_states'] else (None, 0, 0.0)
+    top_crime = facts['crimes'][0] if facts['total'] else (None, None, 0, 0.0)
+    return {
+        'dataset': name, 'path': path, 'rows': agg.rows, 'states': len(facts['states']),
+        'first': facts['first'], 'last': facts['last'], 'total': facts['total'],
+        'top_state': top_state[0], 'top_state_cases': top_state[1],
+        'top_crime': top_crime[0], 'top_crime_share': round(top_crime[3], 2),
+        'growth': None if facts['growth'] is None else round(facts['growth'], 2),
+        'clusters': k, 'seconds': round(time.perf_counter() - start, 3), 'error': '',
+    }
+
+
+def run_batch(paths, output_dir='batch', n_jobs=None, k=OPTIMAL_K, figures=True):
+    """Analyse every dataset in ``paths`` on ``n_jobs`` processes.
+
+    Writes ``<output_dir>/<dataset>/`` per dataset and ``<output_dir>/summary.csv``
+    and returns the summary as a DataFrame in input order.
+    """
+    from .render import use_headless
+
+    paths = list(paths)
+    if not paths:
+        raise ValueError("No input datasets")
+    names = dataset_names(paths)
+    os.makedirs(output_dir, exist_ok=True)
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(paths)))
+
+    rows = {}
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=use_headless) as pool:
+        futures = {pool.submit(analyze_file, name, path, os.path.join(output_dir, name), k,
+                               figures=figures): (name, path)
+                   for name, path in zip(names, paths)}
+        for future in as_completed(futures):
+            name, path = futures[future]
+            try:
+                rows[name] = future.result()
+            except Exception as exc:
+                rows[name] = {'dataset': name, 'path': path, 'error': f"{type(exc).__name__}: {exc}"}
+
+    # nullable dtypes keep the counts integer when a failed dataset leaves its row empty
+    summary = pd.DataFrame([rows[name] for name in names], columns=COLUMNS).convert_dtypes()
+    summary.to_csv(os.path.join(output_dir, SUMMARY_FILE), index=False)
+    return summary
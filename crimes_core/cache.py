@@ -0,0 +1,122 @@
+"""
+Typed binary cache of the parsed dataset.
+
+The parsed and normalized frame is stored as an ``.npz`` next to the source
+CSV. The cache is valid while the source's mtime and size and the state
+normalization table are unchanged; if only the mtime or size differ the source
+is re-hashed, so a touched but identical file still hits the cache.
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from .states import TABLE_DIGEST
+
+CACHE_DIR = '.crimes_cache'
+CACHE_VERSION = 2
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_write(path, mode='wb'):
+    """Open a temporary file next to ``path`` and move it into place on success.
+
+    A concurrent reader sees either the old file or the complete new one,
+    never a partial write. The parent directory is created if needed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + f'.{os.getpid()}.tmp'
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def cache_path(source):
+    directory, name = os.path.split(os.path.abspath(source))
+    return os.path.join(directory, CACHE_DIR, os.path.splitext(name)[0] + '.npz')
+
+
+def _source_meta(source):
+    stat = os.stat(source)
+    return {'version': CACHE_VERSION, 'states': TABLE_DIGEST, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def read_cache(source):
+    """Return the cached frame for ``source``, or None if missing or stale."""
+    path = cache_path(source)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        current = _source_meta(source)
+        if (meta['version'], meta.get('states')) != (current['version'], current['states']):
+            return None
+        if (meta['mtime_ns'], meta['size']) != (current['mtime_ns'], current['size']):
+            if meta['sha256'] != file_sha256(source):
+                return None
+            meta.update(current)
+            refresh = True
+        else:
+            refresh = False
+        columns = {name: data['col:' + name] for name in meta['columns']}
+        index = data['index']
+        categoricals = {name: data['cat:' + name].tolist() for name in meta['categoricals']}
+        masks = {name: data['mask:' + name] for name in meta['nullable']}
+    frame = pd.DataFrame(index=pd.Index(index, name=meta['index_name']))
+    for name in meta['columns']:
+        if name in categoricals:
+            frame[name] = pd.Categorical.from_codes(columns[name], categories=categoricals[name])
+        elif name in masks:
+            frame[name] = pd.arrays.IntegerArray(columns[name], masks[name])
+        else:
+            frame[name] = columns[name]
+    if meta.get('memory'):
+        frame.attrs['memory'] = meta['memory']
+    if refresh:
+        write_cache(source, frame, sha256=meta['sha256'])
+    return frame
+
+
+def write_cache(source, frame, sha256=None):
+    """Store ``frame`` as the parsed form of ``source``."""
+    path = cache_path(source)
+    meta = _source_meta(source)
+    meta['sha256'] = sha256 or file_sha256(source)
+    meta['columns'] = list(frame.columns)
+    meta['index_name'] = frame.index.name
+    meta['categoricals'] = []
+    meta['nullable'] = []
+    meta['memory'] = frame.attrs.get('memory')
+    arrays = {'index': frame.index.to_numpy()}
+    for name in frame.columns:
+        column = frame[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            meta['categoricals'].append(name)
+            arrays['col:' + name] = column.cat.codes.to_numpy()
+            arrays['cat:' + name] = np.asarray(column.cat.categories, dtype=str)
+        elif isinstance(column.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_integer_dtype(column.dtype):
+            # nullable counts: values plus a missing mask, so NaNs survive until clean()
+            meta['nullable'].append(name)
+            arrays['col:' + name] = column.to_numpy(dtype=column.dtype.numpy_dtype, na_value=0)
+            arrays['mask:' + name] = column.isna().to_numpy()
+        else:
+            arrays['col:' + name] = column.to_numpy()
+    arrays['meta'] = np.array(json.dumps(meta))
+    with atomic_write(path) as f:
+        np.savez(f, **arrays)
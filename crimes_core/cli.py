@@ -0,0 +1,497 @@
+"""
+Command-line entry point: ``python -m crimes_core <subcommand>``.
+
+Only pandas/numpy are imported up front (through the aggregate); scikit-learn,
+matplotlib and seaborn are imported inside the subcommands that need them, so
+``top-states --format json`` starts without any of them.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+from .analysis import (
+    cluster_input,
+    crime_leaders,
+    crime_totals,
+    state_averages,
+    temporal_change,
+    top_states,
+    yearly_trends,
+)
+from .data import CRIME_NAMES, CRIMES, DATA_FILE, GITHUB_URL, read_typed
+from .states import REGIONS, normalize_states
+
+
+def _load(args):
+    # includes any years folded in with ``append``
+    from .incremental import current_aggregate
+    return current_aggregate(args.data_dir)
+
+
+def _emit(args, rows, text_lines):
+    """Print ``rows`` (a list of dicts) as JSON/CSV, or ``text_lines`` as text."""
+    if args.format == 'json':
+        json.dump(rows, sys.stdout, indent=2, default=_to_builtin)
+        sys.stdout.write('\n')
+    elif args.format == 'csv':
+        import csv
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print('\n'.join(text_lines))
+
+
+def _to_builtin(value):
+    # numpy scalars are not JSON serializable
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def cmd_top_states(args):
+    agg = _load(args)
+    if args.by == 'average':
+        series = state_averages(agg, args.n)
+        fmt = "{rank:2}. {state:25} {cases:>10,.0f} cases/year"
+    else:
+        series = top_states(agg, args.n)
+        fmt = "{rank:2}. {state:25} {cases:>10,} cases"
+    rows = [{'rank': rank, 'state': str(state), 'cases': value}
+            for rank, (state, value) in enumerate(series.items(), 1)]
+    _emit(args, rows, [fmt.format(**row) for row in rows])
+
+
+def _labels(args, state_data, scaled_data, agg=None):
+    if args.method == 'trajectory':
+        from .trajectory import trajectory_clusters
+        fit, _ = trajectory_clusters(agg.cube, args.k, args.window)
+        return _align(agg, state_data, fit.labels)
+    if args.method == 'hierarchical':
+        from .hierarchy import linkage_path, linkage_tree
+        tree = linkage_tree(scaled_data, state_data.index, args.linkage, linkage_path(args.data_dir))
+        return tree.labels(args.k)
+    from .clustering import fit_clusters
+    return fit_clusters(scaled_data, args.k)
+
+
+def _align(agg, state_data, labels):
+    """Labels ordered like the cube's states, reordered to ``state_data``'s rows."""
+    position = {state: i for i, state in enumerate(agg.cube.states)}
+    return labels[[position[state] for state in state_data.index]]
+
+
+def cmd_cluster(args):
+    from .clustering import cluster_breakdown, scale_features, stream_clusters
+
+    if args.entity != 'State' and args.method != 'minibatch':
+        sys.exit("cluster: --entity needs --method minibatch")
+    if args.method == 'minibatch':
+        # reads the CSV itself in chunks, so years folded in with ``append`` are not included
+        path = os.path.join(args.data_dir, DATA_FILE)
+        try:
+            breakdown = stream_clusters(path if os.path.exists(path) else GITHUB_URL + DATA_FILE, args.k,
+                                        args.chunksize, args.entity)
+        except ValueError as exc:
+            sys.exit(f"cluster: {exc}")
+    else:
+        agg = _load(args)
+        state_data = cluster_input(agg)
+        scaled_data, _ = scale_features(state_data)
+        labels = _labels(args, state_data, scaled_data, agg)
+        breakdown = cluster_breakdown(state_data, labels)
+    rows = [{'cluster': cluster_id, 'states': states, 'total_crimes': total}
+            for cluster_id, states, total in breakdown]
+    noun = 'states' if args.entity == 'State' else args.entity.lower() + 's'
+    lines = []
+    for row in rows:
+        lines.append(f"Cluster {row['cluster']}: {len(row['states'])} {noun}, {row['total_crimes']:,} total crimes")
+        lines.append(f"  {noun.capitalize()}: {', '.join(row['states'])}")
+    if args.format == 'csv':
+        rows = [{**row, 'states': ';'.join(row['states'])} for row in rows]
+    _emit(args, rows, lines)
+
+
+def cmd_crime_types(args):
+    agg = _load(args)
+    rows = [{'crime': crime, 'name': CRIME_NAMES[crime], 'state': str(state), 'cases': cases}
+            for crime, (state, cases) in crime_leaders(agg).iterrows()]
+    _emit(args, rows, [f"{row['name']:25} - {row['state']:25} ({int(row['cases']):,})" for row in rows])
+
+
+def cmd_trends(args):
+    agg = _load(args)
+    by_year = yearly_trends(agg)
+    rows = [{'year': int(year), **values.to_dict(), 'total': int(values.sum())}
+            for year, values in by_year.iterrows()]
+    _emit(args, rows, [f"{row['year']}: {row['total']:>10,}" for row in rows])
+
+
+def cmd_summary(args):
+    agg = _load(args)
+    by_crime = crime_totals(agg).sort_values(ascending=False)
+    total = by_crime.sum()
+    change = temporal_change(agg)
+    rows = [{'metric': f"share:{crime}", 'value': count / total * 100} for crime, count in by_crime.items()]
+    rows += [{'metric': f"top_state:{rank}:{state}", 'value': count / total * 100}
+             for rank, (state, count) in enumerate(top_states(agg, 5).items(), 1)]
+    rows += [{'metric': 'total_crimes', 'value': total},
+             {'metric': f"growth:{change['first_year']}-{change['last_year']}", 'value': change['growth']}]
+    lines = [f"Total crimes analyzed: {int(total):,}", "", "Crime distribution:"]
+    lines += [f"  {CRIME_NAMES[crime]:25} {count / total * 100:5.1f}% ({int(count):,})"
+              for crime, count in by_crime.items()]
+    lines += ["", f"Temporal changes ({change['first_year']}-{change['last_year']}): {change['growth']:+.1f}%"]
+    _emit(args, rows, lines)
+
+
+def cmd_append(args):
+    from .incremental import aggregate_path, append_rows, save_aggregate
+
+    agg = _load(args)
+    changes = append_rows(agg, read_typed(args.rows, usecols=['State', 'Year'] + CRIMES))
+    source = os.path.join(args.data_dir, DATA_FILE)
+    save_aggregate(agg, aggregate_path(args.data_dir), source if os.path.exists(source) else None)
+    _refresh_baseline(args, agg)
+    rows = [{'result': name, 'changed': [str(key) for key in keys]} for name, keys in changes.items()]
+    lines = [f"{row['result']:15} {len(row['changed']):3} changed: {', '.join(row['changed'])}" for row in rows]
+    if args.format == 'csv':
+        rows = [{**row, 'changed': ';'.join(row['changed'])} for row in rows]
+    _emit(args, rows, lines or ["No derived results changed."])
+
+
+def _refresh_baseline(args, agg):
+    # the anomaly baseline stored next to the aggregate, for the next release
+    from .anomaly import Baseline, baseline_path
+    from .clustering import OPTIMAL_K, fit_clusters, scale_features
+
+    scaled_data, _ = scale_features(cluster_input(agg))
+    Baseline.from_cube(agg.cube, fit_clusters(scaled_data, OPTIMAL_K)).save(baseline_path(args.data_dir))
+
+
+def _state(args, cube):
+    """Canonical name for ``--state``; a usage error when the data has no such state."""
+    if not args.state:
+        return None
+    try:
+        state = str(normalize_states(pd.Index([args.state]))[0])
+    except ValueError:
+        state = None
+    if state not in cube.states:
+        args.parser.error(f"no data for --state {args.state!r}")
+    return state
+
+
+def cmd_forecast(args):
+    from .forecast import forecast_cube, forecast_frame
+
+    cube = _load(args).cube
+    state = _state(args, cube)
+    if args.crime and args.crime not in cube.crimes:
+        args.parser.error(f"unknown --crime {args.crime!r} (choose from {', '.join(cube.crimes)})")
+    frame = forecast_frame(cube, forecast_cube(cube, args.horizon, args.model, args.level))
+    if state:
+        frame = frame.xs(state, level='State', drop_level=False)
+    if args.crime:
+        frame = frame.xs(args.crime, level='Crime', drop_level=False)
+    rows = [{'year': int(year), 'state': state, 'crime': crime, **values.round(1).to_dict()}
+            for (year, state, crime), values in frame.iterrows()]
+    _emit(args, rows, [f"{row['year']} {row['state']:25} {row['crime']:5} {row['forecast']:>10,.0f}"
+                       f"  ({row['lower']:,.0f} - {row['upper']:,.0f})" for row in rows])
+
+
+def cmd_growth(args):
+    cube = _load(args).cube
+    state = _state(args, cube)
+    tables = cube.growth_tables
+    if args.metric == 'cagr':
+        frame = tables.cagr_frame()
+    else:
+        frame = tables.frame(tables.yoy if args.metric == 'yoy' else tables.rolling(args.window))
+        if args.year is not None:
+            frame = frame.xs(args.year, level='Year')
+    if state:
+        frame = frame.loc[[state]] if frame.index.nlevels == 1 else frame.xs(state, level='State', drop_level=False)
+    frame = frame.round(2)
+    keys = frame.index.names
+    rows = [{**dict(zip(keys, key if isinstance(key, tuple) else (key,))), **values.to_dict()}
+            for key, values in frame.iterrows()]
+    rows = [{name: (None if isinstance(v, float) and v != v else v) for name, v in row.items()} for row in rows]
+    _emit(args, rows, [frame.to_string(na_rep='-')])
+
+
+def cmd_anomalies(args):
+    from .anomaly import baseline_path, detect, release_year, stored_baseline
+    from .clustering import fit_clusters, scale_features
+
+    agg = _load(args)
+    scaled_data, _ = scale_features(cluster_input(agg))
+    labels = fit_clusters(scaled_data, args.k)
+    if args.rows:
+        rows = read_typed(args.rows, usecols=['State', 'Year'] + CRIMES)
+        baseline = stored_baseline(agg.cube, labels, baseline_path(args.data_dir), release_year(rows))
+        flagged = baseline.score_rows(rows, args.threshold)
+    else:
+        flagged = detect(agg.cube, labels, args.threshold)
+    flagged = flagged.head(args.n).round(2)
+    rows = flagged.to_dict('records')
+    lines = [f"{row['Year']} {row['State']:25} {row['Crime']:5} {row['Cases']:>8,}  "
+             f"history {row['history_z']:>8.1f}  trend {row['trend_z']:>8.1f}  peer {row['peer_z']:>6.1f}"
+             for row in rows]
+    _emit(args, rows, lines or ["No anomalies."])
+
+
+def cmd_report(args):
+    from .report import standard_specs, write_reports
+
+    agg = _load(args)
+    if args.all:
+        specs = standard_specs(agg)
+    elif args.region:
+        specs = [{'name': 'region-' + args.region.lower().replace(' ', '-'), 'title': f"{args.region} region",
+                  'states': REGIONS[args.region], 'first': args.first, 'last': args.last}]
+    else:
+        specs = [{'name': args.name, 'title': 'Crimes against women in India',
+                  'states': args.state, 'first': args.first, 'last': args.last}]
+    try:
+        paths = write_reports(agg, specs, args.output_dir, args.report_format, args.figures_dir)
+    except ValueError as exc:
+        sys.exit(f"report: {exc}")
+    _emit(args, [{'path': path} for path in paths], [f"[SAVED] {path}" for path in paths])
+
+
+def cmd_render(args):
+    from .clustering import fit_clusters, k_sweep, pca_projection, scale_features
+    from .figures import dendrogram_job, standard_jobs
+    from .render import render_jobs, use_headless
+
+    use_headless()
+    agg = _load(args)
+    state_data = cluster_input(agg)
+    scaled_data, _ = scale_features(state_data)
+    k_values = range(2, 11)
+    if args.method == 'hierarchical':
+        from .hierarchy import linkage_path, linkage_tree
+        tree = linkage_tree(scaled_data, state_data.index, args.linkage, linkage_path(args.data_dir))
+        inertias, silhouettes = tree.sweep(k_values)
+        labels = tree.labels(args.k)
+    elif args.method == 'trajectory':
+        from .trajectory import DTWDistances, kmedoids, state_trajectories, trajectory_sweep
+        distances = DTWDistances(state_trajectories(agg.cube).series, args.window, args.jobs)
+        inertias, silhouettes = trajectory_sweep(distances, k_values)
+        labels = _align(agg, state_data, kmedoids(distances, args.k).labels)
+    else:
+        inertias, silhouettes = k_sweep(scaled_data, k_values, n_jobs=args.jobs)
+        labels = fit_clusters(scaled_data, args.k)
+    pca_data, explained = pca_projection(scaled_data)
+    jobs = standard_jobs(agg, {
+        'k_values': k_values,
+        'inertias': inertias,
+        'silhouettes': silhouettes,
+        'labels': labels,
+        'pca_data': pca_data,
+        'explained': explained,
+        'states': state_data.index,
+    })
+    if args.method == 'hierarchical':
+        jobs.append(dendrogram_job(tree, args.k))
+    results = render_jobs(jobs, args.output_dir, n_jobs=args.jobs, force=args.force)
+    rows = [{'path': path, 'rendered': rendered} for path, rendered in results]
+    _emit(args, rows, [f"[{'SAVED' if rendered else 'UP TO DATE'}] {path}" for path, rendered in results])
+
+
+def cmd_run(args):
+    from .pipeline import standard_params, standard_pipeline
+
+    pipeline = standard_pipeline()
+    if args.list:
+        rows = [{'node': name, 'inputs': list(pipeline.nodes[name].inputs),
+                 'optional': pipeline.nodes[name].optional} for name in pipeline.order]
+        _emit(args, rows, [f"{row['node']:<28} <- {', '.join(row['inputs'])}"
+                           f"{'  (optional)' if row['optional'] else ''}" for row in rows])
+        return
+    params = standard_params(args.data_dir, args.output_dir, args.k)
+    values, status = pipeline.run(args.targets or None, params, args.cache_dir, args.jobs, args.force)
+    rows = [{'node': name, 'status': status[name][0], 'seconds': round(status[name][1], 3)}
+            for name in pipeline.order if name in status]
+    lines = [f"[{row['status'].upper():<6}] {row['node']:<28} {row['seconds']:.3f}s" for row in rows]
+    if 'summary' in (args.targets or []):
+        lines.append(values['summary'])
+    _emit(args, rows, lines)
+
+
+def cmd_batch(args):
+    from .batch import glob_inputs, read_manifest, run_batch
+
+    paths = glob_inputs(args.inputs)
+    if args.manifest:
+        paths += [path for path in read_manifest(args.manifest) if path not in paths]
+    # earlier outputs can match a broad pattern
+    output_dir = os.path.join(os.path.abspath(args.output_dir), '')
+    paths = [path for path in paths if not os.path.abspath(path).startswith(output_dir)]
+    summary = run_batch(paths, args.output_dir, args.jobs, args.k, figures=not args.no_figures)
+    rows = summary.to_dict('records')
+    lines = []
+    for row in rows:
+        result = f"FAILED: {row['error']}" if row['error'] else f"{row['total']:>12,} cases, top: {row['top_state']}"
+        lines.append(f"{row['dataset']:<30} {result}")
+    _emit(args, rows, lines + [f"\nSummary: {args.output_dir}/summary.csv"])
+
+
+def cmd_stability(args):
+    from .stability import bootstrap_stability, stability_frame
+
+    agg = _load(args)
+    frame = stability_frame(bootstrap_stability(agg.cube, args.k, args.boot, args.jobs))
+    rows = [{'state': state, 'cluster': int(row.Cluster), 'consensus': int(row.Consensus),
+             'stability': round(float(row.Stability), 4)} for state, row in frame.iterrows()]
+    lines = [f"{args.boot} bootstraps, k={args.k}: mean stability {frame['Stability'].mean():.3f}, "
+             f"consensus vs K-Means ARI {frame.attrs['ari']:.3f}", ""]
+    lines += [f"{row['state']:<22} cluster {row['cluster']}  consensus {row['consensus']}  "
+              f"stability {row['stability']:.3f}" for row in rows]
+    _emit(args, rows, lines)
+
+
+def cmd_serve(args):
+    import asyncio
+
+    from .service import serve
+
+    agg = _load(args)
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving on http://{host}:{port}", flush=True)
+
+    try:
+        asyncio.run(serve(agg, args.host, args.port, args.cache_size, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m crimes_core', description="Crimes against women EDA")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--data-dir', default='.', help="directory holding CrimesOnWomenData.csv")
+    common.add_argument('--format', choices=['text', 'json', 'csv'], default='text')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('top-states', parents=[common], help="states with the most cases")
+    p.add_argument('-n', type=int, default=15)
+    p.add_argument('--by', choices=['total', 'average'], default='total')
+    p.set_defaults(func=cmd_top_states)
+
+    methods = ['kmeans', 'hierarchical', 'trajectory']
+    method_help = "trajectory: k-medoids on DTW distances between yearly crime series"
+    method = argparse.ArgumentParser(add_help=False)
+    method.add_argument('--linkage', choices=['ward', 'average', 'complete', 'single'], default='ward',
+                        help="linkage for --method hierarchical (the tree is cached)")
+    method.add_argument('--window', type=int, default=3, help="Sakoe-Chiba band in years for --method trajectory")
+
+    p = sub.add_parser('cluster', parents=[common, method], help="K-Means, hierarchical or trajectory clusters of states")
+    p.add_argument('--method', choices=methods + ['minibatch'], default='kmeans',
+                   help=method_help + "; minibatch: stream the CSV in chunks (bounded memory) into MiniBatchKMeans")
+    p.add_argument('--chunksize', type=int, default=100_000, help="rows per chunk for --method minibatch")
+    p.add_argument('--entity', default='State',
+                   help="column to cluster on with --method minibatch, e.g. District (keyed within its state)")
+    p.add_argument('-k', type=int, default=4)
+    p.set_defaults(func=cmd_cluster)
+
+    p = sub.add_parser('crime-types', parents=[common], help="highest state for each crime type")
+    p.set_defaults(func=cmd_crime_types)
+
+    p = sub.add_parser('trends', parents=[common], help="yearly totals by crime type")
+    p.set_defaults(func=cmd_trends)
+
+    p = sub.add_parser('summary', parents=[common], help="key findings")
+    p.set_defaults(func=cmd_summary)
+
+    p = sub.add_parser('append', parents=[common],
+                       help="fold a new or corrected year of rows into the stored aggregate")
+    p.add_argument('rows', help="CSV in the CrimesOnWomenData.csv layout")
+    p.set_defaults(func=cmd_append)
+
+    p = sub.add_parser('forecast', parents=[common], help="trend forecasts for every state x crime series")
+    p.add_argument('--horizon', type=int, default=3, help="years to forecast")
+    p.add_argument('--model', choices=['linear', 'loglinear'], default='linear')
+    p.add_argument('--level', type=float, default=0.95, help="prediction interval level")
+    p.add_argument('--state')
+    p.add_argument('--crime')
+    p.set_defaults(func=cmd_forecast, parser=p)
+
+    p = sub.add_parser('growth', parents=[common], help="YoY, CAGR or rolling growth per state and crime")
+    p.add_argument('--metric', choices=['yoy', 'cagr', 'rolling'], default='cagr')
+    p.add_argument('--window', type=int, default=3, help="years for --metric rolling")
+    p.add_argument('--year', type=int, help="only this year (yoy/rolling)")
+    p.add_argument('--state')
+    p.set_defaults(func=cmd_growth, parser=p)
+
+    p = sub.add_parser('anomalies', parents=[common], help="unusual state-year-crime counts")
+    p.add_argument('rows', nargs='?', help="score only this new year's rows (CSV layout) against the data")
+    p.add_argument('-k', type=int, default=4, help="clusters used as peer groups")
+    p.add_argument('-n', type=int, default=25)
+    p.add_argument('--threshold', type=float, default=3.5)
+    p.set_defaults(func=cmd_anomalies)
+
+    p = sub.add_parser('report', parents=[common], help="write Markdown/HTML reports from the aggregates")
+    p.add_argument('--all', action='store_true', help="national, per-region and per-year reports")
+    p.add_argument('--region', choices=list(REGIONS))
+    p.add_argument('--state', action='append', help="restrict to this state (repeatable)")
+    p.add_argument('--first', type=int)
+    p.add_argument('--last', type=int)
+    p.add_argument('--name', default='report', help="file name (without extension) of a single report")
+    p.add_argument('--report-format', choices=['md', 'html'], default='md')
+    p.add_argument('--output-dir', default='reports')
+    p.add_argument('--figures-dir', default='.', help="where the rendered figures are referenced from")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser('render', parents=[common, method],
+                       help="render the six figures (and the dendrogram for --method hierarchical) headlessly")
+    p.add_argument('--method', choices=methods, default='kmeans', help=method_help)
+    p.add_argument('-k', type=int, default=4)
+    p.add_argument('--output-dir', default='.')
+    p.add_argument('--jobs', type=int, default=None)
+    p.add_argument('--force', action='store_true')
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser('run', parents=[common], help="run pipeline targets and only the stages they need")
+    p.add_argument('targets', nargs='*', help="node names, e.g. 06_crime_trends.png (default: all but the optional ones)")
+    p.add_argument('-k', type=int, default=4)
+    p.add_argument('--output-dir', default='.')
+    p.add_argument('--cache-dir', default='.crimes_cache/pipeline', help="where node outputs are memoized")
+    p.add_argument('--jobs', type=int, default=None)
+    p.add_argument('--force', action='store_true', help="ignore memoized outputs")
+    p.add_argument('--list', action='store_true', help="list the nodes and their inputs")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('batch', parents=[common], help="run the full analysis for many datasets in parallel")
+    p.add_argument('inputs', nargs='*', help="glob patterns of CSVs in the CrimesOnWomenData.csv layout")
+    p.add_argument('--manifest', help="file listing one dataset path per line")
+    p.add_argument('-k', type=int, default=4)
+    p.add_argument('--output-dir', default='batch')
+    p.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per CPU)")
+    p.add_argument('--no-figures', action='store_true', help="skip the k-sweep and figures")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser('stability', parents=[common], help="bootstrap stability of the K-Means clusters")
+    p.add_argument('-k', type=int, default=4)
+    p.add_argument('--boot', type=int, default=500, help="bootstrap resamples")
+    p.add_argument('--jobs', type=int, default=None)
+    p.set_defaults(func=cmd_stability)
+
+    p = sub.add_parser('serve', parents=[common], help="serve the aggregates as a local JSON API")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8000)
+    p.add_argument('--cache-size', type=int, default=256, help="responses kept in the LRU cache")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
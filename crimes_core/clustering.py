@@ -0,0 +1,143 @@
+"""
+K-Means clustering of states on their crime profile.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA
+from sklearn.metrics import pairwise_distances, silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from .data import CRIMES, clean, normalize, read_typed
+
+RANDOM_STATE = 42
+OPTIMAL_K = 4
+
+
+def scale_features(state_data):
+    """Standardize the state x crime matrix."""
+    scaler = StandardScaler()
+    return scaler.fit_transform(state_data[CRIMES]), scaler
+
+
+def _fit_inertia_labels(scaled_data, k, random_state, n_init):
+    km = KMeans(n_clusters=k, random_state=random_state, n_init=n_init)
+    km.fit(scaled_data)
+    return km.inertia_, km.labels_
+
+
+def _fit_one_thread(scaled_data, k, random_state, n_init):
+    # one BLAS/OpenMP thread per worker so n_jobs workers do not oversubscribe the cores
+    from threadpoolctl import threadpool_limits
+
+    with threadpool_limits(1):
+        return _fit_inertia_labels(scaled_data, k, random_state, n_init)
+
+
+def k_sweep(scaled_data, k_values=range(2, 11), random_state=RANDOM_STATE, n_init=10, n_jobs=None):
+    """Fit KMeans for each k and return (inertias, silhouettes).
+
+    Fits run on ``n_jobs`` single-threaded worker processes (``n_jobs=1``
+    fits in-process); every k is seeded with ``random_state``.
+    """
+    k_values = list(k_values)
+    distances = pairwise_distances(scaled_data)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(k_values)))
+
+    if n_jobs == 1:
+        fits = [_fit_inertia_labels(scaled_data, k, random_state, n_init) for k in k_values]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            fits = list(pool.map(_fit_one_thread, repeat(scaled_data), k_values,
+                                 repeat(random_state), repeat(n_init)))
+
+    inertias = [inertia for inertia, _ in fits]
+    silhouettes = [silhouette_score(distances, labels, metric='precomputed') for _, labels in fits]
+    return inertias, silhouettes
+
+
+def fit_clusters(scaled_data, k=OPTIMAL_K, random_state=RANDOM_STATE, n_init=10):
+    km = KMeans(n_clusters=k, random_state=random_state, n_init=n_init)
+    return km.fit_predict(scaled_data)
+
+
+def pca_projection(scaled_data, n_components=2):
+    """Project onto principal components, returning (coords, explained_variance_ratio)."""
+    pca = PCA(n_components=n_components)
+    return pca.fit_transform(scaled_data), pca.explained_variance_ratio_
+
+
+def cluster_breakdown(state_data, labels):
+    """List of (cluster_id, states, total_crimes) for each cluster."""
+    breakdown = []
+    for cluster_id in sorted(set(labels)):
+        members = state_data[labels == cluster_id]
+        breakdown.append((int(cluster_id), members.index.tolist(), int(members[CRIMES].sum().sum())))
+    return breakdown
+
+
+def _chunks(path, chunksize, keys):
+    """Typed, normalized and cleaned chunks of ``path`` holding ``keys`` and the crimes."""
+    dtype = {key: 'category' for key in keys}
+    for chunk in read_typed(path, dtype=dtype, usecols=list(keys) + CRIMES, chunksize=chunksize):
+        yield clean(normalize(chunk))
+
+
+def _sum_by(frames, keys):
+    """Merge per-chunk sums indexed by ``keys``."""
+    return pd.concat(frames).groupby(level=list(range(len(keys))), observed=True).sum()
+
+
+def stream_clusters(path, k=OPTIMAL_K, chunksize=100_000, entity='State', labels_path=None,
+                    random_state=RANDOM_STATE, epochs=1):
+    """Cluster the rows of a CSV too large for memory with MiniBatchKMeans.
+
+    The scaler and the model are fitted with ``partial_fit`` one chunk of
+    rows at a time (``epochs`` passes for the model), and a final pass labels
+    every row. Each entity (a state, or a (State, ``entity``) pair such as a
+    district, since district names repeat across states) takes the label most
+    of its rows got. Peak memory is bounded by the chunk size plus one row of
+    votes and totals per entity. One label per entity is written to
+    ``labels_path`` when given. Returns the same (cluster_id, entities,
+    total_crimes) breakdown as ``cluster_breakdown``.
+    """
+    keys = ['State'] if entity == 'State' else ['State', entity]
+    scaler = StandardScaler()
+    for chunk in _chunks(path, chunksize, keys):
+        scaler.partial_fit(chunk[CRIMES].to_numpy(dtype=np.float64))
+
+    model = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=3)
+    pending = None
+    for _ in range(epochs):
+        for chunk in _chunks(path, chunksize, keys):
+            features = scaler.transform(chunk[CRIMES].to_numpy(dtype=np.float64))
+            if pending is not None:
+                features, pending = np.vstack([pending, features]), None
+            # the first call needs at least k rows to seed the centres
+            if not hasattr(model, 'cluster_centers_') and len(features) < k:
+                pending = features
+                continue
+            model.partial_fit(features)
+    if not hasattr(model, 'cluster_centers_'):
+        raise ValueError(f"Need at least {k} rows to fit {k} clusters")
+
+    votes, sums = [], []
+    for chunk in _chunks(path, chunksize, keys):
+        labels = model.predict(scaler.transform(chunk[CRIMES].to_numpy(dtype=np.float64)))
+        votes.append(pd.crosstab([chunk[key] for key in keys], labels).reindex(columns=range(k), fill_value=0))
+        sums.append(chunk.groupby(keys, observed=True)[CRIMES].sum().astype('int64'))
+    votes, sums = _sum_by(votes, keys), _sum_by(sums, keys)
+    labels = votes.reindex(sums.index).to_numpy().argmax(axis=1)
+
+    if labels_path:
+        sums.index.to_frame(index=False).assign(Cluster=labels).to_csv(labels_path, index=False)
+    names = sums.index if len(keys) == 1 else [f"{name} ({state})" for state, name in sums.index]
+    sums.index = pd.Index([str(name) for name in names])
+    return cluster_breakdown(sums, labels)
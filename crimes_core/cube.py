@@ -0,0 +1,134 @@
+"""
+Dense years x states x crimes array of the aggregated counts.
+
+Every question the scripts ask (per-state totals, per-year totals, per-crime
+leaders, first-vs-last growth) becomes one vectorized reduction over this
+array. The slicing helpers return views into it, never copies.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .data import CRIMES
+from .growth import GrowthTables
+from .prefix import YearPrefixIndex
+from .topk import TopKIndex
+
+
+class CrimeCube:
+    """Contiguous int32 array indexed by (year, state, crime).
+
+    ``present`` marks which (year, state) cells were reported, so a state that
+    only appears from 2011 onward is distinguishable from one reporting zero.
+    """
+
+    def __init__(self, data, years, states, crimes=CRIMES, present=None):
+        self.data = np.ascontiguousarray(data, dtype=np.int32)
+        self.years = np.asarray(years)
+        self.states = list(states)
+        self.crimes = list(crimes)
+        if present is None:
+            present = np.ones(self.data.shape[:2], dtype=bool)
+        self.present = present
+        self._year_index = {int(year): i for i, year in enumerate(self.years)}
+        self._state_index = {state: i for i, state in enumerate(self.states)}
+        self._crime_index = {crime: i for i, crime in enumerate(self.crimes)}
+
+    @classmethod
+    def from_aggregate(cls, agg):
+        """Scatter the (State, Year) sums of a CrimeAggregate into a cube."""
+        frame = agg.by_state_year
+        states_level = frame.index.get_level_values('State')
+        year_values = frame.index.get_level_values('Year').to_numpy()
+
+        state_codes, states = pd.factorize(states_level, sort=True)
+        years = np.arange(year_values.min(), year_values.max() + 1)
+        year_codes = year_values - years[0]
+
+        data = np.zeros((len(years), len(states), len(CRIMES)), dtype=np.int32)
+        data[year_codes, state_codes] = frame[CRIMES].to_numpy()
+        present = np.zeros(data.shape[:2], dtype=bool)
+        present[year_codes, state_codes] = True
+        return cls(data, years, [str(s) for s in states], CRIMES, present)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def year_pos(self, year):
+        return self._year_index[int(year)]
+
+    def state_pos(self, state):
+        return self._state_index[state]
+
+    def crime_pos(self, crime):
+        return self._crime_index[crime]
+
+    # views
+
+    def year(self, year):
+        """states x crimes view for one year."""
+        return self.data[self.year_pos(year)]
+
+    def year_range(self, first, last):
+        """years x states x crimes view for ``first..last`` inclusive."""
+        return self.data[self.year_pos(first):self.year_pos(last) + 1]
+
+    def state(self, state):
+        """years x crimes view for one state."""
+        return self.data[:, self.state_pos(state)]
+
+    def crime(self, crime):
+        """years x states view for one crime type."""
+        return self.data[:, :, self.crime_pos(crime)]
+
+    @cached_property
+    def prefix(self):
+        """YearPrefixIndex for constant-time year-range totals."""
+        return YearPrefixIndex(self)
+
+    @cached_property
+    def topk(self):
+        """TopKIndex of the highest states per crime and year."""
+        return TopKIndex(self)
+
+    @cached_property
+    def growth_tables(self):
+        """GrowthTables (YoY, CAGR, rolling) for every state and crime."""
+        return GrowthTables(self)
+
+    # reductions
+
+    @cached_property
+    def state_totals(self):
+        """states x crimes totals over all years (int64)."""
+        return self.data.sum(axis=0, dtype=np.int64)
+
+    @cached_property
+    def year_totals(self):
+        """years x crimes totals over all states (int64)."""
+        return self.data.sum(axis=1, dtype=np.int64)
+
+    def crime_leaders(self):
+        """(state, count) of the highest state for each crime over all years."""
+        totals = self.state_totals
+        best = totals.argmax(axis=0)
+        return {crime: (self.states[best[i]], int(totals[best[i], i]))
+                for i, crime in enumerate(self.crimes)}
+
+    def growth(self, first=None, last=None):
+        """Percent change in total cases between two years (default first vs last)."""
+        first = self.years[0] if first is None else first
+        last = self.years[-1] if last is None else last
+        totals = self.year_totals.sum(axis=1)
+        before, after = totals[self.year_pos(first)], totals[self.year_pos(last)]
+        return (after - before) / before * 100
+
+    def to_frame(self):
+        """Long-format (Year, State) x crime DataFrame of the reported cells."""
+        year_idx, state_idx = np.nonzero(self.present)
+        index = pd.MultiIndex.from_arrays(
+            [self.years[year_idx], np.asarray(self.states)[state_idx]], names=['Year', 'State'])
+        return pd.DataFrame(self.data[year_idx, state_idx], index=index, columns=self.crimes)
@@ -0,0 +1,144 @@
+"""
+Data loading and column definitions for the crimes against women dataset.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .cache import read_cache, write_cache
+from .states import normalize_states
+
+GITHUB_URL = "https://raw.githubusercontent.com/VK-SHRIDHARAN/23BCE2086-EDA-On-Women-Safety_TAM/main/"
+DATA_FILE = 'CrimesOnWomenData.csv'
+DESCRIPTION_FILE = 'description.csv'
+
+# crime columns in the order they appear in the dataset
+CRIMES = ['Rape', 'K&A', 'DD', 'AoW', 'AoM', 'DV', 'WT']
+CRIME_NAMES = {
+    'Rape': 'Rape',
+    'K&A': 'Kidnapping & Assault',
+    'DD': 'Dowry Deaths',
+    'AoW': 'Assault on Women',
+    'AoM': 'Assault on Modesty',
+    'DV': 'Domestic Violence',
+    'WT': 'Women Trafficking'
+}
+
+# parse-time dtypes: counts are nullable so missing values survive until clean()
+SCHEMA = {'State': 'category', 'Year': 'int16', **{crime: 'Int32' for crime in CRIMES}}
+# dtypes after clean()
+COUNT_DTYPE = 'int32'
+
+
+def read_typed(source, dtype=None, **kwargs):
+    """``read_csv`` with the compact ``SCHEMA`` applied while parsing.
+
+    With ``chunksize`` this returns the chunk iterator, each chunk typed the
+    same way. ``dtype`` adds to (or overrides) the schema; other keyword
+    arguments are passed to ``read_csv``.
+    """
+    return pd.read_csv(source, dtype={**SCHEMA, **(dtype or {})}, **kwargs)
+
+
+def default_footprint(df):
+    """Bytes ``df`` would take as read_csv's default int64/float64/object columns.
+
+    Computed from the typed frame without re-reading the source: 8 bytes per
+    numeric value plus, for ``State``, one object pointer per row and the
+    Python size of each row's string.
+    """
+    rows = len(df)
+    total = 8 * rows * (1 + sum(name != 'State' for name in df.columns))
+    if 'State' in df.columns:
+        states = df['State']
+        names = states.cat.categories if isinstance(states.dtype, pd.CategoricalDtype) else None
+        if names is not None:
+            sizes = np.array([sys.getsizeof(str(name)) for name in names], dtype=np.int64)
+            total += 8 * rows + int(sizes[states.cat.codes.to_numpy()].sum())
+        else:
+            total += 8 * rows + sum(sys.getsizeof(str(name)) for name in states)
+    return total
+
+
+def memory_report(df):
+    """'before -> after' memory of ``df`` against the default dtypes, as text."""
+    memory = df.attrs.get('memory')
+    if memory is None:
+        memory = {'default': default_footprint(df), 'typed': int(df.memory_usage(deep=True).sum())}
+    before, after = memory['default'] / 2**20, memory['typed'] / 2**20
+    return f"{before:.2f} MB as int64/float64/object -> {after:.2f} MB typed ({before / after:.1f}x smaller)"
+
+
+def load_data(local_dir='.', base_url=GITHUB_URL, use_cache=True):
+    """Load the dataset and its description, returning (df, description, source).
+
+    Local files are read first, through the binary cache when ``use_cache`` is
+    set; ``base_url`` is only tried when the local dataset is missing.
+
+    The description is optional: without it the column table is built from
+    ``CRIME_NAMES``.
+
+    ``State`` is normalized to a Categorical over the canonical state table and
+    the other columns follow ``SCHEMA``; ``df.attrs['memory']`` records the
+    bytes used against what the default dtypes would have taken.
+    """
+    data_path = os.path.join(local_dir, DATA_FILE)
+    description_path = os.path.join(local_dir, DESCRIPTION_FILE)
+    if os.path.exists(data_path):
+        if os.path.exists(description_path):
+            description = pd.read_csv(description_path, index_col=0)
+        else:
+            description = default_description()
+        df, cached = _load_local(data_path, use_cache)
+        return df, description, 'local cache' if cached else 'local directory'
+
+    df = read_typed(base_url + DATA_FILE, index_col=0)
+    try:
+        description = pd.read_csv(base_url + DESCRIPTION_FILE, index_col=0)
+    except OSError:
+        description = default_description()
+    return _typed(df), description, 'GitHub'
+
+
+def default_description():
+    """The description table (column name, explanation) built from ``CRIME_NAMES``."""
+    columns = ['State', 'Year'] + CRIMES
+    return pd.DataFrame({'Column Names': columns,
+                         'Explanation': ['State', 'Year'] + [CRIME_NAMES[crime] for crime in CRIMES]})
+
+
+def load_file(path, use_cache=True):
+    """Load any CSV in the CrimesOnWomenData.csv layout, typed as in ``load_data``."""
+    return _load_local(path, use_cache)[0]
+
+
+def _load_local(path, use_cache):
+    df = read_cache(path) if use_cache else None
+    if df is not None:
+        return df, True
+    df = _typed(read_typed(path, index_col=0))
+    if use_cache:
+        write_cache(path, df)
+    return df, False
+
+
+def _typed(df):
+    """Normalize a freshly parsed frame and record its memory footprint."""
+    default = default_footprint(df)
+    df = normalize(df)
+    df.attrs['memory'] = {'default': default, 'typed': int(df.memory_usage(deep=True).sum())}
+    return df
+
+
+def normalize(df):
+    """Replace raw ``State`` spellings with canonical categorical states."""
+    return df.assign(State=normalize_states(df['State']))
+
+
+def clean(df):
+    """Replace missing crime counts with 0 (no reported cases) as plain int32."""
+    crimes = [crime for crime in CRIMES if crime in df.columns]
+    return df.fillna(0).astype({crime: COUNT_DTYPE for crime in crimes})
@@ -0,0 +1,309 @@
+"""
+Drawing functions for the six standard figures, their four-panel overview
+variants and the optional dendrogram.
+
+Each function takes only precomputed aggregates (Series, DataFrames, arrays)
+and returns a new Figure, so figures can be rendered independently of one
+another and in separate processes.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from scipy.cluster.hierarchy import dendrogram
+
+from .analysis import crime_totals, state_averages, top_states, top_states_for_crime, yearly_trends
+from .data import CRIME_NAMES, CRIMES
+from .render import FigureJob
+
+
+def apply_style():
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (14, 8)
+    plt.rcParams['font.size'] = 10
+
+
+def _bar_panel(ax, series, color, title, ylabel):
+    series.plot(kind='bar', ax=ax, color=color, alpha=0.8)
+    ax.set_title(title, fontsize=13, fontweight='bold')
+    ax.set_ylabel(ylabel)
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(axis='y', alpha=0.3)
+
+
+def _k_sweep_panels(ax_inertia, ax_silhouette, k_values, inertias, silhouettes, linewidth=2):
+    ax_inertia.plot(k_values, inertias, 'bo-', linewidth=linewidth, markersize=8)
+    ax_inertia.set_xlabel('Number of Clusters')
+    ax_inertia.set_ylabel('Inertia')
+    ax_inertia.set_title('Elbow Method', fontsize=12, fontweight='bold')
+    ax_inertia.grid(True, alpha=0.3)
+
+    ax_silhouette.plot(k_values, silhouettes, 'go-', linewidth=linewidth, markersize=8)
+    ax_silhouette.set_xlabel('Number of Clusters')
+    ax_silhouette.set_ylabel('Silhouette Score')
+    ax_silhouette.set_title('Silhouette Analysis', fontsize=12, fontweight='bold')
+    ax_silhouette.grid(True, alpha=0.3)
+
+
+def _cluster_scatter(fig, ax, pca_data, clusters, states, explained, title):
+    scatter = ax.scatter(pca_data[:, 0], pca_data[:, 1], c=clusters, cmap='viridis',
+                         s=200, alpha=0.7, edgecolors='black', linewidth=1.5)
+
+    for idx, state in enumerate(states):
+        ax.annotate(state, (pca_data[idx, 0], pca_data[idx, 1]),
+                    fontsize=8, ha='center', va='center', fontweight='bold')
+
+    ax.set_xlabel(f'PC1 ({explained[0]:.1%})')
+    ax.set_ylabel(f'PC2 ({explained[1]:.1%})')
+    ax.set_title(title, fontsize=13, fontweight='bold')
+    fig.colorbar(scatter, ax=ax, label='Cluster')
+    ax.grid(True, alpha=0.3)
+
+
+def _heatmap_panel(ax, hmap_data):
+    sns.heatmap(hmap_data, annot=True, fmt='d', cmap='YlOrRd',
+                cbar_kws={'label': 'Cases'}, ax=ax, linewidths=0.5)
+    ax.set_title('Crime Distribution - Top 15 States', fontsize=13, fontweight='bold')
+    ax.set_xlabel('Crime Type')
+    ax.set_ylabel('State')
+
+
+def _trend_panels(ax_total, ax_types, by_year, legend_size=10):
+    total_by_year = by_year.sum(axis=1)
+    ax_total.plot(by_year.index, total_by_year, marker='o', linewidth=2.5,
+                  markersize=8, color='darkred')
+    ax_total.fill_between(by_year.index, total_by_year, alpha=0.3, color='red')
+    ax_total.set_title('Total Crimes Over Time', fontsize=13, fontweight='bold')
+    ax_total.set_ylabel('Cases')
+    ax_total.grid(True, alpha=0.3)
+
+    for crime in by_year.columns:
+        ax_types.plot(by_year.index, by_year[crime], marker='o',
+                      label=CRIME_NAMES.get(crime, crime), linewidth=2)
+
+    ax_types.set_title('Crime Type Trends', fontsize=13, fontweight='bold')
+    ax_types.set_xlabel('Year')
+    ax_types.set_ylabel('Cases')
+    ax_types.legend(loc='best', fontsize=legend_size)
+    ax_types.grid(True, alpha=0.3)
+
+
+def top_states_figure(state_totals, state_avg):
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    _bar_panel(axes[0], state_totals, 'darkred', 'States with Most Crimes Against Women', 'Total Cases')
+    _bar_panel(axes[1], state_avg, 'crimson', 'States by Average Crimes per Year', 'Average Cases per Year')
+    fig.tight_layout()
+    return fig
+
+
+def elbow_figure(k_values, inertias, silhouettes):
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    _k_sweep_panels(axes[0], axes[1], k_values, inertias, silhouettes)
+    fig.tight_layout()
+    return fig
+
+
+def clusters_figure(pca_data, clusters, states, explained):
+    fig, ax = plt.subplots(figsize=(12, 8))
+    _cluster_scatter(fig, ax, pca_data, clusters, states, explained,
+                     'State Clusters - Principal Component Analysis')
+    fig.tight_layout()
+    return fig
+
+
+def heatmap_figure(hmap_data):
+    fig, ax = plt.subplots(figsize=(14, 10))
+    _heatmap_panel(ax, hmap_data)
+    fig.tight_layout()
+    return fig
+
+
+def crime_types_figure(top_by_crime):
+    fig, axes = plt.subplots(2, 4, figsize=(18, 10))
+    axes = axes.flatten()
+
+    for idx, (crime, top_10) in enumerate(top_by_crime.items()):
+        top_10.plot(kind='barh', ax=axes[idx], color=plt.cm.Set3(idx), alpha=0.8)
+        axes[idx].set_title(f'Top 10: {CRIME_NAMES[crime]}', fontsize=11, fontweight='bold')
+        axes[idx].set_xlabel('Cases')
+        axes[idx].grid(axis='x', alpha=0.3)
+
+    axes[-1].remove()
+    fig.tight_layout()
+    return fig
+
+
+def trends_figure(by_year):
+    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
+    _trend_panels(axes[0], axes[1], by_year)
+    fig.tight_layout()
+    return fig
+
+
+def top_states_overview_figure(state_totals, state_avg, n_top=15):
+    fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+    _bar_panel(axes[0, 0], state_totals.head(n_top), 'darkred', f'Top {n_top} States - Total Cases', 'Total Cases')
+    _bar_panel(axes[0, 1], state_avg, 'crimson', f'Top {n_top} States - Average per Year', 'Average Cases per Year')
+
+    pie_data = pd.concat([state_totals.head(10), pd.Series({'Others': state_totals.iloc[10:].sum()})])
+    axes[1, 0].pie(pie_data, labels=pie_data.index, autopct='%1.1f%%', startangle=90,
+                   colors=plt.cm.Set3(np.linspace(0, 1, len(pie_data))))
+    axes[1, 0].set_title('Crime Distribution - Top 10 States', fontsize=13, fontweight='bold')
+
+    donut_data = pd.concat([state_totals.head(5), pd.Series({'Other States': state_totals.iloc[5:].sum()})])
+    axes[1, 1].pie(donut_data, labels=donut_data.index, autopct='%1.1f%%', startangle=90,
+                   colors=plt.cm.Pastel1(np.linspace(0, 1, len(donut_data))))
+    axes[1, 1].add_artist(plt.Circle((0, 0), 0.70, fc='white'))
+    axes[1, 1].set_title('Crime Share - Top 5 States', fontsize=13, fontweight='bold')
+
+    fig.tight_layout()
+    return fig
+
+
+def k_sweep_overview_figure(k_values, inertias, silhouettes):
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    _k_sweep_panels(axes[0, 0], axes[0, 1], k_values, inertias, silhouettes, linewidth=2.5)
+
+    axes[1, 0].bar(k_values, silhouettes, color='green', alpha=0.7, edgecolor='black')
+    axes[1, 0].set_xlabel('Number of Clusters')
+    axes[1, 0].set_ylabel('Silhouette Score')
+    axes[1, 0].set_title('Cluster Quality by K', fontsize=12, fontweight='bold')
+    axes[1, 0].grid(axis='y', alpha=0.3)
+
+    axes[1, 1].bar(k_values, inertias, color='blue', alpha=0.7, edgecolor='black')
+    axes[1, 1].set_xlabel('Number of Clusters')
+    axes[1, 1].set_ylabel('Inertia')
+    axes[1, 1].set_title('Inertia by K', fontsize=12, fontweight='bold')
+    axes[1, 1].grid(axis='y', alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def clusters_overview_figure(pca_data, clusters, states, explained):
+    fig, axes = plt.subplots(1, 2, figsize=(18, 8))
+    _cluster_scatter(fig, axes[0], pca_data, clusters, states, explained,
+                     'State Clusters - PCA Visualization')
+
+    sizes = np.bincount(clusters)
+    axes[1].pie(sizes, labels=[f'Cluster {i}\n({size} states)' for i, size in enumerate(sizes)],
+                autopct='%1.1f%%', startangle=90, colors=plt.cm.viridis(np.linspace(0, 1, len(sizes))))
+    axes[1].set_title('Distribution of States Across Clusters', fontsize=13, fontweight='bold')
+
+    fig.tight_layout()
+    return fig
+
+
+def crime_analysis_figure(hmap_data, by_crime):
+    fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+    _heatmap_panel(axes[0, 0], hmap_data)
+
+    axes[0, 1].pie(by_crime, labels=[CRIME_NAMES[c] for c in by_crime.index], autopct='%1.1f%%',
+                   startangle=90, colors=plt.cm.Set3(np.linspace(0, 1, len(by_crime))))
+    axes[0, 1].set_title('Overall Crime Type Distribution', fontsize=13, fontweight='bold')
+
+    by_crime.sort_values(ascending=True).plot(kind='barh', ax=axes[1, 0],
+                                              color=plt.cm.RdYlGn_r(np.linspace(0, 1, len(by_crime))))
+    axes[1, 0].set_title('Total Cases by Crime Type', fontsize=13, fontweight='bold')
+    axes[1, 0].set_xlabel('Total Cases')
+    axes[1, 0].grid(axis='x', alpha=0.3)
+
+    crime_pct = (by_crime / by_crime.sum() * 100).sort_values(ascending=True)
+    axes[1, 1].barh(range(len(crime_pct)), crime_pct.values,
+                    color=plt.cm.Spectral(np.linspace(0, 1, len(crime_pct))))
+    axes[1, 1].set_yticks(range(len(crime_pct)))
+    axes[1, 1].set_yticklabels([CRIME_NAMES[c] for c in crime_pct.index])
+    axes[1, 1].set_title('Crime Type Percentage Distribution', fontsize=13, fontweight='bold')
+    axes[1, 1].set_xlabel('Percentage (%)')
+    axes[1, 1].grid(axis='x', alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def trends_overview_figure(by_year):
+    fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+    _trend_panels(axes[0, 0], axes[0, 1], by_year, legend_size=9)
+
+    growth_rate = by_year.sum(axis=1).pct_change() * 100
+    axes[1, 0].bar(growth_rate.index[1:], growth_rate.values[1:], color='steelblue', alpha=0.8, edgecolor='black')
+    axes[1, 0].set_title('Year-over-Year Growth Rate', fontsize=13, fontweight='bold')
+    axes[1, 0].set_ylabel('Growth Rate (%)')
+    axes[1, 0].axhline(y=0, color='black', linestyle='-', linewidth=0.8)
+    axes[1, 0].grid(axis='y', alpha=0.3)
+
+    axes[1, 1].stackplot(by_year.index, [by_year[crime] for crime in by_year.columns],
+                         labels=[CRIME_NAMES[crime] for crime in by_year.columns], alpha=0.8)
+    axes[1, 1].set_title('Stacked Crime Types Over Time', fontsize=13, fontweight='bold')
+    axes[1, 1].set_xlabel('Year')
+    axes[1, 1].set_ylabel('Cases')
+    axes[1, 1].legend(loc='upper left', fontsize=9)
+    axes[1, 1].grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def dendrogram_figure(merges, states, k):
+    fig, ax = plt.subplots(figsize=(14, 8))
+    # cut between the merges that leave k and k - 1 clusters
+    cut = (merges[-k, 2] + merges[-k + 1, 2]) / 2 if k > 1 else merges[-1, 2]
+    dendrogram(merges, labels=list(states), color_threshold=cut, leaf_rotation=90, leaf_font_size=9, ax=ax)
+    ax.axhline(cut, color='black', linestyle='--', linewidth=1, alpha=0.7)
+    ax.set_title(f'Hierarchical Clustering of States ({k} clusters)', fontsize=13, fontweight='bold')
+    ax.set_ylabel('Linkage Distance')
+    ax.xaxis.grid(False)
+    ax.yaxis.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def dendrogram_job(tree, k):
+    return FigureJob('07_dendrogram.png', dendrogram_figure, {'merges': tree.merges, 'states': tree.states, 'k': k})
+
+
+def standard_jobs(agg, clustering, n_top=15):
+    """FigureJobs for 01_top_crime_states.png .. 06_crime_trends.png.
+
+    ``clustering`` is a dict with the k-sweep (``k_values``, ``inertias``,
+    ``silhouettes``) and final fit (``labels``, ``pca_data``, ``explained``,
+    ``states``) results.
+    """
+    state_totals = top_states(agg)
+    top_15 = state_totals.head(n_top)
+    return [
+        FigureJob('01_top_crime_states.png', top_states_figure,
+                  {'state_totals': top_15, 'state_avg': state_averages(agg, n_top)}),
+        FigureJob('02_elbow_silhouette.png', elbow_figure,
+                  {'k_values': list(clustering['k_values']), 'inertias': clustering['inertias'],
+                   'silhouettes': clustering['silhouettes']}),
+        FigureJob('03_state_clusters.png', clusters_figure,
+                  {'pca_data': clustering['pca_data'], 'clusters': clustering['labels'],
+                   'states': list(clustering['states']), 'explained': clustering['explained']}),
+        FigureJob('04_crime_heatmap.png', heatmap_figure,
+                  {'hmap_data': agg.state_totals.loc[top_15.index, CRIMES]}),
+        FigureJob('05_crime_types_detail.png', crime_types_figure,
+                  {'top_by_crime': {crime: top_states_for_crime(agg, crime, 10) for crime in CRIMES}}),
+        FigureJob('06_crime_trends.png', trends_figure, {'by_year': yearly_trends(agg)}),
+    ]
+
+
+def overview_jobs(agg, clustering, n_top=15):
+    """The ``standard_jobs`` set with the four-panel overview figures.
+
+    The heatmap is replaced by 04_crime_analysis.png, which adds the overall
+    crime type shares to it; 05_crime_types_detail.png is the standard one.
+    """
+    state_totals = top_states(agg)
+    jobs = standard_jobs(agg, clustering, n_top)
+    return [
+        FigureJob('01_top_crime_states.png', top_states_overview_figure,
+                  {'state_totals': state_totals, 'state_avg': state_averages(agg, n_top), 'n_top': n_top}),
+        FigureJob('02_elbow_silhouette.png', k_sweep_overview_figure, jobs[1].data),
+        FigureJob('03_state_clusters.png', clusters_overview_figure, jobs[2].data),
+        FigureJob('04_crime_analysis.png', crime_analysis_figure,
+                  {**jobs[3].data, 'by_crime': crime_totals(agg)}),
+        jobs[4],
+        FigureJob('06_crime_trends.png', trends_overview_figure, jobs[5].data),
+    ]
@@ -0,0 +1,119 @@
+"""
+Batched trend forecasts for every yearly series at once.
+
+Each series is fitted with an ordinary least-squares trend (on the counts, or
+on ``log1p`` of them for the log-linear model). The fits use closed-form
+weighted sums along the year axis, so all state x crime series (or any number
+of district series) are fitted with a few array reductions instead of a Python
+loop. Years a state did not report get zero weight, so a state that only
+exists from 2011 is fitted on its own years.
+
+Intervals are the usual OLS prediction intervals with Student-t quantiles.
+A series with fewer than three reported years has no interval, and a series
+with fewer than two has no forecast.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+HORIZON = 3
+LEVEL = 0.95
+MODELS = ('linear', 'loglinear')
+
+Forecast = namedtuple('Forecast', ['years', 'point', 'lower', 'upper'])
+Trend = namedtuple('Trend', ['center', 'n', 'x_bar', 'sxx', 'slope', 'intercept', 's2'])
+
+
+def _prepare(years, values, weights, model):
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}; expected one of {', '.join(MODELS)}")
+    years = np.asarray(years, dtype=float)
+    y = np.asarray(values, dtype=float)
+    if model == 'loglinear':
+        y = np.log1p(np.maximum(y, 0))
+    w = np.ones_like(y) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), y.shape)
+    return years, y, w
+
+
+def _column(x, ndim):
+    """Reshape a year vector to broadcast against (years, ...) arrays."""
+    return x.reshape((-1,) + (1,) * (ndim - 1))
+
+
+def trend_fit(years, values, weights=None, model='linear'):
+    """Weighted OLS trend of every series in ``values`` (years on axis 0).
+
+    Works on ``log1p`` of the values for the log-linear model. Returns a Trend
+    whose arrays have shape ``values.shape[1:]``.
+    """
+    years, y, w = _prepare(years, values, weights, model)
+    center = years.mean()
+    x = _column(years - center, y.ndim)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = w.sum(axis=0)
+        x_bar = (w * x).sum(axis=0) / n
+        y_bar = (w * y).sum(axis=0) / n
+        dx = x - x_bar
+        sxx = (w * dx * dx).sum(axis=0)
+        slope = np.where(sxx > 0, (w * dx * (y - y_bar)).sum(axis=0) / sxx, 0.0)
+        intercept = y_bar - slope * x_bar
+        s2 = (w * (y - intercept - slope * x) ** 2).sum(axis=0) / (n - 2)
+    return Trend(center, n, x_bar, sxx, slope, intercept, s2)
+
+
+def trend_values(trend, years):
+    """Fitted values of ``trend`` at ``years``, on the scale it was fitted on."""
+    x = _column(np.asarray(years, dtype=float) - trend.center, np.ndim(trend.slope) + 1)
+    return trend.intercept + trend.slope * x
+
+
+def fit_trend(years, values, weights=None, horizon=HORIZON, model='linear', level=LEVEL):
+    """Forecast ``horizon`` years past ``years`` for every series in ``values``.
+
+    ``values`` has the years on axis 0 and any shape after it; ``weights``
+    (same shape, or broadcastable) is 1 for observed and 0 for missing points.
+    Returns a Forecast whose arrays have shape ``(horizon,) + values.shape[1:]``.
+    """
+    trend = trend_fit(years, values, weights, model)
+    future = int(np.max(years)) + np.arange(1, horizon + 1)
+    n = trend.n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        point = trend_values(trend, future)
+        x_new = _column(future - trend.center, point.ndim)
+        se = np.sqrt(trend.s2 * (1 + 1 / n + (x_new - trend.x_bar) ** 2 / trend.sxx))
+        t = stats.t.ppf(0.5 + level / 2, np.maximum(n - 2, 1))
+        half = np.where(n > 2, t * se, np.nan)
+
+    point = np.where(n >= 2, point, np.nan)
+    lower, upper = point - half, point + half
+    if model == 'loglinear':
+        point, lower, upper = np.expm1(point), np.expm1(lower), np.expm1(upper)
+    # counts cannot go negative
+    return Forecast(future, np.maximum(point, 0), np.maximum(lower, 0), upper)
+
+
+def forecast_cube(cube, horizon=HORIZON, model='linear', level=LEVEL):
+    """Forecast every state x crime series of a CrimeCube.
+
+    Returns a Forecast with arrays of shape (horizon, states, crimes).
+    """
+    return fit_trend(cube.years, cube.data, cube.present[:, :, None], horizon, model, level)
+
+
+def forecast_totals(cube, horizon=HORIZON, model='linear', level=LEVEL):
+    """Forecast the national yearly total of each crime type: (horizon, crimes)."""
+    return fit_trend(cube.years, cube.year_totals, None, horizon, model, level)
+
+
+def forecast_frame(cube, forecast):
+    """Long-format (Year, State, Crime) frame of a ``forecast_cube`` result."""
+    index = pd.MultiIndex.from_product([forecast.years, cube.states, cube.crimes],
+                                       names=['Year', 'State', 'Crime'])
+    return pd.DataFrame({
+        'forecast': forecast.point.ravel(),
+        'lower': forecast.lower.ravel(),
+        'upper': forecast.upper.ravel(),
+    }, index=index)
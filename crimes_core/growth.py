@@ -0,0 +1,90 @@
+"""
+Year-over-year, compound annual and rolling growth for every state and crime.
+
+All three are computed as array operations along the year axis of a CrimeCube
+(with the state total as an extra crime column), never per state. The rules
+for undefined growth are the same everywhere:
+
+* a year in which the state did not report (Telangana before 2011) has no
+  growth into or out of it;
+* growth from a zero baseline is undefined (NaN), except 0 -> 0, which is 0%;
+* CAGR runs from the state's first reported year with a non-zero count to its
+  last reported year, so a state whose early years are all zero is measured
+  from when it actually starts recording cases.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .topk import TOTAL
+
+
+class GrowthTables:
+    """Growth tables of a CrimeCube, in percent.
+
+    ``yoy`` and ``rolling(w)`` are years x states x (crimes + total); ``cagr``
+    is states x (crimes + total).
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        self.columns = list(cube.crimes) + [TOTAL]
+        counts = np.empty(cube.shape[:2] + (len(self.columns),), dtype=np.float64)
+        counts[..., :-1] = cube.data
+        counts[..., -1] = counts[..., :-1].sum(axis=2)
+        counts[~cube.present] = np.nan
+        self.counts = counts
+
+    @staticmethod
+    def _ratio_growth(before, after, years=1):
+        """Percent growth per year from ``before`` to ``after`` over ``years``."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            growth = (np.power(after / before, 1 / years) - 1) * 100
+        growth = np.where(before == 0, np.nan, growth)
+        return np.where((before == 0) & (after == 0), 0.0, growth)
+
+    @cached_property
+    def yoy(self):
+        """Growth from the previous year; the first year is NaN."""
+        return self.rolling(1)
+
+    def rolling(self, window=3):
+        """Annualized growth over the trailing ``window`` years."""
+        if window < 1:
+            raise ValueError("window must be at least 1 year")
+        growth = np.full(self.counts.shape, np.nan)
+        if window < len(self.cube.years):
+            growth[window:] = self._ratio_growth(self.counts[:-window], self.counts[window:], window)
+        return growth
+
+    @cached_property
+    def cagr(self):
+        """Compound annual growth from the first non-zero to the last reported year."""
+        counts = self.counts
+        years = self.cube.years.astype(float)[:, None, None]
+        nonzero = np.nan_to_num(counts) > 0
+        reported = ~np.isnan(counts)
+        has_start = nonzero.any(axis=0)
+        first = nonzero.argmax(axis=0)
+        last = len(years) - 1 - reported[::-1].argmax(axis=0)
+
+        before = np.take_along_axis(counts, first[None], axis=0)[0]
+        after = np.take_along_axis(counts, last[None], axis=0)[0]
+        span = (np.take_along_axis(np.broadcast_to(years, counts.shape), last[None], axis=0)[0]
+                - np.take_along_axis(np.broadcast_to(years, counts.shape), first[None], axis=0)[0])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            growth = (np.power(after / before, 1 / span) - 1) * 100
+        return np.where(has_start & (span > 0), growth, np.nan)
+
+    # labelled tables
+
+    def frame(self, table):
+        """Long-format (Year, State) x column DataFrame of a years x states table."""
+        index = pd.MultiIndex.from_product([self.cube.years, self.cube.states], names=['Year', 'State'])
+        return pd.DataFrame(table.reshape(-1, len(self.columns)), index=index, columns=self.columns)
+
+    def cagr_frame(self):
+        """State x column DataFrame of ``cagr``."""
+        return pd.DataFrame(self.cagr, index=pd.Index(self.cube.states, name='State'), columns=self.columns)
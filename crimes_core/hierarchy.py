@@ -0,0 +1,120 @@
+"""
+Agglomerative clustering of states from one cached linkage tree.
+
+The condensed distance matrix and the linkage are computed once per scaled
+state matrix and saved (keyed by a hash of the matrix, the state names and
+the method). Every partition from one cluster to one per state is a cut of
+the same tree: ``cut_tree`` yields all of them in a single pass, so labels,
+within-cluster sum of squares (the KMeans inertia equivalent) and silhouettes
+for any k take no refitting. An unchanged matrix reloads the saved tree
+instead of rebuilding it.
+"""
+
+import hashlib
+import json
+import os
+from functools import cached_property
+
+import numpy as np
+from scipy.cluster.hierarchy import cut_tree, linkage
+from scipy.spatial.distance import pdist, squareform
+from sklearn.metrics import silhouette_score
+
+from .cache import CACHE_DIR, atomic_write
+
+LINKAGE_FILE = 'linkage.npz'
+METHODS = ('ward', 'average', 'complete', 'single')
+
+
+def tree_key(scaled_data, states, method):
+    digest = hashlib.sha256(np.ascontiguousarray(scaled_data, dtype=np.float64).tobytes())
+    digest.update(json.dumps([list(map(str, states)), method]).encode())
+    return digest.hexdigest()
+
+
+class LinkageTree:
+    """Linkage of the rows of ``data`` (states x features), cut at any k."""
+
+    def __init__(self, data, states, method, condensed, merges, key):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.states = list(states)
+        self.method = method
+        self.condensed = condensed
+        self.merges = merges
+        self.key = key
+
+    @classmethod
+    def build(cls, scaled_data, states, method='ward'):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {', '.join(METHODS)}")
+        data = np.asarray(scaled_data, dtype=np.float64)
+        condensed = pdist(data)
+        return cls(data, states, method, condensed, linkage(condensed, method),
+                   tree_key(data, states, method))
+
+    @cached_property
+    def distances(self):
+        """Square distance matrix, shared by every silhouette."""
+        return squareform(self.condensed)
+
+    @cached_property
+    def cuts(self):
+        """states x n labels; column ``n - k`` is the k-cluster partition."""
+        return cut_tree(self.merges)
+
+    def _check(self, k):
+        if not 1 <= k <= len(self.states):
+            raise ValueError(f"k must be between 1 and {len(self.states)}")
+
+    def labels(self, k):
+        """Cluster of each state when the tree is cut into ``k`` clusters."""
+        self._check(k)
+        return self.cuts[:, len(self.states) - k].astype(np.int32)
+
+    def inertia(self, k):
+        """Within-cluster sum of squared distances to the cluster means."""
+        labels = self.labels(k)
+        sums = np.zeros((k, self.data.shape[1]))
+        np.add.at(sums, labels, self.data)
+        counts = np.bincount(labels, minlength=k)
+        return float((self.data ** 2).sum() - ((sums ** 2).sum(axis=1) / counts).sum())
+
+    def silhouette(self, k):
+        if not 2 <= k < len(self.states):
+            raise ValueError(f"silhouette needs 2 <= k < {len(self.states)}")
+        return float(silhouette_score(self.distances, self.labels(k), metric='precomputed'))
+
+    def sweep(self, k_values=range(2, 11)):
+        """(inertias, silhouettes) for ``k_values``, as ``clustering.k_sweep`` returns."""
+        k_values = list(k_values)
+        return [self.inertia(k) for k in k_values], [self.silhouette(k) for k in k_values]
+
+    def save(self, path):
+        meta = {'states': self.states, 'method': self.method, 'key': self.key}
+        with atomic_write(path) as f:
+            np.savez(f, data=self.data, condensed=self.condensed, merges=self.merges,
+                     meta=np.array(json.dumps(meta)))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as saved:
+            meta = json.loads(str(saved['meta']))
+            return cls(saved['data'], meta['states'], meta['method'], saved['condensed'], saved['merges'],
+                       meta['key'])
+
+
+def linkage_path(local_dir='.'):
+    return os.path.join(local_dir, CACHE_DIR, LINKAGE_FILE)
+
+
+def linkage_tree(scaled_data, states, method='ward', path=None):
+    """The saved tree at ``path`` if it was built from the same input, else a new (saved) one."""
+    if path and os.path.exists(path):
+        tree = LinkageTree.load(path)
+        if tree.key == tree_key(scaled_data, states, method):
+            return tree
+    tree = LinkageTree.build(scaled_data, states, method)
+    if path:
+        tree.save(path)
+    return tree
@@ -0,0 +1,187 @@
+"""
+Incremental updates of a persisted CrimeAggregate.
+
+A data release adds (or corrects) one year of rows. ``append_rows`` folds only
+those rows into an existing aggregate: the state totals, year totals and
+reported-year counts are patched by the difference, and the small tables
+derived from them (crime leaders, year-over-year growth, cluster input) are
+re-derived from the patched totals. The full CSV is never re-read.
+
+``save_aggregate``/``load_aggregate`` persist the aggregate together with its
+totals, so a loaded aggregate answers every question without a groupby. The
+stored file is keyed to the source CSV (mtime, size and SHA-256), to
+``CACHE_VERSION`` and to the state normalization table. ``current_aggregate``
+is what every reader uses: the stored aggregate, appended years included,
+while it was built on the current CSV, otherwise a fresh build that becomes
+the new stored base. Replacing the CSV therefore discards rows appended to the
+old one. Fresh builds stream the CSV in chunks
+(``aggregate.stream_aggregate``), so the whole file is never held in memory.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import CHUNKSIZE, CrimeAggregate, partial_sums, stream_aggregate
+from .analysis import cluster_input, yearly_growth
+from .cache import CACHE_DIR, _source_meta, atomic_write, file_sha256
+from .data import CRIMES, DATA_FILE, GITHUB_URL, clean, normalize
+from .states import STATES
+
+AGGREGATE_FILE = 'aggregate.npz'
+AGGREGATE_VERSION = 1
+
+
+def aggregate_path(local_dir='.'):
+    return os.path.join(local_dir, CACHE_DIR, AGGREGATE_FILE)
+
+
+def current_aggregate(local_dir='.', chunksize=CHUNKSIZE):
+    """The stored aggregate of ``local_dir`` if it matches the CSV there, else a freshly built one."""
+    source = os.path.join(local_dir, DATA_FILE)
+    path = aggregate_path(local_dir)
+    if not os.path.exists(source):
+        # remote data: nothing to key a stored aggregate to
+        return stream_aggregate(GITHUB_URL + DATA_FILE, chunksize)
+    agg = load_aggregate(path, source)
+    if agg is None:
+        agg = stream_aggregate(source, chunksize)
+        save_aggregate(agg, path, source)
+    return agg
+
+
+def append_rows(agg, rows):
+    """Fold the rows of a new (or corrected) release into ``agg`` in place.
+
+    Counts for a (State, Year) already in ``agg`` are replaced, not added, so
+    appending the same release twice changes nothing. Returns a dict mapping
+    each derived result that changed to the keys (states, years or crimes)
+    that changed in it.
+    """
+    new = partial_sums(clean(normalize(rows))).astype('int64')
+    old = agg.by_state_year
+    overlap = new.index.intersection(old.index)
+    fresh = new.index.difference(old.index)
+    delta = new - old.reindex(new.index, fill_value=0)
+
+    before = {
+        'state_totals': agg.state_totals,
+        'year_totals': agg.year_totals,
+        'years_reported': agg.years_reported,
+        'crime_leaders': _leaders(agg.state_totals),
+        'yearly_growth': yearly_growth(agg),
+    }
+    state_delta = delta.groupby(level='State', observed=True).sum()
+    year_delta = delta.groupby(level='Year').sum()
+    reported_delta = pd.Series(1, index=fresh).groupby(level='State', observed=True).sum()
+
+    agg.by_state_year = pd.concat([old.drop(overlap), new]).sort_index()
+    agg.__dict__.pop('cube', None)
+    agg.state_totals = _patch(before['state_totals'], state_delta)
+    agg.year_totals = _patch(before['year_totals'], year_delta)
+    agg.years_reported = _patch(before['years_reported'], reported_delta)
+
+    after = {
+        'state_totals': agg.state_totals,
+        'year_totals': agg.year_totals,
+        'years_reported': agg.years_reported,
+        'crime_leaders': _leaders(agg.state_totals),
+        'yearly_growth': yearly_growth(agg),
+    }
+    changes = {name: _changed_keys(before[name], after[name]) for name in after}
+    # the clustering features are the state totals themselves
+    changes['cluster_input'] = _changed_keys(before['state_totals'][CRIMES], cluster_input(agg))
+    return {name: keys for name, keys in changes.items() if keys}
+
+
+def _leaders(state_totals):
+    # from the patched totals directly; the cube (and its top-k index) is rebuilt lazily
+    totals = state_totals[CRIMES]
+    return pd.DataFrame({'State': totals.idxmax(), 'Cases': totals.max()})
+
+
+def _patch(table, delta):
+    """``table + delta`` aligned on the index, keeping integer counts."""
+    patched = table.add(delta, fill_value=0).astype('int64')
+    return patched.sort_index()
+
+
+def _changed_keys(before, after):
+    before = before.reindex(after.index)
+    if isinstance(after, pd.DataFrame) and not all(after.dtypes.map(pd.api.types.is_numeric_dtype)):
+        differs = (before != after).any(axis=1).to_numpy()
+    else:
+        a, b = before.to_numpy(dtype=float), after.to_numpy(dtype=float)
+        differs = ~np.isclose(a, b, equal_nan=True)
+        if differs.ndim == 2:
+            differs = differs.any(axis=1)
+    return [key.item() if hasattr(key, 'item') else key for key in after.index[differs]]
+
+
+def save_aggregate(agg, path, source=None):
+    """Write ``agg`` and its totals to ``path`` as an ``.npz``, keyed to the ``source`` CSV."""
+    frame = agg.by_state_year
+    arrays = {
+        'state': _state_codes(frame.index.get_level_values('State')),
+        'year': frame.index.get_level_values('Year').to_numpy(),
+        'counts': frame[CRIMES].to_numpy(dtype=np.int64),
+        'totals_state': _state_codes(agg.state_totals.index),
+        'state_totals': agg.state_totals[CRIMES].to_numpy(dtype=np.int64),
+        'years_reported': agg.years_reported.reindex(agg.state_totals.index).to_numpy(dtype=np.int64),
+        'totals_year': agg.year_totals.index.to_numpy(),
+        'year_totals': agg.year_totals[CRIMES].to_numpy(dtype=np.int64),
+        'meta': np.array(json.dumps({
+            'version': AGGREGATE_VERSION, 'crimes': CRIMES,
+            'source': None if source is None else {**_source_meta(source), 'sha256': file_sha256(source)},
+        })),
+    }
+    with atomic_write(path) as f:
+        np.savez(f, **arrays)
+    return path
+
+
+def load_aggregate(path, source=None):
+    """Read an aggregate written by ``save_aggregate``, or None if missing or stale.
+
+    With ``source``, the aggregate must have been saved from that CSV as it is now.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        if meta['version'] != AGGREGATE_VERSION or meta['crimes'] != CRIMES:
+            return None
+        if source is not None and not _same_source(meta.get('source'), source):
+            return None
+        arrays = {name: data[name] for name in data.files if name != 'meta'}
+
+    index = pd.MultiIndex.from_arrays(
+        [_states(arrays['state']), arrays['year']], names=['State', 'Year'])
+    agg = CrimeAggregate(pd.DataFrame(arrays['counts'], index=index, columns=CRIMES))
+    states = pd.CategoricalIndex(_states(arrays['totals_state']), name='State')
+    agg.state_totals = pd.DataFrame(arrays['state_totals'], index=states, columns=CRIMES)
+    agg.years_reported = pd.Series(arrays['years_reported'], index=states)
+    agg.year_totals = pd.DataFrame(
+        arrays['year_totals'], index=pd.Index(arrays['totals_year'], name='Year'), columns=CRIMES)
+    return agg
+
+
+def _same_source(recorded, source):
+    if not recorded or not os.path.exists(source):
+        return False
+    current = _source_meta(source)
+    if (recorded.get('version'), recorded.get('states')) != (current['version'], current['states']):
+        return False
+    if (recorded['mtime_ns'], recorded['size']) == (current['mtime_ns'], current['size']):
+        return True
+    return recorded['sha256'] == file_sha256(source)
+
+
+def _state_codes(states):
+    return pd.Categorical(states, categories=STATES).codes.astype(np.int16)
+
+
+def _states(codes):
+    return pd.Categorical.from_codes(codes, categories=STATES)
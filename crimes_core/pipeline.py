@@ -0,0 +1,391 @@
+"""
+Dependency-graph executor for the analysis stages.
+
+Every stage is a Node naming its input nodes (or run parameters) and the type
+it returns. ``Pipeline.run`` executes only the upstream closure of the
+requested targets (by default every node not marked optional). A node starts
+as soon as its inputs are ready: light computations run on a thread pool,
+figure renders (matplotlib is not thread-safe) and the KMeans-heavy stages on
+a process pool. Independent stages, such as the trends aggregation and the
+k-sweep, therefore overlap. The process pool spawns its workers instead of
+forking them from a process whose threads may hold locks, and each worker is
+limited to one BLAS/OpenMP thread and runs its stage in-process, so
+``n_jobs`` bounds the cores in use.
+
+Outputs are memoized on disk under a key built from the node's code, the
+source of every module in the package (node functions mostly call into other
+modules), the keys of its inputs and the values of its parameters. The root
+``source`` node always runs and is keyed by the dataset's content hash, so an
+unchanged dataset makes every downstream node a cache hit and an edited one
+invalidates them all. A memoized figure path is only reused while the file
+still matches the digest recorded when it was written.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import pickle
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .cache import CACHE_DIR, atomic_write
+
+PIPELINE_DIR = os.path.join(CACHE_DIR, 'pipeline')
+
+Node = namedtuple('Node', ['name', 'func', 'inputs', 'returns', 'kind', 'memo', 'optional'],
+                  defaults=((), object, 'thread', True, False))
+Node.__doc__ = """A stage: ``func(*inputs)`` returns an instance of ``returns``.
+
+``kind`` is 'thread' or 'process' (func and inputs must then be picklable).
+``memo=False`` nodes always run and are keyed by the hash of their output.
+``optional`` nodes only run when they are requested (or needed) by name.
+"""
+
+
+class Pipeline:
+    """A validated DAG of Nodes whose free inputs are run parameters."""
+
+    def __init__(self, nodes, params=()):
+        self.nodes = {node.name: node for node in nodes}
+        self.params = set(params)
+        for node in nodes:
+            unknown = [name for name in node.inputs if name not in self.nodes and name not in self.params]
+            if unknown:
+                raise ValueError(f"Node {node.name!r} has unknown inputs: {', '.join(unknown)}")
+        self.order = self._toposort()
+
+    def _toposort(self):
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Cycle in pipeline: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.nodes[name].inputs:
+                if dep in self.nodes:
+                    visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
+
+    def upstream(self, targets):
+        """``targets`` and every node they depend on, in execution order."""
+        unknown = [t for t in targets if t not in self.nodes]
+        if unknown:
+            raise KeyError(f"Unknown targets: {', '.join(unknown)}")
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(dep for dep in self.nodes[name].inputs if dep in self.nodes)
+        return [name for name in self.order if name in needed]
+
+    def run(self, targets=None, params=None, cache_dir=PIPELINE_DIR, n_jobs=None, force=False):
+        """Run ``targets`` (all but the optional nodes if None) and what they depend on.
+
+        Returns ``(values, status)``: the value of every node that was needed,
+        and for each node ``('ran' | 'cached', seconds)``.
+        """
+        params = dict(params or {})
+        missing = self.params - set(params)
+        if missing:
+            raise ValueError(f"Missing pipeline parameters: {', '.join(sorted(missing))}")
+        names = self.upstream(targets or [name for name, node in self.nodes.items() if not node.optional])
+        os.makedirs(cache_dir, exist_ok=True)
+        n_jobs = n_jobs or os.cpu_count() or 1
+
+        values, keys, status = {}, {}, {}
+        pending = list(names)
+        running = {}
+        with ThreadPoolExecutor(max_workers=n_jobs) as threads, \
+                ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=_init_worker) as processes:
+            while pending or running:
+                for name in [n for n in pending if all(d in values or d in params for d in self.nodes[n].inputs)]:
+                    pending.remove(name)
+                    node = self.nodes[name]
+                    args = [values[d] if d in values else params[d] for d in node.inputs]
+                    if node.memo:
+                        keys[name] = self._key(node, keys, params)
+                        cached = None if force else _read_memo(cache_dir, name, keys[name])
+                        if cached is not None:
+                            values[name] = cached[0]
+                            status[name] = ('cached', 0.0)
+                            continue
+                    pool = processes if node.kind == 'process' else threads
+                    running[pool.submit(_timed, node.func, args)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    node = self.nodes[name]
+                    value, seconds = future.result()
+                    if not isinstance(value, node.returns):
+                        raise TypeError(f"Node {name!r} returned {type(value).__name__}, "
+                                        f"expected {node.returns.__name__}")
+                    values[name] = value
+                    status[name] = ('ran', seconds)
+                    if node.memo:
+                        _write_memo(cache_dir, name, keys[name], value)
+                    else:
+                        keys[name] = value_hash(value)
+        return values, status
+
+    def _key(self, node, keys, params):
+        digest = hashlib.sha256(node.name.encode())
+        digest.update(f"{node.func.__module__}.{node.func.__qualname__}".encode())
+        _update_code(digest, node.func.__code__)
+        digest.update(package_digest().encode())
+        for dep in node.inputs:
+            digest.update(dep.encode())
+            digest.update((keys[dep] if dep in keys else value_hash(params[dep])).encode())
+        return digest.hexdigest()
+
+
+def _update_code(digest, code):
+    # nested code objects (comprehensions) repr with their address, so recurse
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            _update_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
+
+
+@lru_cache(maxsize=None)
+def package_digest():
+    """SHA-256 of the source of every module in the package."""
+    from .cache import file_sha256
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package)):
+        if name.endswith('.py'):
+            digest.update(name.encode())
+            digest.update(file_sha256(os.path.join(package, name)).encode())
+    return digest.hexdigest()
+
+
+def value_hash(value):
+    from .render import _update_digest
+    digest = hashlib.sha256()
+    _update_digest(digest, value)
+    return digest.hexdigest()
+
+
+def _init_worker():
+    from threadpoolctl import threadpool_limits
+
+    from .render import use_headless
+    use_headless()
+    threadpool_limits(1)
+
+
+def _timed(func, args):
+    start = time.perf_counter()
+    return func(*args), time.perf_counter() - start
+
+
+def _memo_path(cache_dir, name, key):
+    return os.path.join(cache_dir, f"{name}.{key[:16]}.pkl")
+
+
+def _is_output(value):
+    return isinstance(value, str) and value.endswith('.png')
+
+
+def _read_memo(cache_dir, name, key):
+    """``(value,)`` if memoized (and any file it names is still the one written), else None."""
+    from .render import output_matches
+    path = _memo_path(cache_dir, name, key)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        value, output = pickle.load(f)
+    if _is_output(value) and not output_matches(value, output):
+        return None
+    return (value,)
+
+
+def _write_memo(cache_dir, name, key, value):
+    # drop older entries of the same node so the cache holds one result per node
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(name + '.') and entry.endswith('.pkl'):
+            os.remove(os.path.join(cache_dir, entry))
+    from .render import output_digest
+    output = output_digest(value) if _is_output(value) else None
+    with atomic_write(_memo_path(cache_dir, name, key)) as f:
+        pickle.dump((value, output), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# standard analysis graph
+
+def _source(data_dir):
+    """Content hash of the dataset: the CSV and the stored aggregate with its appended years."""
+    from .cache import file_sha256
+    from .data import DATA_FILE
+    from .incremental import aggregate_path, current_aggregate
+    path = os.path.join(data_dir, DATA_FILE)
+    if not os.path.exists(path):
+        # remote data: hash what was downloaded
+        return value_hash(current_aggregate(data_dir).by_state_year)
+    # brings the stored aggregate up to date with the CSV before hashing it
+    current_aggregate(data_dir)
+    return file_sha256(path) + ':' + file_sha256(aggregate_path(data_dir))
+
+
+def _aggregate(data_dir, source):
+    from .incremental import current_aggregate
+    return current_aggregate(data_dir)
+
+
+def _state_totals(aggregate):
+    from .analysis import top_states
+    return top_states(aggregate)
+
+
+def _state_averages(aggregate):
+    from .analysis import state_averages
+    return state_averages(aggregate)
+
+
+def _features(aggregate):
+    from .analysis import cluster_input
+    return cluster_input(aggregate)
+
+
+def _scaled(features):
+    from .clustering import scale_features
+    return scale_features(features)[0]
+
+
+def _k_sweep(scaled, k_values):
+    from .clustering import k_sweep
+    # the DAG's process pool is the only level of parallelism
+    return k_sweep(scaled, k_values, n_jobs=1)
+
+
+def _labels(scaled, k):
+    from .clustering import fit_clusters
+    return fit_clusters(scaled, k)
+
+
+def _pca(scaled):
+    from .clustering import pca_projection
+    return pca_projection(scaled)
+
+
+def _crime_leaders(aggregate):
+    from .analysis import crime_leaders
+    return crime_leaders(aggregate)
+
+
+def _trends(aggregate):
+    from .analysis import yearly_trends
+    return yearly_trends(aggregate)
+
+
+def _summary(aggregate, k):
+    from .report import report_facts, summary_text
+    return summary_text(report_facts(aggregate, n_clusters=k))
+
+
+def _stability(aggregate, k):
+    from .stability import bootstrap_stability, stability_frame
+    return stability_frame(bootstrap_stability(aggregate.cube, k, n_jobs=1))
+
+
+def _render(filename, draw, data, output_dir):
+    # through render_jobs so the figure manifest stays in step with the file
+    from .render import FigureJob, render_jobs
+    return render_jobs([FigureJob(filename, draw, data)], output_dir, n_jobs=1)[0][0]
+
+
+def _fig_top_states(state_totals, state_averages, n_top, output_dir):
+    from .figures import top_states_figure
+    return _render('01_top_crime_states.png', top_states_figure,
+                   {'state_totals': state_totals.head(n_top), 'state_avg': state_averages.head(n_top)}, output_dir)
+
+
+def _fig_elbow(k_sweep, k_values, output_dir):
+    from .figures import elbow_figure
+    inertias, silhouettes = k_sweep
+    return _render('02_elbow_silhouette.png', elbow_figure,
+                   {'k_values': list(k_values), 'inertias': inertias, 'silhouettes': silhouettes}, output_dir)
+
+
+def _fig_clusters(pca, labels, features, output_dir):
+    from .figures import clusters_figure
+    pca_data, explained = pca
+    return _render('03_state_clusters.png', clusters_figure,
+                   {'pca_data': pca_data, 'clusters': labels, 'states': list(features.index),
+                    'explained': explained}, output_dir)
+
+
+def _fig_heatmap(aggregate, state_totals, n_top, output_dir):
+    from .data import CRIMES
+    from .figures import heatmap_figure
+    return _render('04_crime_heatmap.png', heatmap_figure,
+                   {'hmap_data': aggregate.state_totals.loc[state_totals.head(n_top).index, CRIMES]}, output_dir)
+
+
+def _fig_crime_types(aggregate, output_dir):
+    from .analysis import top_states_for_crime
+    from .data import CRIMES
+    from .figures import crime_types_figure
+    return _render('05_crime_types_detail.png', crime_types_figure,
+                   {'top_by_crime': {crime: top_states_for_crime(aggregate, crime, 10) for crime in CRIMES}},
+                   output_dir)
+
+
+def _fig_trends(trends, output_dir):
+    from .figures import trends_figure
+    return _render('06_crime_trends.png', trends_figure, {'by_year': trends}, output_dir)
+
+
+STANDARD_PARAMS = ('data_dir', 'output_dir', 'k', 'k_values', 'n_top')
+
+
+def standard_pipeline():
+    """The scripts' stages, from loading the CSV to the six figures."""
+    from .aggregate import CrimeAggregate
+    return Pipeline([
+        Node('source', _source, ('data_dir',), str, memo=False),
+        Node('aggregate', _aggregate, ('data_dir', 'source'), CrimeAggregate),
+        Node('state_totals', _state_totals, ('aggregate',), pd.Series),
+        Node('state_averages', _state_averages, ('aggregate',), pd.Series),
+        Node('features', _features, ('aggregate',), pd.DataFrame),
+        Node('scaled', _scaled, ('features',), np.ndarray),
+        Node('k_sweep', _k_sweep, ('scaled', 'k_values'), tuple, 'process'),
+        Node('labels', _labels, ('scaled', 'k'), np.ndarray),
+        Node('pca', _pca, ('scaled',), tuple),
+        Node('crime_leaders', _crime_leaders, ('aggregate',), pd.DataFrame),
+        Node('trends', _trends, ('aggregate',), pd.DataFrame),
+        Node('summary', _summary, ('aggregate', 'k'), str),
+        Node('stability', _stability, ('aggregate', 'k'), pd.DataFrame, 'process', optional=True),
+        Node('01_top_crime_states.png', _fig_top_states,
+             ('state_totals', 'state_averages', 'n_top', 'output_dir'), str, 'process'),
+        Node('02_elbow_silhouette.png', _fig_elbow, ('k_sweep', 'k_values', 'output_dir'), str, 'process'),
+        Node('03_state_clusters.png', _fig_clusters, ('pca', 'labels', 'features', 'output_dir'), str, 'process'),
+        Node('04_crime_heatmap.png', _fig_heatmap, ('aggregate', 'state_totals', 'n_top', 'output_dir'),
+             str, 'process'),
+        Node('05_crime_types_detail.png', _fig_crime_types, ('aggregate', 'output_dir'), str, 'process'),
+        Node('06_crime_trends.png', _fig_trends, ('trends', 'output_dir'), str, 'process'),
+    ], STANDARD_PARAMS)
+
+
+def standard_params(data_dir='.', output_dir='.', k=None, k_values=range(2, 11), n_top=15):
+    from .clustering import OPTIMAL_K
+    return {'data_dir': data_dir, 'output_dir': output_dir, 'k': OPTIMAL_K if k is None else k,
+            'k_values': k_values, 'n_top': n_top}
@@ -0,0 +1,69 @@
+"""
+Cumulative-sum index along the year axis of a CrimeCube.
+
+The total for any year window is ``prefix[last + 1] - prefix[first]``, so a
+range query over any state and crime subset costs two lookups and a
+subtraction instead of a filter and groupby over the long-format data.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class YearPrefixIndex:
+    """Prefix sums of counts and of reporting coverage over years.
+
+    ``counts[i]`` holds the states x crimes totals of the first ``i`` years and
+    ``coverage[i]`` the number of those years each state reported in. The
+    coverage prefix lets windowed averages divide by the years a state actually
+    reported, so states that only appear from 2011 (Telangana, Delhi) are not
+    diluted by the 2001-2010 years in which they did not exist in the data.
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        years, states, crimes = cube.shape
+        self.counts = np.zeros((years + 1, states, crimes), dtype=np.int64)
+        np.cumsum(cube.data, axis=0, dtype=np.int64, out=self.counts[1:])
+        self.coverage = np.zeros((years + 1, states), dtype=np.int32)
+        np.cumsum(cube.present, axis=0, dtype=np.int32, out=self.coverage[1:])
+
+    def _bounds(self, first, last):
+        years = self.cube.years
+        first = years[0] if first is None else max(int(first), int(years[0]))
+        last = years[-1] if last is None else min(int(last), int(years[-1]))
+        if first > last:
+            raise ValueError(f"Empty year range {first}-{last}")
+        return self.cube.year_pos(first), self.cube.year_pos(last) + 1
+
+    def _positions(self, states, crimes):
+        state_pos = slice(None) if states is None else [self.cube.state_pos(s) for s in states]
+        crime_pos = slice(None) if crimes is None else [self.cube.crime_pos(c) for c in crimes]
+        return state_pos, crime_pos
+
+    def total(self, first=None, last=None, states=None, crimes=None):
+        """states x crimes totals for ``first..last`` (inclusive, clipped to the data)."""
+        lo, hi = self._bounds(first, last)
+        state_pos, crime_pos = self._positions(states, crimes)
+        window = self.counts[hi] - self.counts[lo]
+        return window[state_pos][:, crime_pos]
+
+    def reported_years(self, first=None, last=None, states=None):
+        """Number of years in the window each state reported in."""
+        lo, hi = self._bounds(first, last)
+        state_pos, _ = self._positions(states, None)
+        return (self.coverage[hi] - self.coverage[lo])[state_pos]
+
+    def average(self, first=None, last=None, states=None, crimes=None):
+        """Per-reported-year average for the window; NaN for states with no reports."""
+        totals = self.total(first, last, states, crimes)
+        years = self.reported_years(first, last, states).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(years[:, None] > 0, totals / years[:, None], np.nan)
+
+    def total_frame(self, first=None, last=None, states=None, crimes=None):
+        """``total`` labelled as a state x crime DataFrame."""
+        states = self.cube.states if states is None else list(states)
+        crimes = self.cube.crimes if crimes is None else list(crimes)
+        return pd.DataFrame(self.total(first, last, states, crimes),
+                            index=pd.Index(states, name='State'), columns=crimes)
@@ -0,0 +1,101 @@
+"""
+Per-stage timing and memory instrumentation.
+
+A Profiler records wall time, CPU time and peak traced memory (tracemalloc)
+for each named stage and writes them as JSON or CSV. Stages are meant to be
+sequential; nesting them resets the outer stage's peak.
+
+``cpu_s`` is the calling process only. ``child_cpu_s`` adds the CPU time of
+worker processes that exited during the stage (``RUSAGE_CHILDREN``; a process
+pool's workers exit when the pool is shut down), so a stage that fans out to
+a pool is not reported as idle. ``peak_mb`` is the calling process's Python
+allocations and excludes worker processes; figures rendered on a pool are
+measured inside their worker instead.
+"""
+
+import csv
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: child CPU time is not available
+    resource = None
+
+FIELDS = ['stage', 'wall_s', 'cpu_s', 'child_cpu_s', 'peak_mb']
+
+
+def _child_cpu():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+@contextmanager
+def _measured(stats):
+    """Fill ``stats`` with wall/CPU time and peak memory of the with-block."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    wall, cpu, child_cpu = time.perf_counter(), time.process_time(), _child_cpu()
+    try:
+        yield stats
+    finally:
+        stats['wall_s'] = time.perf_counter() - wall
+        stats['cpu_s'] = time.process_time() - cpu
+        stats['child_cpu_s'] = _child_cpu() - child_cpu
+        stats['peak_mb'] = max(tracemalloc.get_traced_memory()[1] - base, 0) / 2**20
+        if started:
+            tracemalloc.stop()
+
+
+def measure(func, *args, **kwargs):
+    """Call ``func`` and return (result, stats)."""
+    stats = {}
+    with _measured(stats):
+        result = func(*args, **kwargs)
+    return result, stats
+
+
+class Profiler:
+    """Collects one record per stage; a disabled profiler records nothing."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        stats = {}
+        try:
+            with _measured(stats):
+                yield
+        finally:
+            self.add(name, stats)
+
+    def add(self, name, stats):
+        if self.enabled:
+            self.records.append({'stage': name, **stats})
+
+    def write(self, path):
+        """Write the records as CSV if ``path`` ends in .csv, else as JSON."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                writer.writeheader()
+                writer.writerows(self.records)
+            else:
+                json.dump({'stages': self.records}, f, indent=2)
+        return path
@@ -0,0 +1,238 @@
+"""
+Headless batch rendering of figure jobs.
+
+A FigureJob names an output file, a drawing function from ``figures`` and the
+precomputed data it needs. Jobs are independent of one another, so they are
+rendered on a process pool with the non-interactive Agg backend and never
+call ``plt.show()``.
+
+Each output directory keeps a manifest mapping every figure to a hash of its
+inputs (the source of the drawing function's module, the data and the dpi)
+and a digest of the file that was written. A job is skipped, unless ``force``
+is set, only while both still match, so editing a plotting function or
+overwriting the PNG from another script re-renders it. Every writer of a
+figure records it through ``record_outputs``.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from .cache import atomic_write, file_sha256
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest updates are not locked
+    fcntl = None
+
+DPI = 300
+MANIFEST_FILE = '.figure_manifest.json'
+
+FigureJob = namedtuple('FigureJob', ['filename', 'draw', 'data'])
+
+
+def use_headless():
+    """Force the non-interactive Agg backend."""
+    matplotlib.use('Agg', force=True)
+
+
+def show(headless):
+    """``plt.show()`` for interactive runs; close the figures when headless."""
+    import matplotlib.pyplot as plt
+    if headless:
+        plt.close('all')
+    else:
+        plt.show()
+
+
+def draw_job(job):
+    """Draw ``job`` with the standard style and return its Figure."""
+    from .figures import apply_style
+    apply_style()
+    return job.draw(**job.data)
+
+
+def render_job(job, output_dir='.', dpi=DPI):
+    """Draw ``job``, save it under ``output_dir`` and close it. Returns the path."""
+    import matplotlib.pyplot as plt
+    fig = draw_job(job)
+    path = os.path.join(output_dir, job.filename)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+
+def _render_headless(job, output_dir, dpi, profile=False):
+    use_headless()
+    if not profile:
+        return render_job(job, output_dir, dpi), None
+    from .profiling import measure
+    return measure(render_job, job, output_dir, dpi)
+
+
+def _update_digest(digest, obj):
+    """Feed a stable byte representation of ``obj`` into ``digest``."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(type(obj).__name__.encode())
+        digest.update(repr(list(obj.index)).encode())
+        if isinstance(obj, pd.DataFrame):
+            digest.update(repr(list(obj.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    elif isinstance(obj, pd.Index):
+        digest.update(repr(list(obj)).encode())
+    elif isinstance(obj, np.ndarray):
+        digest.update(f"{obj.dtype}{obj.shape}".encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            digest.update(repr(key).encode())
+            _update_digest(digest, obj[key])
+    elif isinstance(obj, (list, tuple, range)):
+        digest.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(obj).encode())
+
+
+@lru_cache(maxsize=None)
+def module_digest(module_name):
+    """SHA-256 of a module's source file."""
+    return file_sha256(inspect.getsourcefile(sys.modules[module_name]))
+
+
+def job_hash(job, dpi=DPI):
+    """Hash of everything that determines a job's output file."""
+    digest = hashlib.sha256()
+    digest.update(f"{job.draw.__module__}.{job.draw.__qualname__}:{dpi}".encode())
+    # the whole module, so edits to shared helpers such as apply_style count too
+    digest.update(module_digest(job.draw.__module__).encode())
+    _update_digest(digest, job.data)
+    return digest.hexdigest()
+
+
+def output_digest(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(path)}
+
+
+def output_matches(path, recorded):
+    """Whether ``path`` is still the file described by ``recorded`` (an ``output_digest``)."""
+    if not isinstance(recorded, dict) or not os.path.exists(path):
+        return False
+    stat = os.stat(path)
+    if (stat.st_size, stat.st_mtime_ns) == (recorded.get('size'), recorded.get('mtime_ns')):
+        return True
+    return file_sha256(path) == recorded.get('sha256')
+
+
+def read_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(output_dir, manifest):
+    with atomic_write(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+@contextmanager
+def _manifest_lock(output_dir):
+    """Serialize read-modify-write of the manifest across processes."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(output_dir, MANIFEST_FILE + '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def record_outputs(jobs, output_dir='.', dpi=DPI):
+    """Record the files just written for ``jobs`` in the manifest."""
+    with _manifest_lock(output_dir):
+        manifest = read_manifest(output_dir)
+        for job in jobs:
+            manifest[job.filename] = {'input': job_hash(job, dpi),
+                                      'output': output_digest(os.path.join(output_dir, job.filename))}
+        write_manifest(output_dir, manifest)
+
+
+def stale_jobs(jobs, output_dir='.', dpi=DPI):
+    """Jobs whose inputs changed or whose file is missing or no longer the one rendered."""
+    manifest = read_manifest(output_dir)
+    stale = []
+    for job in jobs:
+        entry = manifest.get(job.filename)
+        if (not isinstance(entry, dict) or entry.get('input') != job_hash(job, dpi)
+                or not output_matches(os.path.join(output_dir, job.filename), entry.get('output'))):
+            stale.append(job)
+    return stale
+
+
+def render_jobs(jobs, output_dir='.', dpi=DPI, n_jobs=None, force=False, profiler=None):
+    """Render stale jobs headlessly, in parallel across ``n_jobs`` processes.
+
+    Jobs whose file and manifest entry are up to date are skipped unless
+    ``force`` is set. Returns ``(path, rendered)`` pairs in job order.
+    ``n_jobs=1`` renders in-process. When a ``profiler`` is given, each
+    render is measured in the process that performs it and recorded as a
+    ``render:<filename>`` stage.
+    """
+    jobs = list(jobs)
+    os.makedirs(output_dir, exist_ok=True)
+    todo = jobs if force else stale_jobs(jobs, output_dir, dpi)
+
+    if todo:
+        if n_jobs is None:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = max(1, min(n_jobs, len(todo)))
+        profile = profiler is not None and profiler.enabled
+        if n_jobs == 1:
+            results = [_render_headless(job, output_dir, dpi, profile) for job in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=use_headless) as pool:
+                results = list(pool.map(_render_headless, todo, [output_dir] * len(todo),
+                                        [dpi] * len(todo), [profile] * len(todo)))
+        if profile:
+            for job, (_, stats) in zip(todo, results):
+                profiler.add(f"render:{job.filename}", stats)
+
+        record_outputs(todo, output_dir, dpi)
+
+    rendered = {job.filename for job in todo}
+    return [(os.path.join(output_dir, job.filename), job.filename in rendered) for job in jobs]
+
+
+def render_or_show(jobs, headless=False, output_dir='.', dpi=DPI, n_jobs=None, force=False, profiler=None):
+    """How the scripts produce their figures; yields ``(path, rendered)`` pairs.
+
+    Headless runs go through ``render_jobs``. Interactive runs draw, save and
+    record each job in turn and ``plt.show()`` it after it has been yielded.
+    """
+    if headless:
+        yield from render_jobs(jobs, output_dir, dpi, n_jobs, force, profiler)
+        return
+    for job in jobs:
+        with profiler.stage(f"render:{job.filename}") if profiler is not None else nullcontext():
+            fig = draw_job(job)
+            path = os.path.join(output_dir, job.filename)
+            fig.savefig(path, dpi=dpi, bbox_inches='tight')
+        record_outputs([job], output_dir, dpi)
+        yield path, True
+        show(headless)
@@ -0,0 +1,251 @@
+"""
+Markdown and HTML reports filled in from one precomputed aggregate.
+
+``report_facts`` reads every number a report states from the cube's year
+prefix index and its yearly totals. Once the aggregate is built, a report for
+any set of states and any year range costs a few array lookups, so many
+per-region and per-year reports share a single aggregation pass. The prose is
+templated around those facts, so it cannot drift from the data. The standard
+figures are referenced by file name and never re-rendered. They are drawn
+from the full dataset, so only reports over every state and year embed them.
+"""
+
+import html
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data import CRIME_NAMES
+from .states import REGIONS, normalize_states
+
+FIGURES = [
+    ('01_top_crime_states.png', 'States with the most cases'),
+    ('02_elbow_silhouette.png', 'Choosing the number of clusters'),
+    ('03_state_clusters.png', 'State clusters (K-Means + PCA)'),
+    ('04_crime_heatmap.png', 'Crime types in the top states'),
+    ('05_crime_types_detail.png', 'Top states for each crime type'),
+    ('06_crime_trends.png', 'Trends over time'),
+    ('07_dendrogram.png', 'Hierarchical clustering of states'),
+]
+TOP_N = 5
+
+
+def report_facts(agg, title='Crimes against women', states=None, first=None, last=None, n_clusters=None):
+    """Every number a report needs, for ``states`` (all if None) over ``first..last``.
+
+    Raises ValueError for unknown state names or a range outside the data.
+    """
+    cube = agg.cube
+    prefix = cube.prefix
+    years = cube.years
+    first = int(years[0]) if first is None else max(int(first), int(years[0]))
+    last = int(years[-1]) if last is None else min(int(last), int(years[-1]))
+    if first > last:
+        raise ValueError(f"Empty year range {first}-{last} (the data covers {years[0]}-{years[-1]})")
+    names = cube.states if states is None else _known_states(cube, states)
+
+    window = prefix.total(first, last, names)
+    reported = prefix.reported_years(first, last, names) > 0
+    names = [name for name, ok in zip(names, reported) if ok]
+    window = window[reported]
+    by_crime = window.sum(axis=0)
+    by_state = window.sum(axis=1)
+    total = int(by_crime.sum())
+
+    def share(count):
+        return count / total * 100 if total else 0.0
+
+    top = np.argsort(-by_state, kind='stable')[:TOP_N]
+    crime_order = np.argsort(-by_crime, kind='stable')
+    leaders = window.argmax(axis=0) if names else np.zeros(window.shape[1], dtype=int)
+    positions = [cube.state_pos(name) for name in names]
+    yearly = cube.year_range(first, last)[:, positions].sum(axis=(1, 2), dtype=np.int64)
+    peak = int(yearly.argmax())
+
+    return {
+        'title': title,
+        'first': first,
+        'last': last,
+        'states': names,
+        'total': total,
+        'crimes': [(cube.crimes[i], CRIME_NAMES[cube.crimes[i]], int(by_crime[i]), share(by_crime[i]))
+                   for i in crime_order],
+        'top_states': [(names[i], int(by_state[i]), share(by_state[i])) for i in top],
+        'top_share': share(by_state[top].sum()),
+        'leaders': [(crime, CRIME_NAMES[crime], names[leaders[i]], int(window[leaders[i], i]))
+                    for i, crime in enumerate(cube.crimes) if window[:, i].any()],
+        'yearly': list(zip(range(first, last + 1), yearly.tolist())),
+        'first_total': int(yearly[0]),
+        'last_total': int(yearly[-1]),
+        'growth': (yearly[-1] - yearly[0]) / yearly[0] * 100 if yearly[0] else None,
+        'peak_year': first + peak,
+        'peak_total': int(yearly[peak]),
+        'n_clusters': n_clusters,
+    }
+
+
+def _known_states(cube, states):
+    names = list(dict.fromkeys(str(s) for s in normalize_states(pd.Series(list(states)))))
+    unknown = [name for name in names if name not in cube.states]
+    if unknown:
+        raise ValueError(f"No data for states: {', '.join(unknown)}")
+    return names
+
+
+def _period(facts):
+    return str(facts['first']) if facts['first'] == facts['last'] else f"{facts['first']}-{facts['last']}"
+
+
+def observations(facts):
+    """Key findings as sentences."""
+    if not facts['total']:
+        return [f"No cases were reported in {_period(facts)}."]
+    state, count, pct = facts['top_states'][0]
+    _, crime_name, _, crime_pct = facts['crimes'][0]
+    lines = [
+        f"{state} has the highest number of crimes against women ({count:,} cases, {pct:.1f}% of the total).",
+        f"The top {len(facts['top_states'])} states account for {facts['top_share']:.1f}% of all cases.",
+        f"{crime_name} is the most prevalent crime type, accounting for {crime_pct:.1f}% of cases.",
+    ]
+    if facts['n_clusters']:
+        lines.append(f"{facts['n_clusters']} distinct state clusters were identified based on crime patterns.")
+    if facts['growth'] is not None and facts['first'] < facts['last']:
+        direction = 'increased' if facts['growth'] >= 0 else 'decreased'
+        lines.append(f"Reported cases {direction} by {abs(facts['growth']):.1f}% from {facts['first']} "
+                     f"({facts['first_total']:,}) to {facts['last']} ({facts['last_total']:,}), "
+                     f"peaking in {facts['peak_year']} ({facts['peak_total']:,}).")
+    return lines
+
+
+def recommendations(facts):
+    """Recommendations pointed at the largest states and crime types in the facts."""
+    if not facts['total']:
+        return []
+    states = ', '.join(state for state, _, _ in facts['top_states'][:3])
+    crimes = ' and '.join(name for _, name, _, _ in facts['crimes'][:2])
+    return [
+        f"Prioritise prevention and victim support for {crimes}, the largest crime types.",
+        f"Target awareness campaigns and enforcement resources at {states}.",
+        "Develop state-specific programmes from each state's predominant crime types.",
+        "Strengthen data collection so that every state reports consistently each year.",
+    ]
+
+
+def summary_text(facts):
+    """Plain-text summary for the analysis scripts."""
+    lines = [f"\nThis analysis examined crime data across Indian states from {_period(facts)}.",
+             "", "Key observations:"]
+    lines += [f"- {line}" for line in observations(facts)]
+    lines += ["", "Recommendations:"]
+    lines += [f"{i}. {line}" for i, line in enumerate(recommendations(facts), 1)]
+    return '\n'.join(lines) + '\n'
+
+
+def report_blocks(facts, figures=()):
+    """Report content as (kind, ...) blocks shared by the Markdown and HTML writers."""
+    blocks = [
+        ('h1', f"{facts['title']} ({_period(facts)})"),
+        ('p', f"{facts['total']:,} reported cases across {len(facts['states'])} states and union territories."),
+        ('h2', 'Key observations'),
+        ('ul', observations(facts)),
+        ('h2', 'Highest-crime states'),
+        ('table', ['Rank', 'State', 'Cases', 'Share'],
+         [[rank, state, f"{count:,}", f"{pct:.1f}%"] for rank, (state, count, pct) in enumerate(facts['top_states'], 1)]),
+        ('h2', 'Crime types'),
+        ('table', ['Crime', 'Cases', 'Share', 'Highest state'],
+         [[name, f"{count:,}", f"{pct:.1f}%", leader]
+          for (crime, name, count, pct), leader in zip(facts['crimes'], _leader_names(facts))]),
+        ('h2', 'Cases by year'),
+        ('table', ['Year', 'Cases'], [[year, f"{count:,}"] for year, count in facts['yearly']]),
+        ('h2', 'Recommendations'),
+        ('ol', recommendations(facts)),
+    ]
+    if figures:
+        blocks.append(('h2', 'Figures'))
+        blocks += [('img', path, caption) for path, caption in figures]
+    return blocks
+
+
+def _leader_names(facts):
+    leaders = {crime: f"{state} ({count:,})" for crime, _, state, count in facts['leaders']}
+    return [leaders.get(crime, '-') for crime, _, _, _ in facts['crimes']]
+
+
+def render_markdown(blocks):
+    out = []
+    for kind, *content in blocks:
+        if kind in ('h1', 'h2'):
+            out.append(f"{'#' * int(kind[1])} {content[0]}")
+        elif kind == 'p':
+            out.append(content[0])
+        elif kind == 'ul':
+            out.append('\n'.join(f"- {item}" for item in content[0]))
+        elif kind == 'ol':
+            out.append('\n'.join(f"{i}. {item}" for i, item in enumerate(content[0], 1)))
+        elif kind == 'table':
+            header, rows = content
+            lines = [f"| {' | '.join(header)} |", f"|{'|'.join('---' for _ in header)}|"]
+            lines += [f"| {' | '.join(str(cell) for cell in row)} |" for row in rows]
+            out.append('\n'.join(lines))
+        elif kind == 'img':
+            path, caption = content
+            out.append(f"![{caption}]({path})")
+    return '\n\n'.join(out) + '\n'
+
+
+def render_html(blocks):
+    esc = html.escape
+    out = []
+    for kind, *content in blocks:
+        if kind in ('h1', 'h2', 'p'):
+            out.append(f"<{kind}>{esc(content[0])}</{kind}>")
+        elif kind in ('ul', 'ol'):
+            items = ''.join(f"<li>{esc(item)}</li>" for item in content[0])
+            out.append(f"<{kind}>{items}</{kind}>")
+        elif kind == 'table':
+            header, rows = content
+            head = ''.join(f"<th>{esc(str(cell))}</th>" for cell in header)
+            body = ''.join('<tr>' + ''.join(f"<td>{esc(str(cell))}</td>" for cell in row) + '</tr>' for row in rows)
+            out.append(f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>")
+        elif kind == 'img':
+            path, caption = content
+            out.append(f'<figure><img src="{esc(path)}" alt="{esc(caption)}">'
+                       f'<figcaption>{esc(caption)}</figcaption></figure>')
+    title = esc(blocks[0][1]) if blocks and blocks[0][0] == 'h1' else 'Report'
+    return (f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title></head>\n"
+            f"<body>\n" + '\n'.join(out) + "\n</body></html>\n")
+
+
+RENDERERS = {'md': render_markdown, 'html': render_html}
+
+
+def standard_specs(agg):
+    """One national report, one per region and one national report per year."""
+    specs = [{'name': 'national', 'title': 'Crimes against women in India'}]
+    specs += [{'name': 'region-' + region.lower().replace(' ', '-'), 'title': f"{region} region",
+               'states': states} for region, states in REGIONS.items()]
+    specs += [{'name': f"year-{year}", 'title': f"Crimes against women in {year}", 'first': year, 'last': year}
+              for year in agg.cube.years.tolist()]
+    return specs
+
+
+def write_reports(agg, specs, output_dir='reports', fmt='md', figures_dir='.', n_clusters=None):
+    """Write one report per spec (name, title, states, first, last); returns the paths.
+
+    Only specs without a state or year restriction embed the standard figures.
+    """
+    render = RENDERERS[fmt]
+    os.makedirs(output_dir, exist_ok=True)
+    figures = [(os.path.relpath(os.path.join(figures_dir, filename), output_dir), caption)
+               for filename, caption in FIGURES if os.path.exists(os.path.join(figures_dir, filename))]
+    paths = []
+    for spec in specs:
+        facts = report_facts(agg, spec.get('title', spec['name']), spec.get('states'),
+                             spec.get('first'), spec.get('last'), n_clusters)
+        path = os.path.join(output_dir, f"{spec['name']}.{fmt}")
+        with open(path, 'w', encoding='utf-8') as f:
+            whole = not any(spec.get(field) is not None for field in ('states', 'first', 'last'))
+            f.write(render(report_blocks(facts, figures if whole else ())))
+        paths.append(path)
+    return paths
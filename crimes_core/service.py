@@ -0,0 +1,381 @@
+"""
+Local asyncio JSON service over the precomputed aggregate.
+
+The aggregate, its cube and the year prefix index are built once at startup;
+every query is then a handful of array lookups. Encoded responses are kept in
+a bounded LRU cache keyed by the normalized query, and per-endpoint request
+latencies are exposed at ``/metrics``.
+
+Endpoints (all GET, parameters in the query string, lists comma-separated)::
+
+    /top-states     first, last, crimes, states, n, by=total|average
+    /crime-leaders  first, last, states
+    /trends         first, last, crimes, states
+    /clusters       k
+    /metrics
+
+Only the standard library is used for the HTTP layer, so the service runs
+wherever the analysis scripts do.
+"""
+
+import asyncio
+import json
+import time
+import traceback
+from collections import OrderedDict, deque
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .analysis import cluster_input
+from .states import normalize_states
+
+CACHE_SIZE = 256
+LATENCY_WINDOW = 1000
+MAX_REQUEST_LINE = 8192
+TOP_N = 15
+# all paths the service does not serve share one metrics entry
+UNKNOWN_ENDPOINT = 'unknown'
+
+
+class QueryError(ValueError):
+    """A query with a bad or unknown parameter (answered with HTTP 400)."""
+
+
+class UnknownEndpoint(LookupError):
+    """A request for a path the service does not serve (answered with HTTP 404)."""
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self):
+        return {'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+
+class LatencyMetrics:
+    """Request counts and latency percentiles per endpoint over a sliding window."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, endpoint, seconds):
+        self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+        self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+
+    def snapshot(self):
+        report = {}
+        for endpoint, samples in self._samples.items():
+            ms = np.asarray(samples) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            report[endpoint] = {
+                'count': self._counts[endpoint],
+                'mean_ms': round(float(ms.mean()), 3),
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(ms.max()), 3),
+            }
+        return report
+
+
+class QueryService:
+    """Answers dashboard queries from one CrimeAggregate."""
+
+    def __init__(self, agg, cache_size=CACHE_SIZE):
+        self.agg = agg
+        self.cube = agg.cube
+        self.prefix = self.cube.prefix
+        self.cache = LRUCache(cache_size)
+        self.metrics = LatencyMetrics()
+        self.endpoints = {
+            '/top-states': self.top_states,
+            '/crime-leaders': self.crime_leaders,
+            '/trends': self.trends,
+            '/clusters': self.clusters,
+        }
+        # the parameters each endpoint reads, as normalized by ``query``
+        self.params = {
+            '/top-states': ('years', 'states', 'crimes', 'n', 'by'),
+            '/crime-leaders': ('years', 'states'),
+            '/trends': ('years', 'states', 'crimes'),
+            '/clusters': ('k',),
+        }
+
+    # parameter parsing
+
+    def _years(self, params):
+        years = self.cube.years
+        first = max(_int(params, 'first', int(years[0])), int(years[0]))
+        last = min(_int(params, 'last', int(years[-1])), int(years[-1]))
+        if first > last:
+            raise QueryError(f"Empty year range {first}-{last}")
+        return first, last
+
+    def _states(self, params):
+        names = _list(params, 'states')
+        if names is None:
+            return None
+        try:
+            states = [str(s) for s in normalize_states(pd.Series(names))]
+        except ValueError as exc:
+            raise QueryError(str(exc)) from None
+        unknown = [s for s in states if s not in self.cube.states]
+        if unknown:
+            raise QueryError(f"No data for states: {', '.join(unknown)}")
+        return list(dict.fromkeys(states))
+
+    def _crimes(self, params):
+        crimes = _list(params, 'crimes')
+        if crimes is None:
+            return None
+        unknown = [c for c in crimes if c not in self.cube.crimes]
+        if unknown:
+            raise QueryError(f"Unknown crimes: {', '.join(unknown)}")
+        return list(dict.fromkeys(crimes))
+
+    # queries
+
+    def top_states(self, params):
+        first, last = self._years(params)
+        states, crimes = self._states(params), self._crimes(params)
+        n = _int(params, 'n', TOP_N, minimum=1)
+        by = params.get('by', 'total')
+        leaderboard = self._leaderboard(first, last, states, crimes, by, n)
+        if leaderboard is not None:
+            return {'first': first, 'last': last, 'by': by, 'states': leaderboard}
+        names = self.cube.states if states is None else states
+        reported = self.prefix.reported_years(first, last, states) > 0
+        if by == 'total':
+            values = self.prefix.total(first, last, states, crimes).sum(axis=1)
+        elif by == 'average':
+            values = self.prefix.total(first, last, states, crimes).sum(axis=1) / np.maximum(
+                self.prefix.reported_years(first, last, states), 1)
+        else:
+            raise QueryError(f"Unknown ranking {by!r} (use 'total' or 'average')")
+        order = [i for i in np.argsort(-values, kind='stable') if reported[i]][:n]
+        return {
+            'first': first, 'last': last, 'by': by,
+            'states': [{'rank': rank, 'state': names[i], 'cases': values[i].item()}
+                       for rank, i in enumerate(order, 1)],
+        }
+
+    def _leaderboard(self, first, last, states, crimes, by, n):
+        """Answer from the top-k index when the query is one of its leaderboards."""
+        topk = self.cube.topk
+        years = self.cube.years
+        if states is not None or by != 'total' or n > topk.k or (crimes is not None and len(crimes) > 1):
+            return None
+        if first == last:
+            year = first
+        elif (first, last) == (years[0], years[-1]):
+            year = None
+        else:
+            return None
+        top = topk.top(crimes[0] if crimes else 'total', year, n)
+        return [{'rank': rank, 'state': state, 'cases': int(cases)}
+                for rank, (state, cases) in enumerate(top.items(), 1)]
+
+    def crime_leaders(self, params):
+        first, last = self._years(params)
+        states = self._states(params)
+        names = self.cube.states if states is None else states
+        totals = self.prefix.total(first, last, states)
+        best = totals.argmax(axis=0)
+        return {
+            'first': first, 'last': last,
+            'leaders': [{'crime': crime, 'state': names[best[i]], 'cases': int(totals[best[i], i])}
+                        for i, crime in enumerate(self.cube.crimes)],
+        }
+
+    def trends(self, params):
+        first, last = self._years(params)
+        states, crimes = self._states(params), self._crimes(params)
+        crimes = self.cube.crimes if crimes is None else crimes
+        window = self.cube.year_range(first, last)
+        if states is not None:
+            window = window[:, [self.cube.state_pos(s) for s in states]]
+        by_year = window.sum(axis=1, dtype=np.int64)[:, [self.cube.crime_pos(c) for c in crimes]]
+        return {
+            'first': first, 'last': last,
+            'years': [{'year': int(year), **dict(zip(crimes, row.tolist())), 'total': int(row.sum())}
+                      for year, row in zip(range(first, last + 1), by_year)],
+        }
+
+    def clusters(self, params):
+        from .clustering import OPTIMAL_K, cluster_breakdown, fit_clusters, scale_features
+
+        k = _int(params, 'k', OPTIMAL_K)
+        state_data = cluster_input(self.agg)
+        if not 2 <= k <= len(state_data):
+            raise QueryError(f"k must be between 2 and {len(state_data)}")
+        scaled, _ = scale_features(state_data)
+        labels = fit_clusters(scaled, k)
+        return {
+            'k': k,
+            'clusters': [{'cluster': int(cluster_id), 'states': [str(s) for s in states], 'total_crimes': int(total)}
+                         for cluster_id, states, total in cluster_breakdown(state_data, labels)],
+        }
+
+    # dispatch
+
+    def query(self, endpoint, params):
+        """``params`` validated and in canonical form, keeping only those ``endpoint`` reads.
+
+        Equivalent queries (``k=03`` and ``k=3``, a state alias and its
+        canonical name, an explicit default) normalize to the same params.
+        """
+        try:
+            fields = self.params[endpoint]
+        except KeyError:
+            raise UnknownEndpoint(endpoint) from None
+        query = {}
+        if 'years' in fields:
+            query['first'], query['last'] = map(str, self._years(params))
+        if 'states' in fields and (states := self._states(params)) is not None:
+            query['states'] = ','.join(states)
+        if 'crimes' in fields and (crimes := self._crimes(params)) is not None:
+            query['crimes'] = ','.join(crimes)
+        if 'n' in fields:
+            query['n'] = str(_int(params, 'n', TOP_N, minimum=1))
+        if 'by' in fields:
+            query['by'] = params.get('by', 'total')
+        if 'k' in fields and 'k' in params:
+            query['k'] = str(_int(params, 'k'))
+        return query
+
+    def cache_key(self, endpoint, query):
+        """LRU key for a ``query`` already normalized by ``query()``."""
+        return endpoint, tuple(sorted(query.items()))
+
+    def answer(self, endpoint, params):
+        """Encoded JSON body for one query (uncached)."""
+        try:
+            handler = self.endpoints[endpoint]
+        except KeyError:
+            raise UnknownEndpoint(endpoint) from None
+        return json.dumps(handler(params)).encode()
+
+    async def handle(self, target):
+        """(status, body) for a request target such as ``/trends?first=2010``."""
+        url = urlsplit(target)
+        endpoint = url.path.rstrip('/') or '/'
+        params = dict(parse_qsl(url.query))
+        start = time.perf_counter()
+        try:
+            if endpoint == '/metrics':
+                return 200, json.dumps({'latency': self.metrics.snapshot(), 'cache': self.cache.stats()}).encode()
+            query = self.query(endpoint, params)
+            key = self.cache_key(endpoint, query)
+            body = self.cache.get(key)
+            if body is None:
+                # misses (notably /clusters) run off the event loop so cached queries stay fast
+                loop = asyncio.get_running_loop()
+                body = await loop.run_in_executor(None, self.answer, endpoint, query)
+                self.cache.put(key, body)
+            return 200, body
+        except QueryError as exc:
+            return 400, json.dumps({'error': str(exc)}).encode()
+        except UnknownEndpoint:
+            return 404, json.dumps({'error': f"Unknown endpoint {endpoint}"}).encode()
+        except Exception as exc:
+            # a bug in a handler must not drop the connection
+            traceback.print_exc()
+            return 500, json.dumps({'error': f"Internal error ({type(exc).__name__})"}).encode()
+        finally:
+            known = endpoint in self.endpoints or endpoint == '/metrics'
+            self.metrics.record(endpoint if known else UNKNOWN_ENDPOINT, time.perf_counter() - start)
+
+
+def _int(params, name, default=None, minimum=None):
+    if name not in params:
+        return default
+    try:
+        value = int(params[name])
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+    if minimum is not None and value < minimum:
+        raise QueryError(f"{name} must be at least {minimum}")
+    return value
+
+
+def _list(params, name):
+    if not params.get(name):
+        return None
+    return [item.strip() for item in params[name].split(',') if item.strip()]
+
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line or len(request_line) > MAX_REQUEST_LINE:
+                break
+            keep_alive = True
+            while True:
+                header = await reader.readline()
+                if header in (b'\r\n', b'\n', b''):
+                    break
+                if header.lower().startswith(b'connection:') and b'close' in header.lower():
+                    keep_alive = False
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+            keep_alive = keep_alive and version == 'HTTP/1.1'
+            if method != 'GET':
+                status, body = 405, json.dumps({'error': "Only GET is supported"}).encode()
+            else:
+                status, body = await service.handle(target)
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(agg, host='127.0.0.1', port=8000, cache_size=CACHE_SIZE, ready=None):
+    """Serve ``agg`` until cancelled; ``ready(server)`` is called once listening."""
+    service = QueryService(agg, cache_size)
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve_connection(service, reader, writer), host, port)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
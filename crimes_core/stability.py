@@ -0,0 +1,137 @@
+"""
+Bootstrap stability of the state clusters.
+
+Each bootstrap resamples every state's reported years with replacement, so
+every state appears in every resample. The resample is summed into a state x
+crime matrix, then scaled and clustered with KMeans, as in the scripts. The
+resampling is one batched gather per chunk of resamples. Chunks run on a
+process pool, each worker limited to one BLAS/OpenMP thread, and are seeded
+from one SeedSequence, so the result does not depend on worker scheduling.
+
+As each chunk's labels arrive they are one-hot encoded and folded into a
+running co-assignment count with a single matrix product, so no Python loop
+runs over pairs of states. A state's stability is its mean agreement with
+every other state over the bootstraps: how often a state in its consensus
+cluster was clustered with it, and how often a state outside it was not. The
+consensus clustering is an average-linkage cut of 1 - co-assignment rate.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import squareform
+from sklearn.cluster import KMeans
+from sklearn.metrics import adjusted_rand_score
+from sklearn.preprocessing import StandardScaler
+
+from .clustering import OPTIMAL_K, RANDOM_STATE, fit_clusters
+
+N_BOOT = 500
+CHUNK = 50
+
+Stability = namedtuple('Stability', ['states', 'rate', 'stability', 'consensus', 'reference', 'n_boot'])
+
+
+class CoAssignment:
+    """Running count of how often each pair of states shares a cluster."""
+
+    def __init__(self, n_states):
+        self.counts = np.zeros((n_states, n_states), dtype=np.int64)
+        self.n_boot = 0
+
+    def update(self, labels):
+        """Fold in a (bootstraps x states) block of labels."""
+        labels = np.asarray(labels)
+        onehot = np.zeros(labels.shape + (labels.max() + 1,), dtype=np.int64)
+        np.put_along_axis(onehot, labels[..., None], 1, axis=-1)
+        self.counts += np.einsum('bsk,btk->st', onehot, onehot)
+        self.n_boot += len(labels)
+
+    @property
+    def rate(self):
+        return self.counts / max(self.n_boot, 1)
+
+
+def resample_totals(data, present, n_boot, rng):
+    """State x crime totals of ``n_boot`` within-state resamples of the reported years."""
+    n_years, n_states = present.shape
+    # each state's reported year positions, padded at the end
+    years = np.argsort(~present, axis=0, kind='stable').T
+    reported = present.sum(axis=0)
+    draws = (rng.random((n_boot, n_states, n_years)) * reported[:, None]).astype(np.int64)
+    picked = np.take_along_axis(np.broadcast_to(years, draws.shape), draws, axis=2)
+    picked = np.where(np.arange(n_years) < reported[:, None], picked, -1)
+    counts = np.zeros((n_boot, n_states, n_years), dtype=np.int64)
+    np.add.at(counts, (np.arange(n_boot)[:, None, None], np.arange(n_states)[None, :, None], picked),
+              picked >= 0)
+    # the -1 padding lands on the last year with weight 0
+    return np.einsum('bsy,ysc->bsc', counts, data.astype(np.int64))
+
+
+def _bootstrap_chunk(data, present, k, seed, n_boot, n_init):
+    from threadpoolctl import threadpool_limits
+
+    rng = np.random.default_rng(seed)
+    totals = resample_totals(data, present, n_boot, rng)
+    labels = np.empty(totals.shape[:2], dtype=np.int64)
+    with threadpool_limits(1):
+        for b, matrix in enumerate(totals):
+            scaled = StandardScaler().fit_transform(matrix)
+            km = KMeans(n_clusters=k, random_state=int(rng.integers(2**31)), n_init=n_init)
+            labels[b] = km.fit_predict(scaled)
+    return labels
+
+
+def bootstrap_stability(cube, k=OPTIMAL_K, n_boot=N_BOOT, n_jobs=None, random_state=RANDOM_STATE, n_init=10):
+    """Co-assignment rates, per-state stability and consensus labels over ``n_boot`` resamples.
+
+    ``reference`` holds the labels of the usual fit on the full data.
+    """
+    seeds = np.random.SeedSequence(random_state).spawn(-(-n_boot // CHUNK))
+    sizes = [min(CHUNK, n_boot - i * CHUNK) for i in range(len(seeds))]
+    args = [(cube.data, cube.present, k, seed, size, n_init) for seed, size in zip(seeds, sizes)]
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(args)))
+
+    co = CoAssignment(len(cube.states))
+    if n_jobs == 1:
+        for chunk in args:
+            co.update(_bootstrap_chunk(*chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            for future in as_completed([pool.submit(_bootstrap_chunk, *chunk) for chunk in args]):
+                co.update(future.result())
+
+    rate = co.rate
+    consensus = fcluster(linkage(squareform(1 - rate, checks=False), 'average'), k, 'maxclust') - 1
+    same = consensus[:, None] == consensus[None, :]
+    agreement = np.where(same, rate, 1 - rate)
+    np.fill_diagonal(agreement, np.nan)
+    stability = np.nanmean(agreement, axis=1)
+
+    full = StandardScaler().fit_transform(cube.data.sum(axis=0, dtype=np.int64))
+    reference = fit_clusters(full, k)
+    return Stability(list(cube.states), rate, stability, _match(consensus, reference), reference, co.n_boot)
+
+
+def _match(labels, reference):
+    """Renumber ``labels`` so they overlap ``reference`` the most."""
+    size = max(labels.max(), reference.max()) + 1
+    overlap = np.zeros((size, size), dtype=np.int64)
+    np.add.at(overlap, (labels, reference), 1)
+    rows, cols = linear_sum_assignment(-overlap)
+    mapping = np.empty(size, dtype=labels.dtype)
+    mapping[rows] = cols
+    return mapping[labels]
+
+
+def stability_frame(result):
+    """Per-state table, least stable first, with the consensus-vs-reference ARI in ``attrs``."""
+    frame = pd.DataFrame({'Cluster': result.reference, 'Consensus': result.consensus,
+                          'Stability': result.stability}, index=pd.Index(result.states, name='State'))
+    frame.attrs['ari'] = adjusted_rand_score(result.reference, result.consensus)
+    return frame.sort_values('Stability', kind='stable')
@@ -0,0 +1,108 @@
+"""
+Canonical state table and raw-name normalization.
+
+The 2001-2010 rows spell states in upper case ("UTTAR PRADESH") while later
+rows use title case and slightly different punctuation ("D&N Haveli",
+"Delhi UT"). Every raw spelling is mapped to one canonical name through a
+lookup keyed on a punctuation- and case-insensitive form of the name, and the
+result is stored as a Categorical so grouping runs on integer codes.
+"""
+
+import hashlib
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+# canonical names; the order defines the category codes
+STATES = [
+    'A & N Islands',
+    'Andhra Pradesh',
+    'Arunachal Pradesh',
+    'Assam',
+    'Bihar',
+    'Chandigarh',
+    'Chhattisgarh',
+    'D & N Haveli',
+    'Daman & Diu',
+    'Delhi',
+    'Goa',
+    'Gujarat',
+    'Haryana',
+    'Himachal Pradesh',
+    'Jammu & Kashmir',
+    'Jharkhand',
+    'Karnataka',
+    'Kerala',
+    'Lakshadweep',
+    'Madhya Pradesh',
+    'Maharashtra',
+    'Manipur',
+    'Meghalaya',
+    'Mizoram',
+    'Nagaland',
+    'Odisha',
+    'Puducherry',
+    'Punjab',
+    'Rajasthan',
+    'Sikkim',
+    'Tamil Nadu',
+    'Telangana',
+    'Tripura',
+    'Uttar Pradesh',
+    'Uttarakhand',
+    'West Bengal',
+]
+
+# spellings that differ from the canonical name by more than case/spacing
+ALIASES = {
+    'Delhi UT': 'Delhi',
+    'NCT of Delhi': 'Delhi',
+    'Andaman & Nicobar Islands': 'A & N Islands',
+    'Dadra & Nagar Haveli': 'D & N Haveli',
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'Uttaranchal': 'Uttarakhand',
+}
+
+# caches of normalized data are keyed on this, so editing the tables invalidates them
+TABLE_DIGEST = hashlib.sha256(json.dumps([STATES, ALIASES], sort_keys=True).encode()).hexdigest()
+
+# zonal-council regions; the island UTs, which belong to no council, form their own group
+REGIONS = {
+    'Northern': ['Chandigarh', 'Delhi', 'Haryana', 'Himachal Pradesh', 'Jammu & Kashmir', 'Punjab', 'Rajasthan'],
+    'Central': ['Chhattisgarh', 'Madhya Pradesh', 'Uttar Pradesh', 'Uttarakhand'],
+    'Eastern': ['Bihar', 'Jharkhand', 'Odisha', 'West Bengal'],
+    'Western': ['D & N Haveli', 'Daman & Diu', 'Goa', 'Gujarat', 'Maharashtra'],
+    'Southern': ['Andhra Pradesh', 'Karnataka', 'Kerala', 'Puducherry', 'Tamil Nadu', 'Telangana'],
+    'North Eastern': ['Arunachal Pradesh', 'Assam', 'Manipur', 'Meghalaya', 'Mizoram', 'Nagaland', 'Sikkim',
+                      'Tripura'],
+    'Islands': ['A & N Islands', 'Lakshadweep'],
+}
+
+
+def state_key(name):
+    """Case-, spacing- and '&'/'and'-insensitive key for a raw state name."""
+    key = re.sub(r'\s*&\s*', ' AND ', str(name).upper())
+    return re.sub(r'\s+', ' ', key).strip()
+
+
+_LOOKUP = {state_key(name): code for code, name in enumerate(STATES)}
+_LOOKUP.update({state_key(alias): STATES.index(name) for alias, name in ALIASES.items()})
+
+
+def normalize_states(raw):
+    """Map raw state names to a Categorical over the canonical ``STATES``.
+
+    Only the distinct raw names are looked up; each row then takes its code
+    from that small table. Raises ValueError for names with no canonical match.
+    """
+    row_codes, uniques = pd.factorize(raw)
+    if (row_codes < 0).any():
+        raise ValueError("Missing state names")
+    unique_codes = np.array([_LOOKUP.get(state_key(name), -1) for name in uniques], dtype=np.int64)
+    unknown = [name for name, code in zip(uniques, unique_codes) if code < 0]
+    if unknown:
+        raise ValueError(f"Unknown state names: {', '.join(map(str, unknown))}")
+    return pd.Categorical.from_codes(unique_codes[row_codes], categories=STATES)
@@ -0,0 +1,79 @@
+"""
+Precomputed top-k leaderboards of a CrimeCube.
+
+For every (crime type or ``'total'``, single year or all years) pair the index
+holds the K highest states in order, together with their counts. The index is
+built with one ``argpartition`` over the state axis followed by a sort of only
+the K selected states. A query such as "top 10 states for dowry deaths in 2015"
+is then a slice of a small array.
+"""
+
+import numpy as np
+import pandas as pd
+
+TOP_K = 15
+TOTAL = 'total'
+
+
+class TopKIndex:
+    """Ordered top-``k`` states per (crime or total, year or all years).
+
+    States that did not report in a year are never ranked for that year.
+    Equal counts are ordered by state position, so results are deterministic.
+    """
+
+    def __init__(self, cube, k=TOP_K):
+        self.cube = cube
+        years, states, crimes = cube.shape
+        self.k = min(k, states)
+
+        # (years + 1) x states x (crimes + 1): the extra year slot is all years, the extra crime is the total
+        values = np.empty((years + 1, states, crimes + 1), dtype=np.int64)
+        values[:years, :, :crimes] = cube.data
+        values[years, :, :crimes] = cube.state_totals
+        values[..., crimes] = values[..., :crimes].sum(axis=2)
+        present = np.vstack([cube.present, cube.present.any(axis=0)])
+
+        # fold the state position into the key so ties break towards the first state
+        keys = values * states + (states - 1 - np.arange(states))[None, :, None]
+        keys[~present] = -1
+        keys = keys.transpose(0, 2, 1)
+
+        if self.k < states:
+            part = np.argpartition(-keys, self.k - 1, axis=2)[..., :self.k]
+        else:
+            part = np.broadcast_to(np.arange(states), keys.shape).copy()
+        selected = np.take_along_axis(keys, part, axis=2)
+        order = np.argsort(-selected, axis=2)
+        # int16 positions while every state fits, wider at district scale
+        dtype = np.int16 if states <= np.iinfo(np.int16).max + 1 else np.int32
+        self.positions = np.take_along_axis(part, order, axis=2).astype(dtype)
+        self.counts = np.where(np.take_along_axis(selected, order, axis=2) < 0, -1,
+                               np.take_along_axis(values.transpose(0, 2, 1), self.positions.astype(np.intp), axis=2))
+        self._crime_index = {crime: i for i, crime in enumerate(cube.crimes)}
+        self._crime_index[TOTAL] = crimes
+
+    def _slot(self, crime, year):
+        try:
+            crime_pos = self._crime_index[crime]
+        except KeyError:
+            raise KeyError(f"Unknown crime {crime!r}") from None
+        year_pos = len(self.cube.years) if year is None else self.cube.year_pos(year)
+        return year_pos, crime_pos
+
+    def top(self, crime=TOTAL, year=None, n=None):
+        """Top ``n`` states for ``crime`` in ``year`` (all years if None) as a Series."""
+        n = self.k if n is None else n
+        if n > self.k:
+            raise ValueError(f"Index holds the top {self.k} states; rebuild it with k >= {n}")
+        year_pos, crime_pos = self._slot(crime, year)
+        counts = self.counts[year_pos, crime_pos, :n]
+        positions = self.positions[year_pos, crime_pos, :n][counts >= 0]
+        states = [self.cube.states[i] for i in positions]
+        return pd.Series(counts[counts >= 0], index=pd.Index(states, name='State'),
+                         name=None if crime == TOTAL else crime)
+
+    def leader(self, crime=TOTAL, year=None):
+        """(state, count) of the highest state."""
+        year_pos, crime_pos = self._slot(crime, year)
+        return self.cube.states[self.positions[year_pos, crime_pos, 0]], int(self.counts[year_pos, crime_pos, 0])
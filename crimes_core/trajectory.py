@@ -0,0 +1,221 @@
+"""
+Trajectory clustering of states on their yearly crime vectors with DTW.
+
+Each state is the sequence of its reported years (Delhi and Telangana are
+shorter), each year a vector of ``log1p`` counts standardized per crime. The
+distance between two states is multivariate dynamic time warping inside a
+Sakoe-Chiba band of ``window`` years (widened to the length difference of
+unequal series).
+
+The DP is batched: pairs of series with the same lengths are stacked, so the
+band loop runs once per batch with array operations over every pair. Missing
+distances are computed in chunks on a process pool and kept in a
+``DTWDistances`` cache. States are clustered by k-medoids. Its assignment step
+finds each state's nearest medoid in order of LB_Keogh lower bounds and skips
+every medoid whose bound already exceeds the best exact distance. Only the
+medoid updates need within-cluster distances, so at district scale most of
+the all-pairs matrix is never computed.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.metrics import silhouette_score
+
+from .clustering import OPTIMAL_K, RANDOM_STATE
+
+WINDOW = 3
+CHUNK = 4096
+BATCH = 512
+
+Trajectories = namedtuple('Trajectories', ['states', 'series'])
+Medoids = namedtuple('Medoids', ['labels', 'medoids', 'cost', 'n_iter'])
+
+
+def state_trajectories(cube):
+    """Standardized ``log1p`` yearly crime vectors of each state, reported years only."""
+    logs = np.log1p(cube.data.astype(np.float64))
+    reported = logs[cube.present]
+    mean, std = reported.mean(axis=0), reported.std(axis=0)
+    std[std == 0] = 1.0
+    scaled = (logs - mean) / std
+    series = [np.ascontiguousarray(scaled[cube.present[:, s], s]) for s in range(len(cube.states))]
+    return Trajectories(list(cube.states), series)
+
+
+def dtw_batch(a, b, window=WINDOW):
+    """Banded DTW distance of each pair ``a[p]``, ``b[p]`` (pairs x length x features)."""
+    n, m = a.shape[1], b.shape[1]
+    window = max(window, abs(n - m))
+    cost = ((a[:, :, None, :] - b[:, None, :, :]) ** 2).sum(axis=3)
+    acc = np.full((len(a), n + 1, m + 1), np.inf)
+    acc[:, 0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(max(1, i - window), min(m, i + window) + 1):
+            acc[:, i, j] = cost[:, i - 1, j - 1] + np.minimum(
+                np.minimum(acc[:, i - 1, j], acc[:, i, j - 1]), acc[:, i - 1, j - 1])
+    return np.sqrt(acc[:, n, m])
+
+
+def envelope(series, window=WINDOW):
+    """Per-feature (lower, upper) envelope of ``series`` over the band."""
+    n = len(series)
+    windows = [series[max(0, i - window):i + window + 1] for i in range(n)]
+    return np.array([w.min(axis=0) for w in windows]), np.array([w.max(axis=0) for w in windows])
+
+
+def lb_keogh(query, lower, upper):
+    """LB_Keogh bound of DTW(query, candidate) from the candidate's envelope.
+
+    ``query`` is (length x features) or stacked (pairs x length x features)
+    against matching envelopes; series of different lengths have no bound (0).
+    """
+    if query.shape[-2] != lower.shape[-2]:
+        return np.zeros(query.shape[:-2])
+    above = np.maximum(query - upper, 0)
+    below = np.maximum(lower - query, 0)
+    return np.sqrt((above ** 2 + below ** 2).sum(axis=(-2, -1)))
+
+
+def _dtw_pairs(series, pairs, window):
+    """DTW of each (i, j) row of ``pairs``, batched by series lengths."""
+    lengths = np.array([len(s) for s in series])
+    out = np.empty(len(pairs))
+    keys = lengths[pairs[:, 0]] * (lengths.max() + 1) + lengths[pairs[:, 1]]
+    for key in np.unique(keys):
+        # bounded batches keep the pairs x n x m cost tensor small
+        for start in range(0, np.count_nonzero(keys == key), BATCH):
+            rows = np.flatnonzero(keys == key)[start:start + BATCH]
+            a = np.stack([series[i] for i in pairs[rows, 0]])
+            b = np.stack([series[j] for j in pairs[rows, 1]])
+            out[rows] = dtw_batch(a, b, window)
+    return out
+
+
+class DTWDistances:
+    """Lazily filled DTW distance matrix of ``series``.
+
+    ``n_jobs`` worker processes compute missing pairs (default: one per CPU);
+    ``n_jobs=1`` computes in-process. ``computed`` and ``pruned`` count the
+    exact distances evaluated and the ones LB_Keogh made unnecessary.
+    """
+
+    def __init__(self, series, window=WINDOW, n_jobs=None):
+        self.series = list(series)
+        self.window = window
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        n = len(self.series)
+        self.values = np.full((n, n), np.nan)
+        np.fill_diagonal(self.values, 0.0)
+        self.envelopes = [envelope(s, window) for s in self.series]
+        self.computed = 0
+        self.pruned = 0
+
+    def pairs(self, i, j):
+        """Distances of the pairs ``(i[p], j[p])``, computing the missing ones."""
+        i, j = np.asarray(i), np.asarray(j)
+        missing = np.isnan(self.values[i, j])
+        if missing.any():
+            todo = np.unique(np.sort(np.column_stack([i[missing], j[missing]]), axis=1), axis=0)
+            distances = self._compute(todo)
+            self.values[todo[:, 0], todo[:, 1]] = distances
+            self.values[todo[:, 1], todo[:, 0]] = distances
+            self.computed += len(todo)
+        return self.values[i, j]
+
+    def _compute(self, todo):
+        n_chunks = min(self.n_jobs, -(-len(todo) // CHUNK))
+        if n_chunks <= 1:
+            return _dtw_pairs(self.series, todo, self.window)
+        chunks = np.array_split(todo, n_chunks)
+        with ProcessPoolExecutor(max_workers=n_chunks) as pool:
+            parts = pool.map(_dtw_pairs, [self.series] * n_chunks, chunks, [self.window] * n_chunks)
+            return np.concatenate(list(parts))
+
+    def matrix(self, indices=None):
+        """Square distance matrix of ``indices`` (all series if None)."""
+        indices = np.arange(len(self.series)) if indices is None else np.asarray(indices)
+        i, j = np.triu_indices(len(indices), 1)
+        self.pairs(indices[i], indices[j])
+        return self.values[np.ix_(indices, indices)]
+
+    def nearest(self, candidates):
+        """Index into ``candidates`` of each series' nearest candidate, and its distance.
+
+        Candidates are tried in increasing LB_Keogh order; once a bound reaches
+        a series' best exact distance, the remaining candidates are skipped.
+        """
+        candidates = np.asarray(candidates)
+        n, k = len(self.series), len(candidates)
+        bounds = np.array([[lb_keogh(self.series[s], *self.envelopes[c]) for c in candidates]
+                           for s in range(n)]).reshape(n, k)
+        order = np.argsort(bounds, axis=1, kind='stable')
+        best = np.full(n, np.inf)
+        nearest = np.zeros(n, dtype=int)
+        rows = np.arange(n)
+        for rank in range(k):
+            cand = order[:, rank]
+            todo = rows[bounds[rows, cand] < best]
+            self.pruned += n - len(todo)
+            if not len(todo):
+                self.pruned += n * (k - rank - 1)
+                break
+            distances = self.pairs(todo, candidates[cand[todo]])
+            better = distances < best[todo]
+            best[todo[better]] = distances[better]
+            nearest[todo[better]] = cand[todo[better]]
+        return nearest, best
+
+
+def _init_medoids(distances, k, rng):
+    """k-medoids++ seeding: spread the initial medoids by DTW distance."""
+    n = len(distances.series)
+    medoids = [int(rng.integers(n))]
+    closest = distances.pairs(np.arange(n), np.full(n, medoids[0]))
+    for _ in range(1, k):
+        weights = closest ** 2
+        pick = int(rng.choice(n, p=weights / weights.sum())) if weights.sum() > 0 else int(rng.integers(n))
+        medoids.append(pick)
+        closest = np.minimum(closest, distances.pairs(np.arange(n), np.full(n, pick)))
+    return np.array(medoids)
+
+
+def kmedoids(distances, k=OPTIMAL_K, random_state=RANDOM_STATE, max_iter=50):
+    """Alternating k-medoids over a DTWDistances cache."""
+    rng = np.random.default_rng(random_state)
+    medoids = _init_medoids(distances, k, rng)
+    for n_iter in range(1, max_iter + 1):
+        labels, best = distances.nearest(medoids)
+        updated = medoids.copy()
+        for cluster in range(k):
+            members = np.flatnonzero(labels == cluster)
+            if len(members):
+                updated[cluster] = members[distances.matrix(members).sum(axis=1).argmin()]
+        if np.array_equal(np.sort(updated), np.sort(medoids)):
+            break
+        medoids = updated
+    labels, best = distances.nearest(medoids)
+    return Medoids(labels, medoids, float(best.sum()), n_iter)
+
+
+def trajectory_sweep(distances, k_values=range(2, 11), random_state=RANDOM_STATE):
+    """(costs, silhouettes) of k-medoids for ``k_values``, like ``clustering.k_sweep``.
+
+    The silhouettes need every pairwise distance, so this fills the cache.
+    """
+    matrix = distances.matrix()
+    costs, silhouettes = [], []
+    for k in k_values:
+        fit = kmedoids(distances, k, random_state)
+        costs.append(fit.cost)
+        silhouettes.append(silhouette_score(matrix, fit.labels, metric='precomputed'))
+    return costs, silhouettes
+
+
+def trajectory_clusters(cube, k=OPTIMAL_K, window=WINDOW, n_jobs=None, random_state=RANDOM_STATE):
+    """k-medoids DTW labels of the cube's states, and the distance cache used."""
+    trajectories = state_trajectories(cube)
+    distances = DTWDistances(trajectories.series, window, n_jobs)
+    return kmedoids(distances, k, random_state), distances
@@ -0,0 +1,26 @@
+import os
+import shutil
+
+import pandas as pd
+
+from crimes_core.aggregate import build_aggregate
+from crimes_core.cache import cache_path
+from crimes_core.data import DATA_FILE, clean, load_file
+from crimes_core.incremental import aggregate_path, current_aggregate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_current_aggregate_streams_the_csv(tmp_path):
+    source = shutil.copy(os.path.join(ROOT, DATA_FILE), tmp_path)
+
+    agg = current_aggregate(tmp_path, chunksize=100)
+    expected = build_aggregate(clean(load_file(source, use_cache=False)))
+    pd.testing.assert_frame_equal(agg.by_state_year, expected.by_state_year)
+    pd.testing.assert_frame_equal(agg.state_totals, expected.state_totals)
+    # built in chunks: no parse cache of the whole file, only the stored aggregate
+    assert not os.path.exists(cache_path(source))
+    assert os.path.exists(aggregate_path(tmp_path))
+
+    stored = current_aggregate(tmp_path, chunksize=100)
+    pd.testing.assert_frame_equal(stored.by_state_year, expected.by_state_year)
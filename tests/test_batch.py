@@ -0,0 +1,20 @@
+import os
+import shutil
+
+from crimes_core.batch import run_batch
+from crimes_core.cache import CACHE_DIR
+from crimes_core.data import DATA_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_batch_streams_inputs_without_parse_cache(tmp_path):
+    inputs = tmp_path / 'inputs'
+    inputs.mkdir()
+    path = shutil.copy(os.path.join(ROOT, DATA_FILE), inputs)
+
+    summary = run_batch([path], tmp_path / 'out', n_jobs=1, figures=False)
+    row = summary.iloc[0]
+    assert row['error'] == ''
+    assert (row['rows'], row['states'], row['first'], row['last']) == (736, 36, 2001, 2021)
+    assert not (inputs / CACHE_DIR).exists()
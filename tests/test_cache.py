@@ -0,0 +1,18 @@
+import os
+import shutil
+
+from crimes_core import cache
+from crimes_core.data import DATA_FILE, load_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_cache_is_keyed_to_the_state_table(tmp_path, monkeypatch):
+    source = shutil.copy(os.path.join(ROOT, DATA_FILE), tmp_path)
+
+    load_file(source)
+    assert cache.read_cache(source) is not None
+
+    # editing STATES/ALIASES changes the digest and must not reuse the old parse
+    monkeypatch.setattr(cache, 'TABLE_DIGEST', 'edited')
+    assert cache.read_cache(source) is None
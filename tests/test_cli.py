@@ -0,0 +1,23 @@
+import os
+import shutil
+
+import pytest
+
+from crimes_core.cli import main
+from crimes_core.data import DATA_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('command', ['growth', 'forecast'])
+def test_unknown_state_is_a_usage_error(tmp_path, capsys, command):
+    shutil.copy(os.path.join(ROOT, DATA_FILE), tmp_path)
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([command, '--data-dir', str(tmp_path), '--state', 'Nowhere'])
+    assert exit_info.value.code == 2
+    assert "no data for --state 'Nowhere'" in capsys.readouterr().err
+
+    # aliases resolve to the canonical name
+    main([command, '--data-dir', str(tmp_path), '--state', 'Orissa', '--format', 'json'])
+    assert '"Odisha"' in capsys.readouterr().out
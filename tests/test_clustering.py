@@ -0,0 +1,34 @@
+import os
+
+import pandas as pd
+
+from crimes_core.clustering import stream_clusters
+from crimes_core.data import CRIMES, DATA_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_stream_clusters_gives_each_state_one_label(tmp_path):
+    labels_path = tmp_path / 'labels.csv'
+    breakdown = stream_clusters(os.path.join(ROOT, DATA_FILE), k=4, chunksize=50, labels_path=labels_path)
+
+    states = [state for _, members, _ in breakdown for state in members]
+    assert len(states) == len(set(states)) == 36
+    labels = pd.read_csv(labels_path)
+    assert list(labels.columns) == ['State', 'Cluster'] and labels['State'].is_unique
+
+
+def test_stream_clusters_keys_districts_by_state(tmp_path):
+    rows = pd.DataFrame({
+        'State': ['Delhi', 'DELHI UT', 'Goa', 'Goa', 'Kerala', 'Kerala'] * 3,
+        'District': ['Central', 'Central', 'Central', 'North', 'North', 'South'] * 3,
+        'Year': [2020] * 18,
+        **{crime: list(range(18)) for crime in CRIMES},
+    })
+    path = tmp_path / 'districts.csv'
+    rows.to_csv(path)
+
+    breakdown = stream_clusters(path, k=2, chunksize=4, entity='District')
+    entities = sorted(name for _, members, _ in breakdown for name in members)
+    assert entities == ['Central (Delhi)', 'Central (Goa)', 'North (Goa)', 'North (Kerala)', 'South (Kerala)']
+    assert sum(total for _, _, total in breakdown) == rows[CRIMES].to_numpy().sum()
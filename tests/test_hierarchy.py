@@ -0,0 +1,23 @@
+import os
+import shutil
+import subprocess
+import sys
+
+from crimes_core.data import DATA_FILE
+from crimes_core.hierarchy import linkage_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_linkage_is_cached_under_the_data_dir(tmp_path):
+    data_dir, cwd = tmp_path / 'data', tmp_path / 'cwd'
+    data_dir.mkdir()
+    cwd.mkdir()
+    shutil.copy(os.path.join(ROOT, DATA_FILE), data_dir)
+
+    env = {**os.environ, 'PYTHONPATH': ROOT}
+    result = subprocess.run([sys.executable, '-m', 'crimes_core', 'cluster', '--method', 'hierarchical',
+                             '--data-dir', str(data_dir)], cwd=cwd, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert os.path.exists(linkage_path(data_dir))
+    assert os.listdir(cwd) == []
@@ -0,0 +1,31 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(cwd, *args, timeout=300):
+    env = {**os.environ, 'PYTHONPATH': ROOT}
+    result = subprocess.run([sys.executable, '-m', 'crimes_core', 'run', '--format', 'json', *args],
+                            cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout)
+    assert result.returncode == 0, result.stderr
+    return {row['node']: row['status'] for row in json.loads(result.stdout)}
+
+
+def test_run_with_several_jobs(tmp_path):
+    shutil.copy(os.path.join(ROOT, 'CrimesOnWomenData.csv'), tmp_path)
+
+    status = _run(tmp_path, '--force', '--jobs', '4')
+    assert set(status.values()) == {'ran'}
+    assert 'k_sweep' in status and '06_crime_trends.png' in status
+    assert 'stability' not in status
+    for name in status:
+        if name.endswith('.png'):
+            assert (tmp_path / name).exists()
+
+    status = _run(tmp_path, '--jobs', '4')
+    assert status.pop('source') == 'ran'
+    assert set(status.values()) == {'cached'}
@@ -0,0 +1,37 @@
+import asyncio
+import json
+import os
+import shutil
+
+from crimes_core.data import DATA_FILE
+from crimes_core.incremental import current_aggregate
+from crimes_core.service import UNKNOWN_ENDPOINT, QueryService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _service(tmp_path):
+    shutil.copy(os.path.join(ROOT, DATA_FILE), tmp_path)
+    return QueryService(current_aggregate(tmp_path))
+
+
+def test_equivalent_queries_share_a_cache_entry(tmp_path):
+    service = _service(tmp_path)
+    targets = ['/top-states?states=Odisha,Kerala&n=5', '/top-states?n=05&states=orissa,KERALA&by=total',
+               '/top-states?states=Odisha,Kerala&n=5&first=1990&unused=1']
+    bodies = [asyncio.run(service.handle(target)) for target in targets]
+    assert all(status == 200 for status, _ in bodies)
+    assert len({body for _, body in bodies}) == 1
+    assert service.cache.stats()['misses'] == 1
+    assert service.cache.stats()['hits'] == 2
+
+
+def test_unknown_endpoints_share_one_metrics_entry(tmp_path):
+    service = _service(tmp_path)
+    for target in ['/nope', '/nope/again', '/other?x=1']:
+        assert asyncio.run(service.handle(target))[0] == 404
+    asyncio.run(service.handle('/trends'))
+    status, body = asyncio.run(service.handle('/metrics'))
+    latency = json.loads(body)['latency']
+    assert set(latency) == {UNKNOWN_ENDPOINT, '/trends'}
+    assert latency[UNKNOWN_ENDPOINT]['count'] == 3
@@ -0,0 +1,18 @@
+import numpy as np
+
+from crimes_core.cube import CrimeCube
+from crimes_core.data import CRIMES
+from crimes_core.topk import TopKIndex
+
+
+def test_topk_beyond_int16_entities():
+    n = 40_000
+    data = np.zeros((2, n, len(CRIMES)), dtype=np.int32)
+    # the largest entities sit past position 32767
+    data[:, :, 0] = np.arange(n)
+    cube = CrimeCube(data, [2020, 2021], [f"District {i}" for i in range(n)])
+
+    top = TopKIndex(cube, k=3).top('Rape', 2021)
+    assert list(top.index) == ['District 39999', 'District 39998', 'District 39997']
+    assert list(top) == [39999, 39998, 39997]
+    assert TopKIndex(cube).leader() == ('District 39999', 2 * 39999)